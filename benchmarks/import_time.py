@@ -0,0 +1,82 @@
+"""
+Import-time report for the processor entry points (``python -X importtime``).
+
+Imports the given modules in a fresh interpreter (after django.setup(), like
+main.py does) and prints the cumulative import time of each target plus the
+heaviest imports below them. With --budget-ms the script exits with status 1
+when the targets take longer than the budget, so it can guard cold start in CI.
+
+Usage:
+    python benchmarks/import_time.py [--top 15] [--budget-ms 800] [module ...]
+
+The environment must allow django.setup() (DJANGO_SETTINGS_MODULE, DJANGO_SECRET_KEY,
+CRYPTOGRAPHY_KEY...), as for main.py.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TARGETS = [
+    "web_scrapers.domain.entities.scraper_factory",
+    "web_scrapers.application.session_manager",
+]
+
+MARKER = "--- django.setup() done ---"
+
+
+def run_importtime(targets: List[str]) -> List[Tuple[int, int, str]]:
+    """Returns (self_us, cumulative_us, module) for every import done by the targets after django.setup()."""
+    code = "\n".join(
+        ["import sys, django", "django.setup()", f"sys.stderr.write({MARKER!r} + '\\n')"]
+        + [f"import {target}" for target in targets]
+    )
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Import failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.split(MARKER, 1)[-1].splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        entries.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--top", type=int, default=15, help="Number of heaviest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if the targets take longer")
+    args = parser.parse_args()
+
+    entries = run_importtime(args.modules)
+    cumulative: Dict[str, int] = {module.strip(): cumulative_us for _, cumulative_us, module in entries}
+
+    total_ms = sum(cumulative.get(target, 0) for target in args.modules) / 1000
+    for target in args.modules:
+        print(f"{cumulative.get(target, 0) / 1000:9.1f} ms  {target}")
+    print(f"{total_ms:9.1f} ms  total (targets)")
+
+    # Heaviest imports triggered by the targets (modules already loaded by django.setup() are not counted)
+    print(f"\nTop {args.top} imports by cumulative time:")
+    nested = [(cumulative_us, module) for _, cumulative_us, module in entries if module.strip() not in args.modules]
+    for cumulative_us, module in sorted(nested, reverse=True)[: args.top]:
+        print(f"{cumulative_us / 1000:9.1f} ms  {module.strip()}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nImport time {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
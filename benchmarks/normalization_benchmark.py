@@ -0,0 +1,75 @@
+"""
+Microbenchmark: per value parsing vs shared.infrastructure.normalization.
+
+Builds a synthetic usage table like the ones scraped from large accounts and
+times the per row helpers used by the scrapers against the columnar versions.
+
+Usage:
+    python benchmarks/normalization_benchmark.py [rows]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.infrastructure.normalization import digits_only, normalize_phone_numbers, parse_data_amounts  # noqa: E402
+from shared.infrastructure.utils import transform_phone_number  # noqa: E402
+
+
+def build_table(rows: int):
+    random.seed(0)
+    phones = [
+        random.choice(["({}) {}-{}", "1-{}-{}-{}", "{}.{}.{}"]).format(
+            random.randint(200, 999), random.randint(200, 999), random.randint(1000, 9999)
+        )
+        for _ in range(rows)
+    ]
+    usages = [f"{random.uniform(0, 2000):,.2f} {random.choice(['GB', 'MB', 'KB'])}" for _ in range(rows)]
+    return phones, usages
+
+
+def parse_usage_per_value(text: str) -> int:
+    match = re.search(r"([\d,]+\.?\d*)\s*([KMG]B)", text, re.IGNORECASE)
+    if not match:
+        return 0
+    factor = {"KB": 1024, "MB": 1024**2, "GB": 1024**3}[match.group(2).upper()]
+    return int(float(match.group(1).replace(",", "")) * factor)
+
+
+def per_value(phones, usages):
+    digits = [re.sub(r"[^0-9]", "", phone) for phone in phones]
+    numbers = [transform_phone_number(phone) for phone in phones]
+    data_used = [parse_usage_per_value(usage) for usage in usages]
+    return digits, numbers, data_used
+
+
+def columnar(phones, usages):
+    return digits_only(phones), normalize_phone_numbers(phones), parse_data_amounts(usages)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    phones, usages = build_table(rows)
+
+    expected = per_value(phones, usages)
+    result = columnar(phones, usages)
+    assert list(result[0]) == expected[0]
+    assert list(result[1]) == expected[1]
+    assert list(result[2]) == expected[2]
+
+    repeat = 5
+    loop_time = min(timeit.repeat(lambda: per_value(phones, usages), number=1, repeat=repeat))
+    columnar_time = min(timeit.repeat(lambda: columnar(phones, usages), number=1, repeat=repeat))
+
+    print(f"rows:      {rows}")
+    print(f"per value: {loop_time * 1000:8.1f} ms")
+    print(f"columnar:  {columnar_time * 1000:8.1f} ms")
+    print(f"speedup:   {loop_time / columnar_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
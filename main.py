@@ -4,6 +4,10 @@ Main ScraperJob processor with available_at support
 
 import os
 import sys
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Optional, Set
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
 
@@ -13,6 +17,8 @@ import django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
 
+from django.utils import timezone
+
 from web_scrapers.application.safe_scraper_job_service import SafeScraperJobService
 from web_scrapers.application.scraper_job_service import ScraperJobService
 from web_scrapers.application.session_manager import SessionManager
@@ -20,7 +26,12 @@ from web_scrapers.domain.entities.models import ScraperJobCompleteContext
 from web_scrapers.domain.entities.scraper_factory import ScraperStrategyFactory
 from web_scrapers.domain.entities.session import Carrier as CarrierEnum, Credentials
 from web_scrapers.domain.enums import Navigators, ScraperJobStatus, ScraperType
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.django.credential_leases import PostgresCredentialLease, credential_leases_enabled
 from web_scrapers.infrastructure.logging_config import get_logger, setup_logging
+from web_scrapers.infrastructure.profiling import JobProfiler, get_profile_modes
+from web_scrapers.infrastructure.services.upload_outbox import UploadOutbox, UploadOutboxWorker, upload_outbox_enabled
+from web_scrapers.infrastructure.tracing import tracer
 
 
 class ScraperJobProcessor:
@@ -31,19 +42,88 @@ class ScraperJobProcessor:
         # Use SafeScraperJobService to handle async context after Playwright execution
         original_service = ScraperJobService()
         self.scraper_job_service = SafeScraperJobService(original_service)
-        self.session_manager = SessionManager(browser_type=Navigators.CHROME)
+        # Credentials are leased so that two workers never log in with the same one at once
+        self.credential_leases: Optional[PostgresCredentialLease] = None
+        if credential_leases_enabled():
+            self.credential_leases = PostgresCredentialLease()
+        self.session_manager = SessionManager(browser_type=Navigators.CHROME, credential_leases=self.credential_leases)
         self.scraper_factory = ScraperStrategyFactory()
+        # Jobs of the current run put back in the queue (collect phase later, credential in use)
+        self._rescheduled_job_ids: Set[int] = set()
+        # Background uploads of the files enqueued by the strategies (SCRAPER_UPLOAD_OUTBOX_ENABLED)
+        self.upload_worker: Optional[UploadOutboxWorker] = None
+        if upload_outbox_enabled():
+            self.upload_worker = UploadOutboxWorker(UploadOutbox(), on_job_finished=self._on_uploads_finished)
+
+    def close_sessions(self) -> None:
+        """Closes the pooled sessions and the browser profiles, and prunes the profiles directory."""
+        try:
+            self.session_manager.cleanup()
+        except Exception as e:
+            self.logger.warning(f"Error closing browser sessions: {str(e)}")
+
+    def release_credential_leases(self) -> None:
+        """Releases the credentials leased by this worker (they are released anyway when the process exits)."""
+        if self.credential_leases:
+            self.credential_leases.close()
+
+    def defer_if_credential_busy(self, job_context: ScraperJobCompleteContext) -> bool:
+        """
+        Reschedules the job if its credential is leased by another worker.
+
+        Returns:
+            True if the job was deferred
+        """
+        credential_id = job_context.credential.id
+        if not self.credential_leases or credential_id not in self.credential_leases.leased_elsewhere([credential_id]):
+            return False
+
+        scraper_job = job_context.scraper_job
+        delay = float(os.getenv("SCRAPER_CREDENTIAL_BUSY_DELAY_SECONDS", "300"))
+        self.logger.info(
+            f"Job {scraper_job.id} deferred {delay:.0f}s: credential {credential_id} in use by another worker"
+        )
+        self.scraper_job_service.reschedule_scraper_job(
+            scraper_job.id, timezone.now() + timedelta(seconds=delay), "Credential in use by another worker"
+        )
+        metrics.CREDENTIAL_BUSY_DEFERRALS_TOTAL.inc(carrier=job_context.carrier.name)
+        return True
+
+    def start_upload_worker(self) -> None:
+        """Starts draining the upload outbox (including uploads left pending by previous runs)."""
+        if self.upload_worker:
+            self.upload_worker.start()
+
+    def stop_upload_worker(self) -> None:
+        """Waits for the due uploads (up to SCRAPER_UPLOAD_DRAIN_TIMEOUT seconds) and stops the worker."""
+        if self.upload_worker:
+            self.upload_worker.stop(drain_timeout=float(os.getenv("SCRAPER_UPLOAD_DRAIN_TIMEOUT", "600")))
+
+    def _on_uploads_finished(self, job_id: int, success: bool, message: str) -> None:
+        """Resolves an UPLOAD_PENDING job once the outbox settled all its files."""
+        status = ScraperJobStatus.SUCCESS if success else ScraperJobStatus.ERROR
+        self.scraper_job_service.update_scraper_job_status(job_id, status, message)
 
     def log_statistics(self) -> None:
         """Display available scraper statistics"""
         stats = self.scraper_job_service.get_scraper_statistics()
+        metrics.QUEUE_DEPTH.set(stats.available_now, state="available_now")
+        metrics.QUEUE_DEPTH.set(stats.future_scheduled, state="future_scheduled")
+        metrics.QUEUE_DEPTH.set(stats.null_available_at, state="null_available_at")
+        metrics.QUEUE_DEPTH.set(stats.total_pending, state="total_pending")
         self.logger.info(
             f"Scraper statistics: {stats.available_now} available now, "
             f"{stats.future_scheduled} scheduled for future, "
             f"{stats.total_pending} total pending"
         )
 
-    def process_scraper_job(self, job_context: ScraperJobCompleteContext, job_number: int, total_jobs: int) -> bool:
+    def process_scraper_job(
+        self,
+        job_context: ScraperJobCompleteContext,
+        job_number: int,
+        total_jobs: int,
+        profile_modes: Optional[Set[str]] = None,
+    ) -> bool:
         """
         Process a single scraper job.
 
@@ -51,10 +131,58 @@ class ScraperJobProcessor:
             job_context: Complete job context with Pydantic models
             job_number: Current job number
             total_jobs: Total jobs to process
+            profile_modes: Profiling modes for this job ("cpu", "memory"). If None, uses SCRAPER_PROFILE.
 
         Returns:
             True if processing was successful, False otherwise
         """
+        scraper_job = job_context.scraper_job
+        if profile_modes is None:
+            profile_modes = get_profile_modes(scraper_job.id)
+        carrier_name = job_context.carrier.name
+        scraper_type_name = ScraperType(scraper_job.type).value
+        started_at = time.monotonic()
+        success = False
+        self._rescheduled_job_ids.discard(scraper_job.id)
+        try:
+            profiler = JobProfiler(scraper_job.id, profile_modes) if profile_modes else nullcontext()
+            with profiler, tracer.job(job_id=scraper_job.id, carrier=carrier_name, scraper_type=scraper_type_name):
+                success = self._run_scraper_job(job_context, job_number, total_jobs)
+            return success
+        finally:
+            metrics.JOB_DURATION_SECONDS.observe(
+                time.monotonic() - started_at, carrier=carrier_name, scraper_type=scraper_type_name
+            )
+            if scraper_job.id in self._rescheduled_job_ids:
+                status = "rescheduled"
+            else:
+                status = "success" if success else "error"
+            metrics.JOBS_TOTAL.inc(carrier=carrier_name, scraper_type=scraper_type_name, status=status)
+
+    @staticmethod
+    def _classify_failure(error_msg: str) -> str:
+        """Maps an error message to a coarse failure category for metrics."""
+        message = error_msg.lower()
+        # Timeouts first: a login page that never loads is a timeout, not rejected credentials
+        if "timeout" in message or "timed out" in message:
+            return "timeout"
+        if "authentication failed" in message or "error al hacer login" in message:
+            return "authentication"
+        if "upload" in message or "external endpoint" in message:
+            return "upload"
+        if "download" in message or "files section" in message:
+            return "download"
+        return "other"
+
+    def _record_failure(self, job_context: ScraperJobCompleteContext, error_msg: str) -> None:
+        metrics.JOB_FAILURES_TOTAL.inc(
+            carrier=job_context.carrier.name,
+            scraper_type=ScraperType(job_context.scraper_job.type).value,
+            category=self._classify_failure(error_msg),
+        )
+
+    def _run_scraper_job(self, job_context: ScraperJobCompleteContext, job_number: int, total_jobs: int) -> bool:
+        """Runs a single scraper job: authentication, scraper execution and status updates."""
         # Extract Pydantic entities from complete context model
         scraper_job = job_context.scraper_job
         scraper_config = job_context.scraper_config
@@ -89,11 +217,10 @@ class ScraperJobProcessor:
             scraper_type = ScraperType(scraper_job.type)
 
             # Session management - always delegate to SessionManager which handles:
-            # 1. Same carrier + same credentials + same scraper_type → reuse session
-            # 2. Same carrier + same credentials + different scraper_type → check login URL
-            #    - Same login URL → reuse session
-            #    - Different login URL → logout and re-login (e.g., Bell Enterprise vs Bell old portal)
-            # 3. Different carrier or credentials → logout and re-login
+            # 1. Sessions are pooled by (credential, login URL), each in its own browser context
+            # 2. Pooled session for the credential and the scraper_type's login URL → reuse (switch to) it
+            #    (e.g., Bell Enterprise vs Bell old portal are separate sessions of the same credential)
+            # 3. No pooled session → open a new context (evicting the least recently used) and log in
             if self.session_manager.is_logged_in():
                 current_carrier = self.session_manager.get_current_carrier()
                 current_credentials = self.session_manager.get_current_credentials()
@@ -102,7 +229,13 @@ class ScraperJobProcessor:
                 )
 
             # Always call session_manager.login() - it handles session reuse logic internally
-            login_success = self.session_manager.login(credentials, scraper_type=scraper_type)
+            with tracer.span("session.login", credential_id=credentials.id):
+                login_success = self.session_manager.login(credentials, scraper_type=scraper_type)
+
+            if not login_success and self.defer_if_credential_busy(job_context):
+                # Another worker took the credential while this one was waiting for its lease
+                self._rescheduled_job_ids.add(scraper_job.id)
+                return False
 
             if not login_success:
                 error_msg = "Authentication failed"
@@ -134,12 +267,29 @@ class ScraperJobProcessor:
             if result.success:
                 self.logger.info(f"Scraper executed successfully: {result.message}")
                 self.logger.info(f"Files processed: {len(result.files)}")
-
-                self.scraper_job_service.update_scraper_job_status(
-                    scraper_job.id, ScraperJobStatus.SUCCESS, f"Scraper executed successfully: {result.message}"
+                metrics.FILES_PROCESSED_TOTAL.inc(
+                    len(result.files), carrier=carrier.name, scraper_type=scraper_type.value
                 )
+
+                if result.reschedule_after is not None:
+                    # Two-phase job: the reports were requested and the collect phase runs later
+                    available_at = timezone.now() + timedelta(seconds=result.reschedule_after)
+                    self.scraper_job_service.reschedule_scraper_job(scraper_job.id, available_at, result.message)
+                    self._rescheduled_job_ids.add(scraper_job.id)
+                elif result.upload_pending:
+                    # The upload worker resolves the job to SUCCESS/ERROR once the files are uploaded
+                    self.scraper_job_service.update_scraper_job_status(
+                        scraper_job.id, ScraperJobStatus.UPLOAD_PENDING, f"Files downloaded: {result.message}"
+                    )
+                    if self.upload_worker:
+                        self.upload_worker.notify()
+                else:
+                    self.scraper_job_service.update_scraper_job_status(
+                        scraper_job.id, ScraperJobStatus.SUCCESS, f"Scraper executed successfully: {result.message}"
+                    )
             else:
                 self.logger.error(f"Scraper execution failed: {result.error}")
+                self._record_failure(job_context, str(result.error))
                 self.scraper_job_service.update_scraper_job_status(
                     scraper_job.id, ScraperJobStatus.ERROR, f"Scraper execution failed: {result.error}"
                 )
@@ -150,6 +300,7 @@ class ScraperJobProcessor:
         except Exception as e:
             error_msg = f"Error processing scraper: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
+            self._record_failure(job_context, error_msg)
 
             # Update status to ERROR
             self.scraper_job_service.update_scraper_job_status(scraper_job.id, ScraperJobStatus.ERROR, error_msg)
@@ -175,10 +326,17 @@ class ScraperJobProcessor:
         # Process each job
         successful_jobs = 0
         failed_jobs = 0
+        deferred_jobs = 0
+        rescheduled_jobs = 0
 
         for i, job_context in enumerate(available_jobs, 1):
+            if self.defer_if_credential_busy(job_context):
+                deferred_jobs += 1
+                continue
             success = self.process_scraper_job(job_context, i, len(available_jobs))
-            if success:
+            if job_context.scraper_job.id in self._rescheduled_job_ids:
+                rescheduled_jobs += 1
+            elif success:
                 successful_jobs += 1
             else:
                 failed_jobs += 1
@@ -187,6 +345,8 @@ class ScraperJobProcessor:
         self.logger.info("Execution summary:")
         self.logger.info(f"Successful: {successful_jobs}")
         self.logger.info(f"Failed: {failed_jobs}")
+        self.logger.info(f"Deferred (credential in use): {deferred_jobs}")
+        self.logger.info(f"Rescheduled: {rescheduled_jobs}")
         self.logger.info(f"Total processed: {len(available_jobs)}")
 
 
@@ -199,11 +359,20 @@ def main():
 
     try:
         logger.info("Starting ScraperJob processor")
+        metrics.start_metrics_server()
         processor = ScraperJobProcessor()
-        processor.execute_available_scrapers()
+        processor.start_upload_worker()
+        try:
+            processor.execute_available_scrapers()
+        finally:
+            processor.close_sessions()
+            processor.release_credential_leases()
+            processor.stop_upload_worker()
         logger.info("ScraperJob processor completed successfully")
     except Exception as e:
         logger.error(f"Error in main processor: {str(e)}", exc_info=True)
+    finally:
+        metrics.write_metrics_textfile()
 
 
 if __name__ == "__main__":
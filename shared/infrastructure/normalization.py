@@ -0,0 +1,216 @@
+"""
+Columnar normalization of values scraped from carrier usage tables.
+
+The helpers take a whole column at once (list, NumPy array or pandas Series) and
+return pandas Series aligned with the input. Instead of running a regex per value
+in a Python loop, the column is joined into a single newline separated buffer and
+parsed with NumPy operations over its bytes (digits, decimal point, units), so the
+cost per value is a handful of array operations shared by the whole column.
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from shared.domain.enums import DataUnit
+
+ColumnLike = Union[Iterable, np.ndarray, pd.Series]
+
+UNIT_FACTORS = {
+    DataUnit.B.value: 1,
+    DataUnit.KB.value: 1024,
+    DataUnit.MB.value: 1024**2,
+    DataUnit.GB.value: 1024**3,
+    DataUnit.TB.value: 1024**4,
+}
+
+_NEWLINE, _SPACE, _TAB, _COMMA, _DOT, _ZERO, _NINE = (ord(char) for char in "\n \t,.09")
+_NON_DIGIT_BYTES = bytes(byte for byte in range(256) if not (_ZERO <= byte <= _NINE or byte == _NEWLINE))
+_POW10 = 10.0 ** np.arange(309)
+
+# Factor of every unit prefix letter (K, M, G, T), indexed by its upper case ASCII code
+_PREFIX_FACTORS = np.zeros(256, dtype=np.float64)
+for _unit, _factor in UNIT_FACTORS.items():
+    if len(_unit) == 2:
+        _PREFIX_FACTORS[ord(_unit[0])] = _factor
+
+
+def _as_series(values: ColumnLike) -> pd.Series:
+    if isinstance(values, pd.Series):
+        return values
+    return pd.Series(values if isinstance(values, np.ndarray) else list(values), dtype=object)
+
+
+def _join_lines(values: ColumnLike) -> Tuple[str, int]:
+    """Joins the column in one newline separated text. Missing values become empty lines."""
+    texts = _as_series(values).fillna("").astype(str).tolist()
+    joined = "\n".join(texts)
+    if joined.count("\n") != max(len(texts) - 1, 0):
+        joined = "\n".join(text.replace("\n", " ") for text in texts)
+    return joined, len(texts)
+
+
+def _first_per_row(rows: np.ndarray) -> np.ndarray:
+    """Indexes of the first element of every row in a sorted array of row numbers."""
+    return np.flatnonzero(np.diff(rows, prepend=-1))
+
+
+def _last_per_row(rows: np.ndarray) -> np.ndarray:
+    """Indexes of the last element of every row in a sorted array of row numbers."""
+    return np.flatnonzero(np.diff(rows, append=rows[-1] + 1 if len(rows) else 0))
+
+
+def _digits_value(digits: np.ndarray, rows: np.ndarray, row_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Value of the digits of every row read as one decimal integer, and the number of digits of the row."""
+    counts = np.bincount(rows, minlength=row_count)
+    ends = np.cumsum(counts)
+    exponents = np.minimum(ends[rows] - np.arange(len(digits)) - 1, len(_POW10) - 1)
+    values = np.bincount(rows, weights=digits * _POW10[exponents], minlength=row_count)
+    return values, counts
+
+
+def digits_only(values: ColumnLike) -> pd.Series:
+    """Removes every non digit character (dashes, spaces, parentheses...). Missing values become ""."""
+    joined, _ = _join_lines(values)
+    digits = joined.encode("utf-8").translate(None, _NON_DIGIT_BYTES).decode("ascii").split("\n")
+    return pd.Series(digits, index=_as_series(values).index, dtype=object)
+
+
+def normalize_phone_numbers(values: ColumnLike) -> pd.Series:
+    """
+    Column version of shared.infrastructure.utils.transform_phone_number.
+
+    Keeps 10 digit numbers, drops the country code of 11 digit numbers and returns
+    them as int. Values that are not phone numbers are returned unchanged.
+    """
+    original = _as_series(values)
+    joined, row_count = _join_lines(original)
+    buffer = np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+    is_digit = (buffer >= _ZERO) & (buffer <= _NINE)
+    digit_rows = np.cumsum(buffer == _NEWLINE)[is_digit]
+    numbers, lengths = _digits_value((buffer[is_digit] - _ZERO).astype(np.float64), digit_rows, row_count)
+
+    # Drop the country code of 11 digit numbers
+    numbers = np.where(lengths == 11, numbers % 10**10, numbers).astype(np.int64)
+    is_phone = (lengths >= 10) & (lengths <= 11)
+
+    result = original.astype(object).copy()
+    result[is_phone] = numbers[is_phone]
+    return result
+
+
+def parse_data_amounts(
+    values: ColumnLike,
+    default_unit: DataUnit = DataUnit.GB,
+    suffix: Optional[str] = None,
+    fill_value: Optional[int] = 0,
+) -> pd.Series:
+    """
+    Parses amounts like "1,024.5 MB", "47.13 GB" or "601" to bytes.
+
+    The first number of every value is used, with the unit that follows it (B, KB,
+    MB, GB or TB, case-insensitive).
+
+    Args:
+        values: Column of texts
+        default_unit: Unit used when the number is not followed by a unit
+        suffix: Optional regex that must follow the amount (e.g. "used" for "5.2 GB used"). Parsed per value.
+        fill_value: Value for texts without an amount (None keeps them as missing)
+
+    Returns:
+        Series of bytes (int64, or nullable Int64 when fill_value is None)
+    """
+    index = _as_series(values).index
+    if suffix:
+        amounts = _parse_amounts_with_suffix(values, default_unit, suffix)
+    else:
+        amounts = _parse_amounts(values, default_unit)
+
+    amounts = pd.Series(np.trunc(amounts), index=index)  # Truncated like int() in the per value helpers
+    if fill_value is None:
+        return amounts.astype("Int64")
+    return amounts.fillna(fill_value).astype("int64")
+
+
+def _parse_amounts(values: ColumnLike, default_unit: DataUnit) -> np.ndarray:
+    joined, row_count = _join_lines(values)
+    amounts = np.full(row_count, np.nan)
+    # Two trailing newlines so the unit lookup after the last amount never goes out of bounds
+    buffer = np.frombuffer((joined + "\n\n").encode("utf-8"), dtype=np.uint8)
+    rows = np.cumsum(buffer == _NEWLINE)
+
+    is_digit = (buffer >= _ZERO) & (buffer <= _NINE)
+    is_dot = buffer == _DOT
+    is_number = is_digit | is_dot | (buffer == _COMMA)
+    digit_positions = np.flatnonzero(is_digit)
+    if not len(digit_positions):
+        return amounts
+
+    # The amount of a row is the run of number characters that holds its first digit
+    run_ids = np.cumsum(is_number & ~np.concatenate(([False], is_number[:-1])))
+    first_digits = digit_positions[_first_per_row(rows[digit_positions])]
+    selected_runs = np.zeros(run_ids[-1] + 1, dtype=bool)
+    selected_runs[run_ids[first_digits]] = True
+    in_amount = is_number & selected_runs[run_ids]
+
+    # Mantissa from all the digits of the amount, scaled by the digits after the decimal point
+    amount_digits = np.flatnonzero(in_amount & is_digit)
+    digit_rows = rows[amount_digits]
+    mantissas, _ = _digits_value((buffer[amount_digits] - _ZERO).astype(np.float64), digit_rows, row_count)
+
+    amount_dots = np.flatnonzero(in_amount & is_dot)
+    first_dots = _first_per_row(rows[amount_dots])
+    first_dot = np.full(row_count, len(buffer))
+    first_dot[rows[amount_dots[first_dots]]] = amount_dots[first_dots]
+    decimals = np.bincount(digit_rows[amount_digits > first_dot[digit_rows]], minlength=row_count)
+    numbers = mantissas / _POW10[decimals]
+
+    # Unit: first non blank character after the amount, optionally a K/M/G/T prefix, then "B"
+    amount_positions = np.flatnonzero(in_amount)
+    amount_rows = rows[amount_positions]
+    last_positions = _last_per_row(amount_rows)
+    unit_rows = amount_rows[last_positions]
+
+    end = len(buffer) - 1
+    blank_skipped = np.where((buffer == _SPACE) | (buffer == _TAB), end, np.arange(len(buffer)))
+    next_non_blank = np.minimum.accumulate(blank_skipped[::-1])[::-1]
+    unit_start = next_non_blank[np.minimum(amount_positions[last_positions] + 1, end)]
+
+    upper = buffer & 0xDF  # ASCII upper case, only meaningful for letters
+    is_letter = (upper >= ord("A")) & (upper <= ord("Z"))
+    first, second = upper[unit_start], upper[np.minimum(unit_start + 1, end)]
+    second_is_letter = is_letter[np.minimum(unit_start + 1, end)]
+    third_is_letter = is_letter[np.minimum(unit_start + 2, end)]
+
+    prefix_factors = _PREFIX_FACTORS[first]
+    factors = np.where(
+        (prefix_factors > 0) & (second == ord("B")) & ~third_is_letter,
+        prefix_factors,
+        np.where((first == ord("B")) & ~second_is_letter, 1.0, UNIT_FACTORS[default_unit.value]),
+    )
+    amounts[unit_rows] = numbers[unit_rows] * factors
+    return amounts
+
+
+def _parse_amounts_with_suffix(values: ColumnLike, default_unit: DataUnit, suffix: str) -> np.ndarray:
+    pattern = re.compile(rf"(\d[\d,]*(?:\.\d+)?|\.\d+)\s*([KMGT]?B\b)?\s*(?:{suffix})", re.IGNORECASE)
+    amounts: List[float] = []
+    for text in _as_series(values).fillna("").astype(str):
+        match = pattern.search(text)
+        if not match:
+            amounts.append(np.nan)
+            continue
+        unit = (match.group(2) or default_unit.value).upper()
+        amounts.append(float(match.group(1).replace(",", "")) * UNIT_FACTORS[unit])
+    return np.array(amounts, dtype=np.float64)
+
+
+def bytes_from_unit(values: ColumnLike, unit: DataUnit) -> pd.Series:
+    """Column version of shared.infrastructure.utils.to_bytes for numeric values."""
+    unit_key = unit.value if isinstance(unit, DataUnit) else str(unit).upper()
+    if unit_key not in UNIT_FACTORS:
+        raise ValueError(f"Invalid unit: {unit}. Use one of: {', '.join(UNIT_FACTORS)}")
+    numbers = pd.to_numeric(_as_series(values), errors="coerce")
+    return pd.Series(np.trunc(numbers * UNIT_FACTORS[unit_key]), index=numbers.index).fillna(0).astype("int64")
@@ -257,3 +257,27 @@ class ScraperJobService:
             django_job.completed_at = timezone.now()
 
         django_job.save()
+
+    def reschedule_scraper_job(
+        self, scraper_job_id: int, available_at: datetime, log_message: Optional[str] = None
+    ) -> None:
+        """
+        Put a scraper job back in the queue, to be picked up again at available_at.
+
+        Used by two-phase jobs: the request phase queued the reports on the carrier portal
+        and the collect phase runs once they are expected to be ready.
+
+        Args:
+            scraper_job_id: ID of the scraper job
+            available_at: When the job becomes available again
+            log_message: Optional log message
+        """
+        django_job = DjangoScraperJob.objects.get(id=scraper_job_id)
+        django_job.status = ScraperJobStatus.PENDING
+        django_job.available_at = available_at
+
+        if log_message:
+            current_log = django_job.log or ""
+            django_job.log = f"{current_log}\n{timezone.now()}: {log_message}".strip()
+
+        django_job.save()
@@ -0,0 +1,238 @@
+"""
+Heartbeats that keep idle pooled portal sessions from expiring.
+
+While the processor runs a job in one session, the other sessions of the pool sit idle
+and portals expire them after some minutes; the next job of that credential then pays a
+full login (including MFA). SessionKeepalive touches a lightweight authenticated URL of
+each idle session at a fixed interval.
+
+Playwright's sync API binds the browser objects to the processor's thread, so the
+heartbeats run on a background thread with plain HTTP requests carrying a snapshot of
+the session's cookies (taken when the session goes idle). Cookies the portal rotates in
+the responses are written back to the browser context when the session is used again.
+
+Carriers opt in through SCRAPER_KEEPALIVE_CARRIERS; the auth strategy can declare the
+URL to touch (keepalive_url, default: the last page of the session) and its interval.
+
+Configuration (environment variables):
+    SCRAPER_KEEPALIVE_CARRIERS: Carriers whose idle sessions get heartbeats, comma separated (default none)
+    SCRAPER_KEEPALIVE_INTERVAL_SECONDS: Interval between heartbeats of a session (default 240)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from web_scrapers.application.session_pool import PooledSession, SessionKey
+from web_scrapers.infrastructure import metrics
+
+# Statuses that mean the portal no longer accepts the session
+EXPIRED_STATUS_CODES = {401, 403, 419, 440}
+
+
+def keepalive_carriers() -> Set[str]:
+    value = os.getenv("SCRAPER_KEEPALIVE_CARRIERS", "")
+    return {carrier.strip().lower() for carrier in value.split(",") if carrier.strip()}
+
+
+class KeepaliveTarget:
+    """Heartbeat state of one idle session (owned by the keepalive thread while it is watched)."""
+
+    def __init__(
+        self,
+        key: SessionKey,
+        carrier: str,
+        url: str,
+        login_url: str,
+        cookies: List[Dict[str, Any]],
+        user_agent: Optional[str],
+        interval: float,
+    ):
+        self.key = key
+        self.carrier = carrier
+        self.url = url
+        self.login_url = login_url
+        self.interval = interval
+        self.next_due = time.monotonic() + interval
+        self.heartbeats = 0
+        self.expired = False
+
+        self.http = requests.Session()
+        if user_agent:
+            self.http.headers["User-Agent"] = user_agent
+        self._original: Dict[Tuple[str, str, str], str] = {}
+        for cookie in cookies:
+            rest = {"HttpOnly": None} if cookie.get("httpOnly") else {}
+            self.http.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+                secure=cookie.get("secure", False),
+                expires=int(cookie["expires"]) if cookie.get("expires", -1) > 0 else None,
+                rest=rest,
+            )
+            self._original[(cookie["name"], cookie["domain"], cookie["path"])] = cookie["value"]
+
+    def changed_cookies(self) -> List[Dict[str, Any]]:
+        """Cookies set or rotated by the heartbeat responses, in Playwright's add_cookies format."""
+        changed = []
+        for cookie in self.http.cookies:
+            if self._original.get((cookie.name, cookie.domain, cookie.path)) == cookie.value:
+                continue
+            changed.append(
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires if cookie.expires else -1,
+                    "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+                    "secure": bool(cookie.secure),
+                }
+            )
+        return changed
+
+
+class SessionKeepalive:
+    """Sends heartbeats to the idle sessions of the pool from a background thread."""
+
+    def __init__(self, http_timeout: float = 15.0):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.carriers = keepalive_carriers()
+        self.default_interval = float(os.getenv("SCRAPER_KEEPALIVE_INTERVAL_SECONDS", "240"))
+        self.http_timeout = http_timeout
+
+        self._targets: Dict[SessionKey, KeepaliveTarget] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def enabled_for(self, session: PooledSession) -> bool:
+        carrier = session.session_state.carrier
+        return bool(carrier and carrier.value.lower() in self.carriers and session.auth_strategy)
+
+    def watch(self, session: PooledSession) -> None:
+        """Starts the heartbeats of a session that goes idle (call from the browser's thread)."""
+        if not self.enabled_for(session) or not session.session_state.is_logged_in():
+            return
+
+        strategy = session.auth_strategy
+        try:
+            url = getattr(strategy, "keepalive_url", None) or session.page.url
+            cookies = session.context.cookies()
+            user_agent = session.page.evaluate("() => navigator.userAgent")
+        except Exception as e:
+            self.logger.warning(f"Could not snapshot session {session.key} for keepalive: {str(e)}")
+            return
+        if not url or not url.startswith("http"):
+            return
+
+        interval = getattr(strategy, "keepalive_interval_seconds", None) or self.default_interval
+        target = KeepaliveTarget(
+            session.key,
+            session.session_state.carrier.value,
+            url,
+            session.login_url,
+            cookies,
+            user_agent,
+            interval,
+        )
+        with self._lock:
+            self._targets[session.key] = target
+        self.logger.info(f"Keeping session {session.key} alive every {interval:.0f}s ({url})")
+        self._start()
+        self._wakeup.set()
+
+    def release(self, session: PooledSession) -> Optional[KeepaliveTarget]:
+        """
+        Stops the heartbeats of a session that is used again (call from the browser's thread)
+        and writes the cookies rotated by the heartbeats back to its context.
+
+        Returns:
+            The heartbeat state (heartbeats sent, expired), or None if the session was not watched
+        """
+        with self._lock:
+            target = self._targets.pop(session.key, None)
+        if target is None:
+            return None
+
+        changed = target.changed_cookies()
+        if changed and session.context and not target.expired:
+            try:
+                session.context.add_cookies(changed)
+            except Exception as e:
+                self.logger.warning(f"Could not restore {len(changed)} cookie(s) of session {session.key}: {str(e)}")
+        target.http.close()
+        return target
+
+    def forget(self, session: PooledSession) -> None:
+        """Drops a session that left the pool."""
+        with self._lock:
+            target = self._targets.pop(session.key, None)
+        if target:
+            target.http.close()
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            for target in self._targets.values():
+                target.http.close()
+            self._targets.clear()
+
+    def _start(self) -> None:
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-keepalive", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                due = [t for t in self._targets.values() if not t.expired and t.next_due <= time.monotonic()]
+                pending = [t.next_due for t in self._targets.values() if not t.expired]
+
+            for target in due:
+                self._heartbeat(target)
+
+            if not due:
+                wait = min(pending) - time.monotonic() if pending else None
+                self._wakeup.wait(timeout=max(wait, 0.1) if wait is not None else None)
+                self._wakeup.clear()
+
+    def _heartbeat(self, target: KeepaliveTarget) -> None:
+        try:
+            response = target.http.get(target.url, timeout=self.http_timeout, allow_redirects=True)
+            redirected_to_login = bool(response.history) and self._is_login_page(response.url, target.login_url)
+            if response.status_code in EXPIRED_STATUS_CODES or redirected_to_login:
+                target.expired = True
+                result = "expired"
+                self.logger.info(f"Session {target.key} expired (heartbeat got {response.status_code} {response.url})")
+            else:
+                target.heartbeats += 1
+                result = "success"
+        except Exception as e:
+            # Includes the session being released (closed) while a heartbeat was in flight
+            result = "error"
+            self.logger.warning(f"Heartbeat of session {target.key} failed: {str(e)}")
+        metrics.SESSION_KEEPALIVE_TOTAL.inc(carrier=target.carrier, result=result)
+        target.next_due = time.monotonic() + target.interval
+
+    @staticmethod
+    def _is_login_page(url: str, login_url: str) -> bool:
+        current, login = urlsplit(url), urlsplit(login_url)
+        if current.netloc == login.netloc and current.path.rstrip("/") == login.path.rstrip("/"):
+            return True
+        return any(marker in current.path.lower() for marker in ("/login", "/signin", "/sign-in"))
@@ -1,23 +1,25 @@
+import logging
 import time
 from datetime import datetime
-from typing import Dict, Optional, Type
+from typing import Dict, Optional
 
 from playwright_stealth import Stealth
 
+from web_scrapers.application.session_keepalive import SessionKeepalive
+from web_scrapers.application.session_pool import PooledSession, SessionKey, SessionPool
+from web_scrapers.application.session_validation import SessionValidator
 from web_scrapers.domain.entities.auth_strategies import AuthBaseStrategy
+from web_scrapers.domain.entities.ports import CredentialLease
 from web_scrapers.domain.entities.session import Carrier, Credentials, SessionState, SessionStatus
 from web_scrapers.domain.enums import Navigators, ScraperType
-from web_scrapers.infrastructure.playwright.auth_strategies import (
-    ATTAuthStrategy,
-    BellAuthStrategy,
-    BellEnterpriseAuthStrategy,
-    RogersAuthStrategy,
-    TelusAuthStrategy,
-    TMobileAuthStrategy,
-    VerizonAuthStrategy,
-)
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.lazy_registry import LazyRegistry
 from web_scrapers.infrastructure.playwright.browser_factory import BrowserManager
 from web_scrapers.infrastructure.playwright.browser_wrapper import BrowserWrapper, PlaywrightWrapper
+from web_scrapers.infrastructure.playwright.overlay_handlers import OverlayHandlers
+from web_scrapers.infrastructure.playwright.profile_manager import BrowserProfileManager
+
+AUTH_STRATEGIES_MODULE = "web_scrapers.infrastructure.playwright.auth_strategies"
 
 
 class SessionManager:
@@ -25,40 +27,57 @@ class SessionManager:
     # Carriers que requieren perfil persistente para evitar deteccion de bots
     CARRIERS_WITH_PERSISTENT_PROFILE = {Carrier.ROGERS}
 
-    def __init__(self, browser_type: Optional[Navigators] = None):
+    def __init__(self, browser_type: Optional[Navigators] = None, credential_leases: Optional[CredentialLease] = None):
 
+        self.logger = logging.getLogger(self.__class__.__name__)
         self.browser_manager = BrowserManager()
         self.browser_type = browser_type
-        self.session_state = SessionState()
 
-        self._auth_strategies: dict[tuple[Carrier, ScraperType], Type[AuthBaseStrategy]] = {
-            (Carrier.BELL, ScraperType.MONTHLY_REPORTS): BellEnterpriseAuthStrategy,
-            (Carrier.BELL, ScraperType.DAILY_USAGE): BellAuthStrategy,
-            (Carrier.BELL, ScraperType.PDF_INVOICE): BellAuthStrategy,
-            (Carrier.TELUS, ScraperType.MONTHLY_REPORTS): TelusAuthStrategy,
-            (Carrier.TELUS, ScraperType.DAILY_USAGE): TelusAuthStrategy,
-            (Carrier.TELUS, ScraperType.PDF_INVOICE): TelusAuthStrategy,
-            (Carrier.ROGERS, ScraperType.MONTHLY_REPORTS): RogersAuthStrategy,
-            (Carrier.ROGERS, ScraperType.DAILY_USAGE): RogersAuthStrategy,
-            (Carrier.ROGERS, ScraperType.PDF_INVOICE): RogersAuthStrategy,
-            (Carrier.ATT, ScraperType.MONTHLY_REPORTS): ATTAuthStrategy,
-            (Carrier.ATT, ScraperType.DAILY_USAGE): ATTAuthStrategy,
-            (Carrier.ATT, ScraperType.PDF_INVOICE): ATTAuthStrategy,
-            (Carrier.TMOBILE, ScraperType.MONTHLY_REPORTS): TMobileAuthStrategy,
-            (Carrier.TMOBILE, ScraperType.DAILY_USAGE): TMobileAuthStrategy,
-            (Carrier.TMOBILE, ScraperType.PDF_INVOICE): TMobileAuthStrategy,
-            (Carrier.VERIZON, ScraperType.MONTHLY_REPORTS): VerizonAuthStrategy,
-            (Carrier.VERIZON, ScraperType.DAILY_USAGE): VerizonAuthStrategy,
-            (Carrier.VERIZON, ScraperType.PDF_INVOICE): VerizonAuthStrategy,
-        }
-
-        self._current_auth_strategy: Optional[AuthBaseStrategy] = None
-        self._scraper_type: Optional[ScraperType] = None
-        self._current_login_url: Optional[str] = None  # ← NUEVO: guardar URL de login actual
-        self._browser_wrapper: Optional[BrowserWrapper] = None
+        # The auth strategies module (and its dependencies) is imported on the first login
+        self._auth_strategies: LazyRegistry[tuple[Carrier, ScraperType], AuthBaseStrategy] = LazyRegistry(
+            {
+                (Carrier.BELL, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:BellEnterpriseAuthStrategy",
+                (Carrier.BELL, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:BellAuthStrategy",
+                (Carrier.BELL, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:BellAuthStrategy",
+                (Carrier.TELUS, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:TelusAuthStrategy",
+                (Carrier.TELUS, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:TelusAuthStrategy",
+                (Carrier.TELUS, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:TelusAuthStrategy",
+                (Carrier.ROGERS, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:RogersAuthStrategy",
+                (Carrier.ROGERS, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:RogersAuthStrategy",
+                (Carrier.ROGERS, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:RogersAuthStrategy",
+                (Carrier.ATT, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:ATTAuthStrategy",
+                (Carrier.ATT, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:ATTAuthStrategy",
+                (Carrier.ATT, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:ATTAuthStrategy",
+                (Carrier.TMOBILE, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:TMobileAuthStrategy",
+                (Carrier.TMOBILE, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:TMobileAuthStrategy",
+                (Carrier.TMOBILE, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:TMobileAuthStrategy",
+                (Carrier.VERIZON, ScraperType.MONTHLY_REPORTS): f"{AUTH_STRATEGIES_MODULE}:VerizonAuthStrategy",
+                (Carrier.VERIZON, ScraperType.DAILY_USAGE): f"{AUTH_STRATEGIES_MODULE}:VerizonAuthStrategy",
+                (Carrier.VERIZON, ScraperType.PDF_INVOICE): f"{AUTH_STRATEGIES_MODULE}:VerizonAuthStrategy",
+            }
+        )
+
+        # Authenticated sessions kept alive between jobs, keyed by (credential id, login URL)
+        self.keepalive = SessionKeepalive()
+        self.session_pool = SessionPool(on_remove=self._on_session_removed)
+        # Exclusive use of each credential across workers while this one has a session of it
+        self.credential_leases = credential_leases
+        # Checks de sesión rápidos (cookies/endpoint) con caché corta en lugar de inspeccionar el DOM
+        self.session_validator = SessionValidator()
+        self._active_session: Optional[PooledSession] = None
+        # Perfiles persistentes por credencial (cada uno con su propio navegador)
+        self.profiles = BrowserProfileManager(self.browser_manager.factory)
+        # State of the active session (or of the last failed login if there is none)
+        self.session_state = SessionState()
         self._browser = None
-        self._context = None
-        self._page = None
+
+    @property
+    def _current_auth_strategy(self) -> Optional[AuthBaseStrategy]:
+        return self._active_session.auth_strategy if self._active_session else None
+
+    @property
+    def _browser_wrapper(self) -> Optional[BrowserWrapper]:
+        return self._active_session.browser_wrapper if self._active_session else None
 
     def is_logged_in(self) -> bool:
         return self.refresh_session_status()
@@ -77,16 +96,14 @@ class SessionManager:
             if not self._current_auth_strategy:
                 return False
 
-            # Verificar si hay elementos de login visibles en la pantalla
-            is_active = self._current_auth_strategy.is_logged_in()
+            # Cookies de autenticación o endpoint de la estrategia; el DOM solo si no son concluyentes
+            is_active = self.session_validator.is_valid(self._active_session)
 
             # Si no hay elementos visibles y hay sesión activa, cerrar sesión
             if not is_active:
                 if self.session_state.is_logged_in():
                     self.session_state.set_logged_out()
-                    self._current_auth_strategy = None
-                    self._scraper_type = None
-                    self._current_login_url = None
+                    self._active_session.reset_auth()
                 return False
 
             return is_active
@@ -98,9 +115,8 @@ class SessionManager:
 
     def force_logout(self) -> None:
         self.session_state.set_logged_out()
-        self._current_auth_strategy = None
-        self._scraper_type = None
-        self._current_login_url = None
+        if self._active_session:
+            self._active_session.reset_auth()
 
     def has_error(self) -> bool:
         return self.session_state.is_error()
@@ -108,29 +124,78 @@ class SessionManager:
     def get_error_message(self) -> Optional[str]:
         return self.session_state.error_message
 
-    def _initialize_browser(self, carrier: Optional[Carrier] = None) -> BrowserWrapper:
-
-        if not self._browser_wrapper:
-            # Determinar si el carrier requiere perfil persistente
-            profile_name = None
-            if carrier and carrier in self.CARRIERS_WITH_PERSISTENT_PROFILE:
-                profile_name = carrier.value.lower()  # "rogers", "bell", etc.
-
-            self._browser, self._context = self.browser_manager.get_browser(
-                self.browser_type,
-                profile_name=profile_name
-            )
-            self._page = self._context.new_page()
-            Stealth().apply_stealth_sync(self._page)  # Aplicar stealth a la pagina
-            self._browser_wrapper = PlaywrightWrapper(self._page)
-
-        return self._browser_wrapper
+    def _open_session(self, key: SessionKey, carrier: Optional[Carrier] = None) -> PooledSession:
+        """Opens a new browser context for a session and adds it to the pool."""
+        # Determinar si el carrier requiere perfil persistente
+        profile_name = None
+        if carrier and carrier in self.CARRIERS_WITH_PERSISTENT_PROFILE:
+            # Un perfil por credencial: "rogers_42", "rogers_57", ...
+            profile_name = self.profiles.profile_name(carrier.value, key[0])
+
+        # Liberar sesiones antiguas (LRU) antes de abrir un contexto nuevo
+        self.session_pool.make_room(profile_name=profile_name)
+
+        factory = self.browser_manager.factory
+        if profile_name:
+            # El contexto persistente lanza su propio navegador, junto a los de otros perfiles
+            context = self.profiles.open(profile_name)
+        else:
+            if not self._browser:
+                self._browser = factory.create_browser(self.browser_type)
+            context = factory.create_context(self._browser)
+
+        # Los handlers de modales se instalan en cada pagina nueva del contexto
+        overlay_handlers = OverlayHandlers(context)
+        page = context.new_page()
+        Stealth().apply_stealth_sync(page)  # Aplicar stealth a la pagina
+        session = PooledSession(
+            key,
+            context,
+            page,
+            PlaywrightWrapper(page, on_new_context=self._install_tab_overlays),
+            overlay_handlers=overlay_handlers,
+            profile_name=profile_name,
+        )
+        self.session_pool.add(session)
+        return session
+
+    def _activate(self, session: PooledSession) -> None:
+        previous = self._active_session
+        if previous is not None and previous is not session and previous.context:
+            # La sesión anterior queda inactiva en el pool: heartbeats mientras tanto
+            self.keepalive.watch(previous)
+        self._active_session = session
+        self.session_state = session.session_state
+
+    def _on_session_removed(self, session: PooledSession) -> None:
+        self.keepalive.forget(session)
+        self._release_lease_if_unused(session.credential_id, exclude=session)
+
+    def _release_lease_if_unused(self, credential_id: Optional[int], exclude: Optional[PooledSession] = None) -> None:
+        """Releases the credential's lease once no logged-in pooled session of it remains."""
+        if not self.credential_leases or credential_id is None:
+            return
+        for session in self.session_pool:
+            if session is exclude or session.credential_id != credential_id:
+                continue
+            if session.session_state.is_logged_in():
+                return
+        self.credential_leases.release(credential_id)
+
+    def _install_tab_overlays(self, context) -> None:
+        """Installs the current carrier's overlay handlers on contexts cloned for run_in_tabs."""
+        session = self._active_session
+        if session and session.overlay_handlers and session.overlay_handlers.carrier:
+            OverlayHandlers(context).use_carrier(session.overlay_handlers.carrier)
 
     def get_new_browser_wrapper(self) -> BrowserWrapper:
-        if self._context:
-            self._page = self._context.new_page()
-            Stealth().apply_stealth_sync(self._page)  # Aplicar stealth a la pagina
-            self._browser_wrapper = PlaywrightWrapper(self._page)
+        session = self._active_session
+        if session and session.context:
+            session.page = session.context.new_page()
+            Stealth().apply_stealth_sync(session.page)  # Aplicar stealth a la pagina
+            session.browser_wrapper = PlaywrightWrapper(session.page, on_new_context=self._install_tab_overlays)
+            if session.auth_strategy:
+                session.auth_strategy.browser_wrapper = session.browser_wrapper
         return self._browser_wrapper
 
     def get_browser_wrapper(self) -> Optional[BrowserWrapper]:
@@ -138,59 +203,86 @@ class SessionManager:
 
     def login(self, credentials: Credentials, scraper_type: ScraperType) -> bool:
         try:
-            if self.session_state.is_logged_in():
-                if (
-                    self.session_state.carrier == credentials.carrier
-                    and self.session_state.credentials
-                    and self.session_state.credentials.id == credentials.id
-                    and self._scraper_type == scraper_type
-                ):
-                    return True
-
-                # Si cambió el scraper_type, verificar si la URL de login también cambió
-                if self._scraper_type != scraper_type:
-                    auth_strategy_class = self._auth_strategies.get((credentials.carrier, scraper_type))
-                    if auth_strategy_class:
-                        # Crear instancia temporal para obtener la URL sin afectar la actual
-                        temp_strategy = auth_strategy_class(self._browser_wrapper)
-                        new_login_url = temp_strategy.get_login_url()
-
-                        # Solo hacer logout si la URL de login cambió
-                        if new_login_url != self._current_login_url:
-                            self.logout()
-                        else:
-                            # La URL es la misma, solo actualizar scraper_type y reutilizar sesión
-                            self._scraper_type = scraper_type
-                            return True
-                    else:
-                        self.logout()
-                else:
-                    self.logout()
-
             # CAMBIO CLAVE: Búsqueda con tupla (carrier, scraper_type)
             auth_strategy_class = self._auth_strategies.get((credentials.carrier, scraper_type))
 
             if not auth_strategy_class:
                 error_msg = f"No auth strategy for carrier: {credentials.carrier}, scraper_type: {scraper_type}"
+                self._active_session = None
+                self.session_state = SessionState()
                 self.session_state.set_error(error_msg)
                 return False
-            browser_wrapper = self._initialize_browser(carrier=credentials.carrier)
-            self._current_auth_strategy = auth_strategy_class(browser_wrapper)
-            self._scraper_type = scraper_type
-            self._current_login_url = self._current_auth_strategy.get_login_url()  # ← CAMBIO: guardar URL de login
 
-            login_success = self._current_auth_strategy.login(credentials)
+            # Las sesiones se identifican por credencial y URL de login (p. ej. Bell Enterprise vs Bell antiguo)
+            login_url = auth_strategy_class.get_login_url()
+            key = (credentials.id, login_url)
+
+            session = self.session_pool.get(key)
+            if session and session.session_state.is_logged_in():
+                switched = session is not self._active_session
+                heartbeat = self.keepalive.release(session) if switched else None
+                # Una sesión del pool que no era la activa puede haber expirado mientras tanto
+                if heartbeat and heartbeat.expired:
+                    still_valid = False
+                else:
+                    still_valid = not switched or self.session_validator.is_valid(session)
+                if still_valid:
+                    if switched:
+                        self.logger.info(f"Switching to pooled session of credential {credentials.id} ({login_url})")
+                        if heartbeat and heartbeat.heartbeats:
+                            metrics.SESSION_KEEPALIVE_AVOIDED_LOGINS_TOTAL.inc(carrier=credentials.carrier.value)
+                    self._activate(session)
+                    session.scraper_type = scraper_type
+                    return True
+                self.logger.info(f"Pooled session of credential {credentials.id} ({login_url}) expired")
+                session.session_state.set_logged_out()
+                session.reset_auth()
+
+            # Otro worker con la misma credencial expulsaría esta sesión del portal (y viceversa)
+            if self.credential_leases and credentials.id is not None:
+                if not self.credential_leases.acquire(credentials.id):
+                    if self._active_session and self._active_session.context:
+                        self.keepalive.watch(self._active_session)
+                    self._active_session = None
+                    self.session_state = SessionState()
+                    self.session_state.set_error(f"Credential {credentials.id} in use by another worker")
+                    return False
+
+            if not session:
+                session = self._open_session(key, carrier=credentials.carrier)
+            self._activate(session)
+
+            if session.overlay_handlers:
+                session.overlay_handlers.use_carrier(credentials.carrier)
+            session.auth_strategy = auth_strategy_class(session.browser_wrapper)
+            session.scraper_type = scraper_type
+
+            try:
+                cookies_before = session.browser_wrapper.get_cookies()
+            except Exception:
+                cookies_before = []
+
+            login_started_at = time.monotonic()
+            login_success = session.auth_strategy.login(credentials)
+            metrics.LOGIN_DURATION_SECONDS.observe(
+                time.monotonic() - login_started_at,
+                carrier=credentials.carrier.value,
+                result="success" if login_success else "failure",
+            )
             if login_success:
                 self.session_state.set_logged_in(carrier=credentials.carrier, credentials=credentials)
+                self.session_validator.learn(session, cookies_before)
                 return True
             else:
                 error_msg = f"Error al hacer login con {credentials.carrier}"
                 self.session_state.set_error(error_msg)
+                self._release_lease_if_unused(credentials.id)
                 return False
 
         except Exception as e:
             error_msg = f"Error durante el proceso de login: {str(e)}"
             self.session_state.set_error(error_msg)
+            self._release_lease_if_unused(credentials.id)
             return False
 
     def logout(self) -> bool:
@@ -206,9 +298,7 @@ class SessionManager:
 
             if logout_success:
                 self.session_state.set_logged_out()
-                self._current_auth_strategy = None
-                self._scraper_type = None
-                self._current_login_url = None  # ← CAMBIO: limpiar URL de login
+                self._active_session.reset_auth()
                 return True
             else:
                 error_msg = "Error al hacer logout"
@@ -224,18 +314,15 @@ class SessionManager:
         if self.session_state.is_logged_in():
             self.force_logout()
 
-        self._current_auth_strategy = None
-        self._scraper_type = None
-        self._current_login_url = None
-        self._browser_wrapper = None
-
-        if self._page:
-            self._page.close()
-            self._page = None
-
-        if self._context:
-            self._context.close()
-            self._context = None
+        # Cierra los contextos de todas las sesiones del pool (sin logout en el portal)
+        self.keepalive.stop()
+        self.session_pool.clear(logout=False)
+        self.profiles.close_all()
+        self.profiles.prune()
+        if self.credential_leases:
+            self.credential_leases.release_all()
+        self._active_session = None
+        self.session_state = SessionState()
 
         if self._browser:
             self._browser.close()
@@ -252,12 +339,12 @@ class SessionManager:
                 self.session_state.status = SessionStatus.LOGGED_OUT
 
     def close_all_pages_and_open_new(self):
-        if self._context:
-            for page in self._context.pages:
+        session = self._active_session
+        if session and session.context:
+            for page in session.context.pages:
                 page.close()
-            self._page = self._context.new_page()
-            Stealth().apply_stealth_sync(self._page)  # Aplicar stealth a la pagina
-            self._browser_wrapper = PlaywrightWrapper(self._page)
+            session.page = None
+            self.get_new_browser_wrapper()
 
     def __enter__(self):
         return self
@@ -0,0 +1,199 @@
+"""
+Pool of authenticated portal sessions kept alive between jobs.
+
+Each pooled session has its own browser context (cookies, storage and pages), so the
+sessions of several credentials, or of the same credential on two login URLs (Bell
+Enterprise Centre and the old Bell portal), coexist in one browser. Sessions are keyed
+by (credential id, login URL): when the job order interleaves credentials, the
+SessionManager switches to the pooled session instead of logging out and in again.
+
+The pool evicts the least recently used sessions to make room for a new one, bounded
+by the number of sessions and by the resident memory of the browser processes.
+
+Configuration (environment variables):
+    SCRAPER_SESSION_POOL_SIZE: Maximum sessions kept alive (default 3, 1 = previous single session)
+    SCRAPER_SESSION_POOL_MAX_RSS_MB: Browser memory above which old sessions are evicted (default 2048, 0 = off)
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+
+from web_scrapers.domain.entities.auth_strategies import AuthBaseStrategy
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from web_scrapers.domain.entities.session import SessionState
+from web_scrapers.domain.enums import ScraperType
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.playwright.overlay_handlers import OverlayHandlers
+
+SessionKey = Tuple[Optional[int], str]
+
+
+class PooledSession:
+    """One portal session: its browser context and page, auth strategy and state."""
+
+    def __init__(
+        self,
+        key: SessionKey,
+        context,
+        page,
+        browser_wrapper: BrowserWrapper,
+        overlay_handlers: Optional[OverlayHandlers] = None,
+        profile_name: Optional[str] = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.key = key
+        self.context = context
+        self.page = page
+        self.browser_wrapper = browser_wrapper
+        self.overlay_handlers = overlay_handlers
+        # Persistent profile directory of the context (only one context can use it at a time)
+        self.profile_name = profile_name
+        self.session_state = SessionState()
+        self.auth_strategy: Optional[AuthBaseStrategy] = None
+        self.scraper_type: Optional[ScraperType] = None
+        self.last_used = time.monotonic()
+        # Last positive login check and the auth cookies learned at login (see SessionValidator)
+        self.validated_at: Optional[float] = None
+        self.auth_cookie_names: Set[str] = set()
+
+    @property
+    def credential_id(self) -> Optional[int]:
+        return self.key[0]
+
+    @property
+    def login_url(self) -> str:
+        return self.key[1]
+
+    def reset_auth(self) -> None:
+        """Forgets the login (the context stays open for the next login)."""
+        self.auth_strategy = None
+        self.scraper_type = None
+        self.validated_at = None
+
+    def close(self, logout: bool = True) -> None:
+        """Logs out of the portal (best effort) and closes the context."""
+        if logout and self.auth_strategy and self.session_state.is_logged_in():
+            try:
+                self.auth_strategy.logout()
+            except Exception as e:
+                self.logger.warning(f"Error logging out of session {self.key}: {str(e)}")
+        self.session_state.set_logged_out()
+        self.reset_auth()
+
+        try:
+            if self.page and not self.page.is_closed():
+                self.page.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing page of session {self.key}: {str(e)}")
+        try:
+            if self.context:
+                self.context.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing context of session {self.key}: {str(e)}")
+        self.page = None
+        self.context = None
+
+
+class SessionPool:
+    """Sessions by (credential id, login URL), least recently used first."""
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None,
+        rss_reader: Callable[[], int] = metrics.get_browser_rss_bytes,
+        on_remove: Optional[Callable[[PooledSession], None]] = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_sessions = max(
+            1, max_sessions if max_sessions is not None else int(os.getenv("SCRAPER_SESSION_POOL_SIZE", "3"))
+        )
+        self.max_rss_bytes = (
+            max_rss_bytes
+            if max_rss_bytes is not None
+            else int(os.getenv("SCRAPER_SESSION_POOL_MAX_RSS_MB", "2048")) * 1024 * 1024
+        )
+        self._rss_reader = rss_reader
+        # Called before a session leaves the pool (e.g. to stop its keepalive)
+        self._on_remove = on_remove
+        self._sessions: "OrderedDict[SessionKey, PooledSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[PooledSession]:
+        return iter(list(self._sessions.values()))
+
+    def get(self, key: SessionKey) -> Optional[PooledSession]:
+        """Returns the session of the key (marking it as most recently used), or None."""
+        session = self._sessions.get(key)
+        metrics.SESSION_POOL_LOOKUPS_TOTAL.inc(result="hit" if session else "miss")
+        if session:
+            self._sessions.move_to_end(key)
+            session.last_used = time.monotonic()
+        return session
+
+    def add(self, session: PooledSession) -> None:
+        self._sessions[session.key] = session
+        self._sessions.move_to_end(session.key)
+        metrics.SESSION_POOL_SIZE.set(len(self._sessions))
+
+    def remove(self, key: SessionKey, logout: bool = True) -> None:
+        session = self._sessions.pop(key, None)
+        if session:
+            if self._on_remove:
+                self._on_remove(session)
+            session.close(logout=logout)
+        metrics.SESSION_POOL_SIZE.set(len(self._sessions))
+
+    def make_room(self, profile_name: Optional[str] = None, keep: Optional[SessionKey] = None) -> List[SessionKey]:
+        """
+        Evicts least recently used sessions before a new session is opened.
+
+        Args:
+            profile_name: Persistent profile the new session uses (sessions on it are evicted)
+            keep: Session that must not be evicted (e.g. the one of the running job)
+
+        Returns:
+            Keys of the evicted sessions
+        """
+        evicted: List[SessionKey] = []
+
+        if profile_name:
+            for session in self:
+                if session.profile_name == profile_name and session.key != keep:
+                    self._evict(session.key, "profile", evicted)
+
+        while len(self._sessions) >= self.max_sessions and self._evict_lru("size", keep, evicted):
+            pass
+
+        if self.max_rss_bytes > 0 and self._sessions:
+            rss = self._rss_reader()
+            # Memory is attributed evenly to the sessions; the new one needs one more share
+            share = rss / len(self._sessions)
+            while self._sessions and rss + share > self.max_rss_bytes:
+                if not self._evict_lru("memory", keep, evicted):
+                    break
+                rss -= share
+
+        return evicted
+
+    def clear(self, logout: bool = True) -> None:
+        for key in list(self._sessions):
+            self.remove(key, logout=logout)
+
+    def _evict_lru(self, reason: str, keep: Optional[SessionKey], evicted: List[SessionKey]) -> bool:
+        for key in self._sessions:
+            if key != keep:
+                self._evict(key, reason, evicted)
+                return True
+        return False
+
+    def _evict(self, key: SessionKey, reason: str, evicted: List[SessionKey]) -> None:
+        self.logger.info(f"Evicting session {key} from the pool ({reason})")
+        self.remove(key)
+        metrics.SESSION_POOL_EVICTIONS_TOTAL.inc(reason=reason)
+        evicted.append(key)
@@ -0,0 +1,114 @@
+"""
+Fast validation of pooled portal sessions.
+
+The auth strategies' is_logged_in() probe the DOM with visibility timeouts (several
+seconds, and AT&T even navigates), and the processor checks the session before every
+job. SessionValidator answers from, in order:
+
+1. A recent positive check of the session (SCRAPER_SESSION_CHECK_TTL_SECONDS).
+2. The strategy's session_check_url, requested through the browser context (shares its
+   cookies, no page navigation): 2xx means logged in, a redirect or 401/403 logged out.
+3. The session's auth cookies. The strategy's session_cookie_names all present and not
+   expired means logged in, one missing logged out. Without declared names, the HttpOnly
+   cookies the login itself set (learned after each successful login) are used: all of
+   them gone means logged out, present is not conclusive (session cookies stay in the
+   browser after the portal expired the session).
+4. The strategy's is_logged_in() (DOM) when the fast paths are not conclusive.
+
+Configuration (environment variables):
+    SCRAPER_SESSION_CHECK_TTL_SECONDS: Seconds a positive check is reused (default 60, 0 = off)
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from web_scrapers.application.session_pool import PooledSession
+from web_scrapers.infrastructure import metrics
+
+# Statuses of session_check_url that mean the session is no longer accepted
+LOGGED_OUT_STATUS_CODES = {401, 403}
+
+
+def auth_cookie_names(before: List[Dict[str, Any]], after: List[Dict[str, Any]]) -> Set[str]:
+    """Names of the HttpOnly cookies set or changed by a login (script-set analytics cookies are never HttpOnly)."""
+    previous = {(c["name"], c["domain"], c["path"]): c["value"] for c in before}
+    return {
+        c["name"]
+        for c in after
+        if c.get("httpOnly") and previous.get((c["name"], c["domain"], c["path"])) != c["value"]
+    }
+
+
+class SessionValidator:
+    """Checks whether a pooled session is still logged in, fast paths first."""
+
+    def __init__(self, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.ttl = ttl if ttl is not None else float(os.getenv("SCRAPER_SESSION_CHECK_TTL_SECONDS", "60"))
+        self._clock = clock
+
+    def learn(self, session: PooledSession, cookies_before: List[Dict[str, Any]]) -> None:
+        """Records the auth cookies of a successful login (which also counts as a fresh check)."""
+        try:
+            learned = auth_cookie_names(cookies_before, session.browser_wrapper.get_cookies())
+        except Exception as e:
+            self.logger.debug(f"Could not read cookies of session {session.key}: {str(e)}")
+            learned = set()
+        if learned:
+            session.auth_cookie_names = learned
+            self.logger.info(f"Session {session.key} auth cookies: {', '.join(sorted(learned))}")
+        session.validated_at = self._clock()
+
+    def is_valid(self, session: PooledSession) -> bool:
+        if not session.auth_strategy:
+            return False
+
+        started_at = self._clock()
+        if session.validated_at is not None and started_at - session.validated_at < self.ttl:
+            metrics.SESSION_CHECK_SECONDS.observe(0, method="cache")
+            return True
+
+        method = "fast"
+        result = self._fast_check(session)
+        if result is None:
+            method = "dom"
+            result = session.auth_strategy.is_logged_in()
+
+        metrics.SESSION_CHECK_SECONDS.observe(self._clock() - started_at, method=method)
+        session.validated_at = self._clock() if result else None
+        return result
+
+    def _fast_check(self, session: PooledSession) -> Optional[bool]:
+        """True/False when a fast path is conclusive, None to fall back to the DOM check."""
+        strategy = session.auth_strategy
+        wrapper = session.browser_wrapper
+
+        check_url = getattr(strategy, "session_check_url", None)
+        if check_url:
+            try:
+                status = wrapper.request_status(check_url)
+                if 200 <= status < 300:
+                    return True
+                if 300 <= status < 400 or status in LOGGED_OUT_STATUS_CODES:
+                    return False
+            except Exception as e:
+                self.logger.debug(f"Session check request of {session.key} failed: {str(e)}")
+
+        declared = set(getattr(strategy, "session_cookie_names", ()) or ())
+        names = declared or session.auth_cookie_names
+        if names:
+            try:
+                now = time.time()
+                present = {c["name"] for c in wrapper.get_cookies() if c.get("expires", -1) <= 0 or c["expires"] > now}
+            except Exception as e:
+                self.logger.debug(f"Could not read cookies of session {session.key}: {str(e)}")
+                return None
+            if declared:
+                return declared <= present
+            # Session cookies outlive the server-side session, so learned cookies only prove a logout
+            if not names & present:
+                return False
+
+        return None
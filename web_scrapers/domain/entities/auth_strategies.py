@@ -1,12 +1,14 @@
 import json
 import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 
 import requests
 
 from web_scrapers.domain.entities.session import Credentials, SessionState
+from web_scrapers.infrastructure import metrics
 from web_scrapers.infrastructure.playwright.browser_wrapper import BrowserWrapper
+from web_scrapers.infrastructure.tracing import trace_methods, traced
 
 
 class MFACodeError(Exception):
@@ -18,9 +20,30 @@ class MFACodeError(Exception):
 class AuthBaseStrategy(ABC):
     """Estrategia base abstracta para autenticación."""
 
+    # Pasos del login registrados como spans de tracing
+    TRACED_PHASES: Tuple[str, ...] = (
+        "login",
+        "logout",
+        "is_logged_in",
+        "_handle_2fa_if_present",
+        "_process_2fa",
+    )
+
+    # Keepalive de la sesión mientras está inactiva en el pool (SCRAPER_KEEPALIVE_CARRIERS)
+    keepalive_url: Optional[str] = None  # URL autenticada y liviana; None = última página de la sesión
+    keepalive_interval_seconds: Optional[float] = None  # None = SCRAPER_KEEPALIVE_INTERVAL_SECONDS
+    # Validación rápida de la sesión, sin inspeccionar el DOM (ver SessionValidator)
+    session_check_url: Optional[str] = None  # Endpoint autenticado: 2xx = logueado, redirección/401/403 = no
+    session_cookie_names: Tuple[str, ...] = ()  # Cookies de autenticación; vacío = las aprendidas en el login
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "auth", cls.TRACED_PHASES)
+
     def __init__(self, browser_wrapper: BrowserWrapper):
         self.browser_wrapper = browser_wrapper
 
+    @traced("auth.mfa_wait")
     def _consume_mfa_sse_stream(
         self, endpoint_url: str, email_alias: str, timeout: int = 310, event_type: str = "code"
     ) -> str:
@@ -42,6 +65,10 @@ class AuthBaseStrategy(ABC):
         url = f"{endpoint_url}?email_alias={email_alias}"
         print(f"Connecting to MFA SSE stream: {url}")
 
+        # endpoint_url ends with the carrier slug, e.g. /api/v1/bell
+        carrier_slug = endpoint_url.rstrip("/").rsplit("/", 1)[-1]
+        started_at = time.monotonic()
+        result = "error"
         try:
             with requests.get(url, stream=True, timeout=timeout) as response:
                 response.raise_for_status()
@@ -69,6 +96,7 @@ class AuthBaseStrategy(ABC):
                             value = data.get(event_type)
                             if value:
                                 print(f"MFA {event_type} received: {value}")
+                                result = "success"
                                 return str(value)
 
                         if current_event == "done":
@@ -77,9 +105,12 @@ class AuthBaseStrategy(ABC):
             raise MFACodeError(f"Stream closed unexpectedly without {event_type} or error")
 
         except requests.exceptions.Timeout:
+            result = "timeout"
             raise MFACodeError("Timeout connecting to MFA SSE endpoint")
         except requests.exceptions.RequestException as e:
             raise MFACodeError(f"Error connecting to MFA SSE endpoint: {str(e)}")
+        finally:
+            metrics.MFA_WAIT_SECONDS.observe(time.monotonic() - started_at, carrier=carrier_slug, result=result)
 
     @abstractmethod
     def login(self, credentials: Credentials) -> bool:
@@ -93,8 +124,9 @@ class AuthBaseStrategy(ABC):
     def is_logged_in(self) -> bool:
         raise NotImplementedError()
 
+    @classmethod
     @abstractmethod
-    def get_login_url(self) -> str:
+    def get_login_url(cls) -> str:
         raise NotImplementedError()
 
     @abstractmethod
@@ -1,5 +1,25 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class TableColumn(NamedTuple):
+    """Columna para extract_table: selector CSS relativo a la fila (vacio = la fila misma)."""
+
+    selector: str
+    attribute: Optional[str] = None  # Atributo a leer; si es None se lee el texto
+    all: bool = False  # Si es True devuelve una lista con todos los elementos que coinciden
+    inner_text: bool = False  # Si es True lee el texto renderizado (innerText) en vez de textContent
+
+
+class TabResult(NamedTuple):
+    """Resultado de un sub-flujo ejecutado con run_in_tabs."""
+
+    name: str
+    value: Any = None
+    error: Optional[str] = None  # Mensaje del error si el sub-flujo falló (value es None)
 
 
 class BrowserWrapper(ABC):
@@ -74,6 +94,38 @@ class BrowserWrapper(ABC):
         """Verifica si un elemento está visible."""
         raise NotImplementedError()
 
+    @abstractmethod
+    def wait_for_any(
+        self,
+        selectors: Optional[Dict[str, Union[str, Tuple[str, str]]]] = None,
+        url_patterns: Optional[Dict[str, str]] = None,
+        timeout: int = 10000,
+    ) -> Optional[str]:
+        """
+        Espera a la vez varios selectores visibles y/o patrones de URL (regex).
+
+        Los selectores pueden ser un xpath o una tupla (selector, selector_type).
+        Devuelve la clave del primero que se cumpla, o None si vence el timeout.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def find_first_visible(self, selectors: Sequence[Tuple[str, str]], timeout: int = 10000) -> Optional[int]:
+        """Sondea varios selectores (selector, selector_type) y devuelve el índice del primero visible."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def extract_table(
+        self, selector: str, column_spec: Dict[str, Union[str, TableColumn]], selector_type: str = "xpath"
+    ) -> List[Dict[str, Any]]:
+        """
+        Extrae todas las filas que coinciden con el selector en una sola evaluacion en la pagina.
+
+        Cada columna es un selector CSS relativo a la fila (texto) o un TableColumn.
+        Devuelve una lista de diccionarios {columna: valor}; None si la celda no existe.
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def get_current_url(self) -> str:
         """Obtiene la URL actual."""
@@ -187,3 +239,29 @@ class BrowserWrapper(ABC):
     def click_and_switch_to_new_tab(self, selector: str, timeout: int = 10000, selector_type: str = "xpath") -> None:
         """Hace clic en un enlace que abre una nueva pestaña."""
         raise NotImplementedError()
+
+    def get_cookies(self, urls: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Cookies de la sesión del navegador (todas, o las que aplican a las URLs dadas)."""
+        raise NotImplementedError()
+
+    def request_status(self, url: str, method: str = "GET", timeout: int = 10000) -> int:
+        """Status HTTP de una petición con las cookies de la sesión, sin navegar ni seguir redirecciones."""
+        raise NotImplementedError()
+
+    def run_in_tabs(self, tasks: Dict[str, Callable[["BrowserWrapper"], Any]]) -> List[TabResult]:
+        """
+        Ejecuta sub-flujos independientes (p. ej. la descarga de cada reporte), cada uno con el
+        wrapper de la pestaña donde corre. Un sub-flujo que falla solo pierde su resultado.
+
+        Por defecto los ejecuta en orden en la pestaña actual; los wrappers que pueden abrir
+        pestañas de la misma sesión los reparten entre ellas. Cada sub-flujo debe dejar la
+        pestaña en la página donde la encontró.
+        """
+        results = []
+        for name, task in tasks.items():
+            try:
+                results.append(TabResult(name, task(self)))
+            except Exception as e:
+                logger.error(f"Error en sub-flujo '{name}': {str(e)}", exc_info=True)
+                results.append(TabResult(name, None, str(e)))
+        return results
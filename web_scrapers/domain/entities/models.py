@@ -20,6 +20,7 @@ class FileDownloadInfo(BaseModel):
     file_name: str
     download_url: str
     file_path: str
+    archive_member: Optional[str] = None  # ZIP member uploaded straight from the archive at file_path
     download_timestamp: Optional[datetime] = None
     billing_cycle_file: Optional["BillingCycleFile"] = None  # Mapping to corresponding BillingCycleFile
     daily_usage_file: Optional["BillingCycleDailyUsageFile"] = (
@@ -329,6 +330,7 @@ class FileMappingInfo(BaseModel):
     file_name: str
     file_path: str
     download_url: str
+    archive_member: Optional[str] = None
     billing_cycle_file_id: Optional[int] = None
     carrier_report_name: Optional[str] = None
     daily_usage_file_id: Optional[int] = None
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Optional, Set
 
 
 class NavigatorDriverBuilder(ABC):
@@ -50,3 +50,25 @@ class DailyUsagesScraper(ABC):
 
 class PDFInvoiceScraper(ABC):
     pass
+
+
+class CredentialLease(ABC):
+    """Exclusive use of a carrier portal credential across processes and nodes."""
+
+    @abstractmethod
+    def acquire(self, credential_id: int, wait_seconds: Optional[float] = None) -> bool:
+        """Takes the lease, waiting up to wait_seconds if another worker holds it. Re-entrant."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, credential_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_all(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def leased_elsewhere(self, credential_ids: Iterable[int]) -> Set[int]:
+        """Credentials of the given ones whose lease is held by another worker."""
+        raise NotImplementedError
@@ -1,60 +1,49 @@
-from typing import Dict, Optional, Type
+from typing import Dict, Optional, Tuple
 
 from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
 from web_scrapers.domain.entities.scraper_strategies import ScraperBaseStrategy
 from web_scrapers.domain.entities.session import Carrier
 from web_scrapers.domain.enums import ScraperType
-from web_scrapers.infrastructure.scrapers import (
-    ATTDailyUsageScraperStrategy,
-    ATTMonthlyReportsScraperStrategy,
-    ATTPDFInvoiceScraperStrategy,
-    BellDailyUsageScraperStrategy,
-    BellMonthlyReportsScraperStrategy,
-    BellPDFInvoiceScraperStrategy,
-    RogersDailyUsageScraperStrategy,
-    RogersMonthlyReportsScraperStrategy,
-    RogersPDFInvoiceScraperStrategy,
-    TelusDailyUsageScraperStrategy,
-    TelusMonthlyReportsScraperStrategy,
-    TelusPDFInvoiceScraperStrategy,
-    TMobileDailyUsageScraperStrategy,
-    TMobileMonthlyReportsScraperStrategy,
-    TMobilePDFInvoiceScraperStrategy,
-    VerizonDailyUsageScraperStrategy,
-    VerizonMonthlyReportsScraperStrategy,
-    VerizonPDFInvoiceScraperStrategy,
-)
+from web_scrapers.infrastructure.lazy_registry import LazyRegistry
+
+SCRAPERS_PACKAGE = "web_scrapers.infrastructure.scrapers"
+
+# Strategy class of each (carrier, scraper_type), as "module:Class" relative to SCRAPERS_PACKAGE
+STRATEGY_PATHS: Dict[Tuple[Carrier, ScraperType], str] = {
+    # Bell
+    (Carrier.BELL, ScraperType.MONTHLY_REPORTS): "bell.monthly_reports:BellMonthlyReportsScraperStrategy",
+    (Carrier.BELL, ScraperType.DAILY_USAGE): "bell.daily_usage:BellDailyUsageScraperStrategy",
+    (Carrier.BELL, ScraperType.PDF_INVOICE): "bell.pdf_invoice:BellPDFInvoiceScraperStrategy",
+    # Telus
+    (Carrier.TELUS, ScraperType.MONTHLY_REPORTS): "telus.monthly_reports:TelusMonthlyReportsScraperStrategy",
+    (Carrier.TELUS, ScraperType.DAILY_USAGE): "telus.daily_usage:TelusDailyUsageScraperStrategy",
+    (Carrier.TELUS, ScraperType.PDF_INVOICE): "telus.pdf_invoice:TelusPDFInvoiceScraperStrategy",
+    # Rogers
+    (Carrier.ROGERS, ScraperType.MONTHLY_REPORTS): "rogers.monthly_reports:RogersMonthlyReportsScraperStrategy",
+    (Carrier.ROGERS, ScraperType.DAILY_USAGE): "rogers.daily_usage:RogersDailyUsageScraperStrategy",
+    (Carrier.ROGERS, ScraperType.PDF_INVOICE): "rogers.pdf_invoice:RogersPDFInvoiceScraperStrategy",
+    # ATT
+    (Carrier.ATT, ScraperType.MONTHLY_REPORTS): "att.monthly_reports:ATTMonthlyReportsScraperStrategy",
+    (Carrier.ATT, ScraperType.DAILY_USAGE): "att.daily_usage:ATTDailyUsageScraperStrategy",
+    (Carrier.ATT, ScraperType.PDF_INVOICE): "att.pdf_invoice:ATTPDFInvoiceScraperStrategy",
+    # T-Mobile
+    (Carrier.TMOBILE, ScraperType.MONTHLY_REPORTS): "tmobile.monthly_reports:TMobileMonthlyReportsScraperStrategy",
+    (Carrier.TMOBILE, ScraperType.DAILY_USAGE): "tmobile.daily_usage:TMobileDailyUsageScraperStrategy",
+    (Carrier.TMOBILE, ScraperType.PDF_INVOICE): "tmobile.pdf_invoice:TMobilePDFInvoiceScraperStrategy",
+    # Verizon
+    (Carrier.VERIZON, ScraperType.MONTHLY_REPORTS): "verizon.monthly_reports:VerizonMonthlyReportsScraperStrategy",
+    (Carrier.VERIZON, ScraperType.DAILY_USAGE): "verizon.daily_usage:VerizonDailyUsageScraperStrategy",
+    (Carrier.VERIZON, ScraperType.PDF_INVOICE): "verizon.pdf_invoice:VerizonPDFInvoiceScraperStrategy",
+}
 
 
 class ScraperStrategyFactory:
 
     def __init__(self):
-        self._strategies: Dict[tuple[Carrier, ScraperType], Type[ScraperBaseStrategy]] = {
-            # Bell
-            (Carrier.BELL, ScraperType.MONTHLY_REPORTS): BellMonthlyReportsScraperStrategy,
-            (Carrier.BELL, ScraperType.DAILY_USAGE): BellDailyUsageScraperStrategy,
-            (Carrier.BELL, ScraperType.PDF_INVOICE): BellPDFInvoiceScraperStrategy,
-            # Telus
-            (Carrier.TELUS, ScraperType.MONTHLY_REPORTS): TelusMonthlyReportsScraperStrategy,
-            (Carrier.TELUS, ScraperType.DAILY_USAGE): TelusDailyUsageScraperStrategy,
-            (Carrier.TELUS, ScraperType.PDF_INVOICE): TelusPDFInvoiceScraperStrategy,
-            # Rogers
-            (Carrier.ROGERS, ScraperType.MONTHLY_REPORTS): RogersMonthlyReportsScraperStrategy,
-            (Carrier.ROGERS, ScraperType.DAILY_USAGE): RogersDailyUsageScraperStrategy,
-            (Carrier.ROGERS, ScraperType.PDF_INVOICE): RogersPDFInvoiceScraperStrategy,
-            # ATT
-            (Carrier.ATT, ScraperType.MONTHLY_REPORTS): ATTMonthlyReportsScraperStrategy,
-            (Carrier.ATT, ScraperType.DAILY_USAGE): ATTDailyUsageScraperStrategy,
-            (Carrier.ATT, ScraperType.PDF_INVOICE): ATTPDFInvoiceScraperStrategy,
-            # T-Mobile
-            (Carrier.TMOBILE, ScraperType.MONTHLY_REPORTS): TMobileMonthlyReportsScraperStrategy,
-            (Carrier.TMOBILE, ScraperType.DAILY_USAGE): TMobileDailyUsageScraperStrategy,
-            (Carrier.TMOBILE, ScraperType.PDF_INVOICE): TMobilePDFInvoiceScraperStrategy,
-            # Verizon
-            (Carrier.VERIZON, ScraperType.MONTHLY_REPORTS): VerizonMonthlyReportsScraperStrategy,
-            (Carrier.VERIZON, ScraperType.DAILY_USAGE): VerizonDailyUsageScraperStrategy,
-            (Carrier.VERIZON, ScraperType.PDF_INVOICE): VerizonPDFInvoiceScraperStrategy,
-        }
+        # Strategy modules are imported the first time a job of that carrier/type is created
+        self._strategies: LazyRegistry[Tuple[Carrier, ScraperType], ScraperBaseStrategy] = LazyRegistry(
+            {key: f"{SCRAPERS_PACKAGE}.{path}" for key, path in STRATEGY_PATHS.items()}
+        )
 
     def create_scraper(
         self, carrier: Carrier, scraper_type: ScraperType, browser_wrapper: BrowserWrapper, job_id: int
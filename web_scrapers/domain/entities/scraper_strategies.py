@@ -1,3 +1,5 @@
+import concurrent.futures
+import copy
 import logging
 import os
 import shutil
@@ -5,7 +7,7 @@ import uuid
 import zipfile
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
 from web_scrapers.domain.entities.models import (
@@ -17,7 +19,14 @@ from web_scrapers.domain.entities.models import (
     ScraperConfig,
 )
 from web_scrapers.domain.entities.session import Credentials
+from web_scrapers.infrastructure.job_checkpoint import JobCheckpoint, job_checkpoints_enabled
+from web_scrapers.infrastructure.job_phases import JobPhaseState, collect_max_attempts, two_phase_enabled
 from web_scrapers.infrastructure.services.file_upload_service import FileUploadService
+from web_scrapers.infrastructure.services.upload_outbox import UploadOutbox, upload_outbox_enabled
+from web_scrapers.infrastructure.tracing import trace_methods
+
+# Chunk size used to copy ZIP members to disk
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
 
 
 class ScraperResult:
@@ -27,30 +36,76 @@ class ScraperResult:
         message: str = "",
         files: Optional[List[FileMappingInfo]] = None,
         error: Optional[str] = None,
+        upload_pending: bool = False,
+        reschedule_after: Optional[float] = None,
     ):
         self.success = success
         self.message = message
         self.files = files or []
         self.error = error
+        self.upload_pending = upload_pending  # Files downloaded and enqueued in the upload outbox
+        self.reschedule_after = reschedule_after  # Seconds after which the job must run again (collect phase)
         self.timestamp = datetime.now()
 
 
 class ScraperBaseStrategy(ABC):
+    # Phases recorded as tracing spans. Subclasses can add carrier-specific steps in traced_phases.
+    TRACED_PHASES: Tuple[str, ...] = (
+        "execute",
+        "_find_files_section",
+        "_download_files",
+        "_extract_zip_files",
+        "_upload_files_to_endpoint",
+        "_upload_files_with_individual_tracking",
+    )
+    traced_phases: Tuple[str, ...] = ()
+    # Strategies that implement _request_reports run as two-phase jobs (see _request_phase)
+    supports_two_phase: bool = False
+    # Seconds between the request phase and the collect phase of two-phase jobs (see _request_reports)
+    collect_delay_seconds: float = 600
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls, "strategy", cls.TRACED_PHASES + cls.traced_phases)
+
     def __init__(self, browser_wrapper: BrowserWrapper, job_id: int):
         self.browser_wrapper = browser_wrapper
         self.job_id = job_id
         self.job_downloads_dir: Optional[str] = None
+        # Slugs of the reports already downloaded by a previous attempt of the job (see JobCheckpoint)
+        self.checkpointed_slugs: Set[str] = set()
+        # Set while collecting reports queued by the request phase of a previous run (see JobPhaseState)
+        self.phase_state: Optional[JobPhaseState] = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
     @abstractmethod
     def execute(self, config: ScraperConfig, billing_cycle: BillingCycle, credentials: Credentials) -> ScraperResult:
         raise NotImplementedError()
 
-    def _prepare_job_directory(self) -> str:
+    def _prepare_job_directory(self, keep_paths: Optional[Iterable[str]] = None) -> str:
         downloads_base = os.path.abspath("downloads")
         job_dir = os.path.join(downloads_base, f"job_{self.job_id}")
 
-        if os.path.exists(job_dir):
+        keep = {os.path.abspath(path) for path in keep_paths or ()}
+        if upload_outbox_enabled() and os.path.exists(job_dir):
+            # Files of a previous attempt still queued for upload are read by the outbox worker
+            try:
+                keep |= {os.path.abspath(path) for path in UploadOutbox().pending_file_paths(self.job_id)}
+            except Exception as e:
+                self.logger.warning(f"Could not read pending uploads of job_{self.job_id}: {str(e)}")
+
+        if os.path.exists(job_dir) and keep:
+            # Resumed job: keep the files of the previous attempt that are still needed
+            for entry in os.listdir(job_dir):
+                entry_path = os.path.join(job_dir, entry)
+                if entry_path in keep or any(path.startswith(entry_path + os.sep) for path in keep):
+                    continue
+                if os.path.isdir(entry_path):
+                    shutil.rmtree(entry_path)
+                else:
+                    os.remove(entry_path)
+            self.logger.info(f"Cleaned directory for job_{self.job_id}, kept {len(keep)} checkpointed/queued file(s)")
+        elif os.path.exists(job_dir):
             shutil.rmtree(job_dir)
             self.logger.info(f"Cleaned existing directory for job_{self.job_id}")
 
@@ -71,6 +126,7 @@ class ScraperBaseStrategy(ABC):
                 file_id=file_info.file_id,
                 file_name=file_info.file_name,
                 file_path=file_info.file_path,
+                archive_member=file_info.archive_member,
                 download_url=file_info.download_url,
                 billing_cycle_file_id=file_info.billing_cycle_file.id if file_info.billing_cycle_file else None,
                 carrier_report_name=(
@@ -84,16 +140,29 @@ class ScraperBaseStrategy(ABC):
             for file_info in downloaded_files
         ]
 
-    def _extract_zip_files(self, zip_file_path: str, extract_to_dir: Optional[str] = None) -> List[str]:
+    def _extract_zip_files(
+        self,
+        zip_file_path: str,
+        extract_to_dir: Optional[str] = None,
+        member_filter: Optional[Callable[[str], bool]] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[str]:
         """
         Extract files from a ZIP and return paths of all extracted files.
 
+        Members are flattened to the first level of the extraction directory and
+        copied in chunks (never fully loaded in memory). Name collisions get a
+        numeric suffix (file_1.csv, file_2.csv...).
+
         Args:
             zip_file_path: Path of the ZIP file to extract
             extract_to_dir: Directory to extract to (if not specified, uses ZIP directory)
+            member_filter: Optional predicate on the member file name (without folders); only members
+                for which it returns True are written
+            max_workers: Members extracted in parallel (defaults to SCRAPER_ZIP_EXTRACT_WORKERS, 1 if not set)
 
         Returns:
-            List of extracted file paths
+            List of extracted file paths, in archive order
         """
         extracted_files = []
         try:
@@ -118,48 +187,36 @@ class ScraperBaseStrategy(ABC):
             self.logger.info(f"Extracting ZIP: {os.path.basename(zip_file_path)}")
             self.logger.info(f"Extraction directory: {extract_to_dir}")
 
-            # Extract files
-            with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-                file_list = zip_ref.namelist()
-                self.logger.info(f"Elements in ZIP: {len(file_list)}")
-
-                for file_name in file_list:
-                    # Only process files, not directories
-                    if not file_name.endswith("/"):
-                        # Get only the filename (without folder path)
-                        base_filename = os.path.basename(file_name)
-
-                        # Avoid hidden or system files
-                        if base_filename and not base_filename.startswith("."):
-                            # Read file content from ZIP
-                            file_content = zip_ref.read(file_name)
-
-                            # Create destination path at first level
-                            flattened_file_path = os.path.join(extract_to_dir, base_filename)
-
-                            # If file with same name exists, add a number
-                            counter = 1
-                            original_path = flattened_file_path
-                            while os.path.exists(flattened_file_path):
-                                name, ext = os.path.splitext(base_filename)
-                                flattened_file_path = os.path.join(extract_to_dir, f"{name}_{counter}{ext}")
-                                counter += 1
-
-                            # Write file to extraction directory (first level)
-                            with open(flattened_file_path, "wb") as output_file:
-                                output_file.write(file_content)
-
-                            extracted_files.append(flattened_file_path)
-
-                            # Show extraction information
-                            if file_name != base_filename:
-                                self.logger.debug(f"Extracted: {file_name} -> {base_filename}")
-                            else:
-                                self.logger.debug(f"Extracted: {base_filename}")
-                        else:
-                            self.logger.debug(f"Ignored system file: {file_name}")
-                    else:
-                        self.logger.debug(f"Ignored directory: {file_name}")
+            # Plan the extraction: which members are written and to which (unique) path
+            used_names = set(os.listdir(extract_to_dir))
+            planned: List[Tuple[zipfile.ZipInfo, str]] = []
+            for member in self._list_zip_members(zip_file_path, member_filter):
+                # If file with same name exists, add a number
+                base_filename = os.path.basename(member.filename)
+                target_name = base_filename
+                counter = 1
+                while target_name in used_names:
+                    name, ext = os.path.splitext(base_filename)
+                    target_name = f"{name}_{counter}{ext}"
+                    counter += 1
+                used_names.add(target_name)
+                planned.append((member, os.path.join(extract_to_dir, target_name)))
+
+            # Write the planned members (in parallel, each worker reads through its own ZipFile handle)
+            max_workers = max_workers or int(os.getenv("SCRAPER_ZIP_EXTRACT_WORKERS", "1"))
+            if max_workers > 1 and len(planned) > 1:
+
+                def extract_with_own_handle(item: Tuple[zipfile.ZipInfo, str]) -> None:
+                    with zipfile.ZipFile(zip_file_path, "r") as worker_zip:
+                        self._extract_zip_member(worker_zip, *item)
+
+                with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(planned))) as executor:
+                    list(executor.map(extract_with_own_handle, planned))
+            else:
+                with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+                    for member, target_path in planned:
+                        self._extract_zip_member(zip_ref, member, target_path)
+            extracted_files = [target_path for _, target_path in planned]
 
             # Extraction summary
             self.logger.info(f"EXTRACTION SUMMARY:")
@@ -180,6 +237,53 @@ class ScraperBaseStrategy(ABC):
             self.logger.error(f"Error extracting ZIP: {str(e)}")
             return extracted_files
 
+    def _list_zip_members(
+        self, zip_file_path: str, member_filter: Optional[Callable[[str], bool]] = None
+    ) -> List[zipfile.ZipInfo]:
+        """
+        Lists the file members of a ZIP, skipping directories and hidden/system files.
+
+        Args:
+            zip_file_path: Path of the ZIP file
+            member_filter: Optional predicate on the member file name (without folders)
+
+        Returns:
+            Members in archive order
+        """
+        with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+            members = zip_ref.infolist()
+        self.logger.info(f"Elements in ZIP: {len(members)}")
+
+        selected = []
+        for member in members:
+            # Only process files, not directories
+            if member.is_dir():
+                self.logger.debug(f"Ignored directory: {member.filename}")
+                continue
+
+            # Get only the filename (without folder path) and avoid hidden or system files
+            base_filename = os.path.basename(member.filename)
+            if not base_filename or base_filename.startswith("."):
+                self.logger.debug(f"Ignored system file: {member.filename}")
+                continue
+
+            if member_filter and not member_filter(base_filename):
+                self.logger.info(f"Skipped (not needed): {base_filename}")
+                continue
+
+            selected.append(member)
+        return selected
+
+    def _extract_zip_member(self, zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, target_path: str) -> None:
+        """Copies one ZIP member to target_path in chunks."""
+        with zip_ref.open(member) as source, open(target_path, "wb") as output_file:
+            shutil.copyfileobj(source, output_file, ZIP_COPY_CHUNK_SIZE)
+
+        if member.filename != os.path.basename(target_path):
+            self.logger.debug(f"Extracted: {member.filename} -> {os.path.basename(target_path)}")
+        else:
+            self.logger.debug(f"Extracted: {member.filename}")
+
     def _upload_files_to_endpoint(
         self, files: List[FileDownloadInfo], config: ScraperConfig, billing_cycle: BillingCycle
     ) -> bool:
@@ -274,6 +378,168 @@ class ScraperBaseStrategy(ABC):
 
         return result
 
+    def _is_checkpointed(self, slug: Optional[str]) -> bool:
+        """True if a previous attempt already downloaded the report (carriers skip it on retries)."""
+        if slug and slug in self.checkpointed_slugs:
+            self.logger.info(f"Skipping report '{slug}': already downloaded by a previous attempt")
+            return True
+        return False
+
+    def _download_in_tabs(
+        self,
+        subflows: Dict[
+            str, Callable[["ScraperBaseStrategy"], Union[Optional[FileDownloadInfo], List[FileDownloadInfo]]]
+        ],
+    ) -> List[FileDownloadInfo]:
+        """
+        Runs independent download sub-flows through browser_wrapper.run_in_tabs and merges their files.
+
+        Each sub-flow receives a copy of the strategy bound to the tab it runs on (see _copy_for_tab), must
+        start and end on the page the strategy is on now, and returns a file, a list of files
+        or None. A failing sub-flow only loses its own files.
+        """
+
+        def bind(name, subflow):
+            def task(wrapper: BrowserWrapper):
+                if wrapper is self.browser_wrapper:
+                    return subflow(self)
+                return subflow(self._copy_for_tab(wrapper, name))
+
+            return task
+
+        tasks = {name: bind(name, subflow) for name, subflow in subflows.items()}
+        downloaded_files: List[FileDownloadInfo] = []
+        for result in self.browser_wrapper.run_in_tabs(tasks):
+            if result.error:
+                self.logger.error(f"Sub-flow '{result.name}' failed: {result.error}")
+            elif isinstance(result.value, list):
+                downloaded_files.extend(result.value)
+            elif result.value:
+                downloaded_files.append(result.value)
+        return downloaded_files
+
+    def _copy_for_tab(self, wrapper: BrowserWrapper, name: str) -> "ScraperBaseStrategy":
+        """
+        Copy of the strategy for a sub-flow running on another thread: bound to the tab's wrapper,
+        with its own logger and its own copies of the mutable state (lists, dicts, sets, phase
+        state), so the tabs never mutate each other's state nor the strategy's.
+        """
+        tab_strategy = copy.copy(self)
+        for attribute, value in vars(self).items():
+            if attribute in ("browser_wrapper", "logger"):
+                continue
+            if isinstance(value, (list, dict, set, JobPhaseState)):
+                setattr(tab_strategy, attribute, copy.deepcopy(value))
+        tab_strategy.browser_wrapper = wrapper
+        tab_strategy.logger = self.logger.getChild(name)
+        return tab_strategy
+
+    def _upload_additional_data(self) -> Optional[Dict[str, Any]]:
+        """Extra form fields sent with the uploaded files. Override if the endpoint needs them."""
+        return None
+
+    def _request_reports(
+        self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Request phase of carriers that generate reports asynchronously: queues the reports on
+        the portal without waiting for them. Only called when supports_two_phase is set.
+
+        Returns:
+            JSON-serializable data the collect phase needs (available in self.phase_state), or
+            None to wait for the reports in the same run
+        """
+        return None
+
+    def _request_phase(
+        self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
+    ) -> Optional[ScraperResult]:
+        """
+        Runs the request phase, or sets self.phase_state if the reports were already requested
+        by a previous run and this run collects them.
+
+        Returns:
+            ScraperResult rescheduling the job after collect_delay_seconds, or None to go on
+            with the download (collect phase, two-phase disabled or unsupported)
+        """
+        if not (two_phase_enabled() and self.supports_two_phase):
+            return None
+
+        state = JobPhaseState(self.job_id)
+        if state.expired:
+            # Notifications of that request could be mistaken for this run's reports: request them again
+            self.logger.warning(
+                f"Discarding reports requested at {state.requested_at} "
+                f"({state.collect_attempts} collect attempt(s)), requesting them again"
+            )
+            state.clear()
+
+        if state.requested:
+            state.record_collect_attempt()
+            self.phase_state = state
+            self.logger.info(
+                f"Collect phase (attempt {state.collect_attempts}/{collect_max_attempts()}) "
+                f"of reports requested at {state.requested_at}"
+            )
+            return None
+
+        request_data = self._request_reports(files_section, config, billing_cycle)
+        if request_data is None:
+            return None
+        state.save_request(request_data)
+
+        message = f"Reports requested, collecting in {int(self.collect_delay_seconds)}s"
+        self.logger.info(message)
+        return ScraperResult(True, message, reschedule_after=self.collect_delay_seconds)
+
+    def _finish_collect_phase(self, complete: bool) -> Optional[ScraperResult]:
+        """
+        Ends the collect phase. Reports not ready yet are collected again later while attempts
+        remain; otherwise the job goes on and its next run requests the reports again.
+
+        Returns:
+            ScraperResult rescheduling the job, or None to go on with the upload
+        """
+        state = self.phase_state
+        if state is None:
+            return None
+        if not complete and state.collect_attempts < collect_max_attempts():
+            message = f"Reports not ready yet, collecting again in {int(self.collect_delay_seconds)}s"
+            self.logger.info(message)
+            return ScraperResult(True, message, reschedule_after=self.collect_delay_seconds)
+
+        state.clear()
+        self.phase_state = None
+        return None
+
+    def _defer_uploads(self, files: List[FileDownloadInfo], billing_cycle: BillingCycle) -> Optional[ScraperResult]:
+        """
+        Enqueues the files in the upload outbox when it is enabled, so the worker uploads
+        them in the background and the browser moves on to the next job.
+
+        Returns:
+            ScraperResult with upload_pending=True, or None to upload synchronously (outbox
+            disabled, nothing left to upload or enqueue failed)
+        """
+        if not upload_outbox_enabled() or not files:
+            return None
+        try:
+            UploadOutbox().enqueue(
+                self.job_id,
+                self._get_upload_type(),
+                files,
+                billing_cycle,
+                additional_data=self._upload_additional_data(),
+                cleanup_dir=self.job_downloads_dir,
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not enqueue uploads, uploading synchronously: {str(e)}")
+            return None
+
+        message = f"{len(files)} file(s) downloaded, upload pending"
+        self.logger.info(message)
+        return ScraperResult(True, message, self._create_file_mapping(files), upload_pending=True)
+
     def _get_upload_type(self) -> str:
         """Determine upload type based on strategy class."""
         class_name = self.__class__.__name__.lower()
@@ -287,29 +553,85 @@ class ScraperBaseStrategy(ABC):
             return "unknown"
 
 
+trace_methods(ScraperBaseStrategy, "strategy", ScraperBaseStrategy.TRACED_PHASES)
+
+
 class MonthlyReportsScraperStrategy(ScraperBaseStrategy):
 
     def execute(self, config: ScraperConfig, billing_cycle: BillingCycle, credentials: Credentials) -> ScraperResult:
         try:
-            # Step 0: Prepare job directory
-            self._prepare_job_directory()
-
-            # Step 1: Find files section
-            files_section = self._find_files_section(config, billing_cycle)
-            if not files_section:
-                return ScraperResult(False, error="Could not find files section")
+            # Step 0: Restore the progress of previous attempts and prepare job directory
+            checkpoint = JobCheckpoint(self.job_id) if job_checkpoints_enabled() else None
+            restored_files = checkpoint.restore() if checkpoint else []
+            self._prepare_job_directory(keep_paths=[file_info.file_path for file_info in restored_files])
+
+            expected_files = billing_cycle.billing_cycle_files or []
+            restored_ids = {file_info.billing_cycle_file.id for file_info in restored_files}
+            missing_files = [bcf for bcf in expected_files if bcf.id not in restored_ids]
+            self.checkpointed_slugs = {
+                file_info.billing_cycle_file.carrier_report.slug
+                for file_info in restored_files
+                if file_info.billing_cycle_file.carrier_report and file_info.billing_cycle_file.carrier_report.slug
+            }
+            downloaded_files = list(restored_files)
+            if restored_files:
+                self.logger.info(
+                    f"Resuming job: {len(restored_files)}/{len(expected_files)} files already downloaded, "
+                    f"{len(missing_files)} missing"
+                )
 
-            # Step 2: Download files
-            downloaded_files = self._download_files(files_section, config, billing_cycle)
+            if missing_files or not restored_files:
+                # Only the still-missing BillingCycleFiles are passed to the carrier
+                pending_cycle = billing_cycle.model_copy(update={"billing_cycle_files": missing_files})
+
+                # Step 1: Find files section
+                files_section = self._find_files_section(config, pending_cycle)
+                if not files_section:
+                    return ScraperResult(False, error="Could not find files section")
+
+                # Two-phase carriers queue the reports and release the worker until they are ready
+                requested = self._request_phase(files_section, config, pending_cycle)
+                if requested:
+                    return requested
+
+                # Step 2: Download files (bundles such as ZIPs may bring back reports already checkpointed)
+                new_files = [
+                    file_info
+                    for file_info in self._download_files(files_section, config, pending_cycle)
+                    if not (file_info.billing_cycle_file and file_info.billing_cycle_file.id in restored_ids)
+                ]
+                if checkpoint:
+                    for file_info in new_files:
+                        checkpoint.record_downloaded(file_info)
+                downloaded_files += new_files
 
             # Calculate expected files from billing_cycle
-            expected_files_count = len(billing_cycle.billing_cycle_files) if billing_cycle.billing_cycle_files else 0
+            expected_files_count = len(expected_files)
             downloaded_count = len(downloaded_files)
 
             self.logger.info(f"Download phase complete: {downloaded_count}/{expected_files_count} files downloaded")
 
+            # Reports still being generated are collected by a later run (the checkpoint keeps the rest)
+            collect_again = self._finish_collect_phase(downloaded_count == expected_files_count)
+            if collect_again:
+                return collect_again
+
+            # Files acknowledged by the backend in a previous attempt are not uploaded again
+            already_uploaded = [f for f in downloaded_files if checkpoint and checkpoint.is_uploaded(f)]
+            files_to_upload = [f for f in downloaded_files if not (checkpoint and checkpoint.is_uploaded(f))]
+
+            # Complete downloads go to the upload outbox (if enabled); partial ones are uploaded and reported now
+            if downloaded_count == expected_files_count:
+                deferred = self._defer_uploads(files_to_upload, billing_cycle)
+                if deferred:
+                    return deferred
+
             # Step 3: Upload files with individual tracking
-            upload_tracking = self._upload_files_with_individual_tracking(downloaded_files, config, billing_cycle)
+            upload_tracking = self._upload_files_with_individual_tracking(files_to_upload, config, billing_cycle)
+            if checkpoint:
+                for file_info in upload_tracking["uploaded_files"]:
+                    checkpoint.record_uploaded(file_info)
+            uploaded_files = already_uploaded + upload_tracking["uploaded_files"]
 
             # Step 4: Determine final success based on download and upload results
             download_failures = expected_files_count - downloaded_count
@@ -321,10 +643,12 @@ class MonthlyReportsScraperStrategy(ScraperBaseStrategy):
                 # Perfect success: all files downloaded and uploaded
                 message = f"SUCCESS: All {expected_files_count} files downloaded and uploaded"
                 self.logger.info(message)
+                if checkpoint:
+                    checkpoint.clear()
                 self._cleanup_job_directory()
-                return ScraperResult(True, message, self._create_file_mapping(upload_tracking["uploaded_files"]))
+                return ScraperResult(True, message, self._create_file_mapping(uploaded_files))
             else:
-                # Partial or complete failure - keep folder for investigation
+                # Partial or complete failure - keep folder (and checkpoint) for investigation and retry
                 error_parts = []
 
                 if download_failures > 0:
@@ -339,7 +663,7 @@ class MonthlyReportsScraperStrategy(ScraperBaseStrategy):
                 error_message = f"ERROR: {', '.join(error_parts)}. "
                 error_message += f"Expected: {expected_files_count}, "
                 error_message += f"Downloaded: {downloaded_count}, "
-                error_message += f"Uploaded: {upload_tracking['successful_uploads']}"
+                error_message += f"Uploaded: {len(uploaded_files)}"
 
                 self.logger.error(error_message)
                 self.logger.warning(f"Folder job_{self.job_id} kept due to errors")
@@ -348,7 +672,7 @@ class MonthlyReportsScraperStrategy(ScraperBaseStrategy):
                 return ScraperResult(
                     False,
                     error_message,
-                    self._create_file_mapping(upload_tracking["uploaded_files"]),
+                    self._create_file_mapping(uploaded_files),
                     error=error_message,
                 )
 
@@ -384,6 +708,11 @@ class DailyUsageScraperStrategy(ScraperBaseStrategy):
             if not downloaded_files:
                 return ScraperResult(False, error="Could not download files")
 
+            # Only the first file is uploaded for daily usage (see _upload_files_to_endpoint)
+            deferred = self._defer_uploads(downloaded_files[:1], billing_cycle)
+            if deferred:
+                return deferred
+
             upload_result = self._upload_files_to_endpoint(downloaded_files, config, billing_cycle)
             if not upload_result:
                 return ScraperResult(False, error="Error sending files to external endpoint")
@@ -396,6 +725,12 @@ class DailyUsageScraperStrategy(ScraperBaseStrategy):
         except Exception as e:
             return ScraperResult(False, error=str(e))
 
+    def _upload_additional_data(self) -> Optional[Dict[str, Any]]:
+        return {
+            "pool_size": self.pool_size,
+            "pool_used": self.pool_used,
+        }
+
     def _upload_files_to_endpoint(
         self, files: List[FileDownloadInfo], config: ScraperConfig, billing_cycle: BillingCycle
     ) -> bool:
@@ -403,16 +738,12 @@ class DailyUsageScraperStrategy(ScraperBaseStrategy):
         try:
             upload_service = FileUploadService()
             file_info = files[0]
-            additional_data = {
-                "pool_size": self.pool_size,
-                "pool_used": self.pool_used,
-            }
 
             return upload_service._upload_single_file(
                 file_info=file_info,
                 billing_cycle=billing_cycle,
                 upload_type="daily_usage",
-                additional_data=additional_data,
+                additional_data=self._upload_additional_data(),
             )
 
         except Exception as e:
@@ -444,6 +775,10 @@ class PDFInvoiceScraperStrategy(ScraperBaseStrategy):
             if not downloaded_files:
                 return ScraperResult(False, error="Could not download files")
 
+            deferred = self._defer_uploads(downloaded_files, billing_cycle)
+            if deferred:
+                return deferred
+
             upload_result = self._upload_files_to_endpoint(downloaded_files, config, billing_cycle)
             if not upload_result:
                 return ScraperResult(False, error="Error sending files to external endpoint")
@@ -49,6 +49,7 @@ class PhoneNumberStatus(str, Enum):
 class ScraperJobStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
+    UPLOAD_PENDING = "upload_pending"  # Files downloaded, waiting in the upload outbox
     SUCCESS = "success"
     ERROR = "error"
 
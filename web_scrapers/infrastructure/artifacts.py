@@ -0,0 +1,28 @@
+"""
+Per-job artifact directories (traces, profiles and other diagnostics).
+
+Unlike ``downloads/job_<id>``, which is deleted after a successful run, the
+artifact directory survives the job so it can be inspected afterwards.
+"""
+
+import os
+
+
+def get_artifacts_base_dir() -> str:
+    """Returns the base directory for job artifacts (``SCRAPER_ARTIFACTS_DIR``, default ``artifacts``)."""
+    return os.path.abspath(os.getenv("SCRAPER_ARTIFACTS_DIR", "artifacts"))
+
+
+def get_job_artifacts_dir(job_id: int) -> str:
+    """
+    Returns (and creates) the artifact directory for a job.
+
+    Args:
+        job_id: ScraperJob ID
+
+    Returns:
+        Absolute path of the job's artifact directory
+    """
+    job_dir = os.path.join(get_artifacts_base_dir(), f"job_{job_id}")
+    os.makedirs(job_dir, exist_ok=True)
+    return job_dir
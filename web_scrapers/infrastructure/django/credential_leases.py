@@ -0,0 +1,161 @@
+"""
+Cross-process leases on carrier portal credentials with PostgreSQL advisory locks.
+
+Two workers logging in with the same CarrierPortalCredential kick each other's portal
+session out (login storms, MFA floods). A worker holds the lease of a credential while
+it has a session of it: SessionManager acquires it before logging in and releases it
+when the credential's last pooled session goes away, and the processor defers jobs
+whose credential is leased by another worker.
+
+A lease is a session-level advisory lock pg_try_advisory_lock(namespace, credential_id).
+It lives as long as the database connection that took it, so a crashed worker never
+leaves a stale lease. All queries run on one dedicated thread: its connection holds the
+locks for the whole run, and it keeps the ORM out of the async context Playwright leaves
+on the processor's thread.
+
+Configuration (environment variables):
+    SCRAPER_CREDENTIAL_LEASES_ENABLED: Take credential leases (default true)
+    SCRAPER_CREDENTIAL_LEASE_WAIT_SECONDS: Maximum wait for a contended credential at login (default 120)
+    SCRAPER_CREDENTIAL_LEASE_POLL_SECONDS: Interval between attempts while waiting (default 5)
+    SCRAPER_CREDENTIAL_LEASE_NAMESPACE: First key of the advisory locks (default 7301)
+    SCRAPER_CREDENTIAL_BUSY_DELAY_SECONDS: Delay of jobs whose credential another worker holds (default 300)
+"""
+
+import concurrent.futures
+import logging
+import os
+import time
+from typing import Any, Callable, Iterable, Optional, Set
+
+from django.db import DatabaseError, connection
+
+from web_scrapers.domain.entities.ports import CredentialLease
+from web_scrapers.infrastructure import metrics
+
+
+def credential_leases_enabled() -> bool:
+    return os.getenv("SCRAPER_CREDENTIAL_LEASES_ENABLED", "true").lower() == "true"
+
+
+class PostgresCredentialLease(CredentialLease):
+    """Credential leases held as advisory locks on a dedicated database connection."""
+
+    def __init__(
+        self,
+        namespace: Optional[int] = None,
+        wait_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.namespace = (
+            namespace if namespace is not None else int(os.getenv("SCRAPER_CREDENTIAL_LEASE_NAMESPACE", "7301"))
+        )
+        self.wait_seconds = (
+            wait_seconds
+            if wait_seconds is not None
+            else float(os.getenv("SCRAPER_CREDENTIAL_LEASE_WAIT_SECONDS", "120"))
+        )
+        self.poll_seconds = (
+            poll_seconds
+            if poll_seconds is not None
+            else float(os.getenv("SCRAPER_CREDENTIAL_LEASE_POLL_SECONDS", "5"))
+        )
+        self._sleep = sleep
+        self._held: Set[int] = set()
+        # One thread = one connection holding all the locks of this worker
+        self._db = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="credential-lease")
+
+    def acquire(self, credential_id: int, wait_seconds: Optional[float] = None) -> bool:
+        if credential_id in self._held:
+            return True
+
+        wait_seconds = self.wait_seconds if wait_seconds is None else wait_seconds
+        started_at = time.monotonic()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                acquired = self._run(self._try_lock, credential_id)
+            except DatabaseError as e:
+                # Without the lease database the worker keeps working as before (no coordination)
+                self.logger.warning(f"Could not take the lease of credential {credential_id}: {str(e)}")
+                return True
+
+            waited = time.monotonic() - started_at
+            if acquired:
+                self._held.add(credential_id)
+                if attempts > 1:
+                    self.logger.info(f"Lease of credential {credential_id} acquired after waiting {waited:.0f}s")
+                    metrics.CREDENTIAL_LEASE_WAIT_SECONDS.observe(waited, result="acquired")
+                return True
+
+            if waited >= wait_seconds:
+                self.logger.warning(f"Credential {credential_id} is in use by another worker (waited {waited:.0f}s)")
+                metrics.CREDENTIAL_LEASE_WAIT_SECONDS.observe(waited, result="timeout")
+                return False
+
+            if attempts == 1:
+                self.logger.info(f"Credential {credential_id} is in use by another worker, waiting for its lease...")
+            self._sleep(min(self.poll_seconds, wait_seconds - waited))
+
+    def release(self, credential_id: int) -> None:
+        if credential_id not in self._held:
+            return
+        self._held.discard(credential_id)
+        try:
+            self._run(self._unlock, credential_id)
+        except DatabaseError as e:
+            self.logger.warning(f"Could not release the lease of credential {credential_id}: {str(e)}")
+
+    def release_all(self) -> None:
+        for credential_id in list(self._held):
+            self.release(credential_id)
+
+    def leased_elsewhere(self, credential_ids: Iterable[int]) -> Set[int]:
+        ids = [credential_id for credential_id in credential_ids if credential_id is not None]
+        if not ids:
+            return set()
+        try:
+            return self._run(self._query_leased_elsewhere, ids)
+        except DatabaseError as e:
+            self.logger.warning(f"Could not read credential leases: {str(e)}")
+            return set()
+
+    def close(self) -> None:
+        """Releases all leases and closes the lease connection."""
+        self.release_all()
+        try:
+            self._run(connection.close)
+        finally:
+            self._db.shutdown(wait=True)
+
+    def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        return self._db.submit(function, *args).result()
+
+    def _try_lock(self, credential_id: int) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [self.namespace, credential_id])
+            return bool(cursor.fetchone()[0])
+
+    def _unlock(self, credential_id: int) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [self.namespace, credential_id])
+
+    def _query_leased_elsewhere(self, credential_ids: list) -> Set[int]:
+        # Two-key advisory locks appear in pg_locks with classid = key1, objid = key2, objsubid = 2
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT DISTINCT objid::bigint
+                FROM pg_locks
+                WHERE locktype = 'advisory'
+                  AND objsubid = 2
+                  AND granted
+                  AND classid::bigint = %s
+                  AND objid::bigint = ANY(%s)
+                  AND pid <> pg_backend_pid()
+                """,
+                [self.namespace, credential_ids],
+            )
+            return {row[0] for row in cursor.fetchall()}
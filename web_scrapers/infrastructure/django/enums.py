@@ -32,6 +32,7 @@ class PhoneNumberChoices(models.TextChoices):
 class ScraperJobStatus(models.TextChoices):
     PENDING = "pending", "Pending"
     RUNNING = "running", "Running"
+    UPLOAD_PENDING = "upload_pending", "Upload Pending"
     SUCCESS = "success", "Success"
     ERROR = "error", "Error"
 
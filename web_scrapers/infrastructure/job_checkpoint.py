@@ -0,0 +1,131 @@
+"""
+Per-file progress of a monthly job, persisted so a retry only fetches what is missing.
+
+The checkpoint lives in the job's artifact directory (``<artifacts>/job_<id>/checkpoint.json``,
+which survives the job) and records, per BillingCycleFile, the downloaded file, its
+SHA-256 and whether the backend acknowledged its upload. On a retry, files whose
+download is still on disk with the same hash are reused, uploaded files are not sent
+again, and ``_download_files`` only receives the BillingCycleFiles that are missing.
+
+Configuration (environment variables):
+    SCRAPER_CHECKPOINTS_ENABLED: Record and resume per-file progress (default true)
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from web_scrapers.domain.entities.models import FileDownloadInfo
+from web_scrapers.infrastructure.artifacts import get_job_artifacts_dir
+from web_scrapers.infrastructure.services.file_upload_service import open_file_content
+from web_scrapers.infrastructure.services.upload_manifest import sha256_of_stream
+
+
+def job_checkpoints_enabled() -> bool:
+    return os.getenv("SCRAPER_CHECKPOINTS_ENABLED", "true").lower() == "true"
+
+
+def content_sha256(file_info: FileDownloadInfo) -> str:
+    """Hex SHA-256 of the content of a downloaded file (or ZIP member)."""
+    with open_file_content(file_info) as (content, _):
+        return sha256_of_stream(content).hex()
+
+
+class JobCheckpoint:
+    """Downloaded/uploaded state of each BillingCycleFile of a job."""
+
+    def __init__(self, job_id: int, path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.job_id = job_id
+        self.path = path or os.path.join(get_job_artifacts_dir(job_id), "checkpoint.json")
+        # BillingCycleFile ID (str, JSON keys) -> {"file_info", "sha256", "downloaded_at", "uploaded_at"}
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @staticmethod
+    def _key(file_info: FileDownloadInfo) -> Optional[str]:
+        return str(file_info.billing_cycle_file.id) if file_info.billing_cycle_file else None
+
+    def restore(self) -> List[FileDownloadInfo]:
+        """
+        Returns the files downloaded by previous attempts that are still valid.
+
+        Uploaded files are always valid. Files pending upload must still be on disk with
+        the recorded hash; the others are dropped so they are downloaded again.
+        """
+        restored = []
+        for key, entry in list(self._entries.items()):
+            file_info = FileDownloadInfo.model_validate(entry["file_info"])
+            if not entry.get("uploaded_at"):
+                try:
+                    valid = content_sha256(file_info) == entry["sha256"]
+                except (OSError, KeyError, ValueError) as e:
+                    self.logger.debug(f"Checkpointed file {file_info.file_name} is not readable: {str(e)}")
+                    valid = False
+                if not valid:
+                    self.logger.warning(f"Checkpointed file {file_info.file_name} is missing or changed, refetching")
+                    del self._entries[key]
+                    continue
+            restored.append(file_info)
+
+        self._save()
+        return restored
+
+    def record_downloaded(self, file_info: FileDownloadInfo) -> None:
+        key = self._key(file_info)
+        if key is None:
+            return
+        try:
+            sha256 = content_sha256(file_info)
+        except (OSError, KeyError, ValueError) as e:
+            self.logger.warning(f"Could not hash {file_info.file_name}, not checkpointed: {str(e)}")
+            return
+        self._entries[key] = {
+            "file_info": file_info.model_dump(mode="json"),
+            "sha256": sha256,
+            "downloaded_at": datetime.now().isoformat(),
+            "uploaded_at": None,
+        }
+        self._save()
+
+    def record_uploaded(self, file_info: FileDownloadInfo) -> None:
+        entry = self._entries.get(self._key(file_info) or "")
+        if entry:
+            entry["uploaded_at"] = datetime.now().isoformat()
+            self._save()
+
+    def is_uploaded(self, file_info: FileDownloadInfo) -> bool:
+        entry = self._entries.get(self._key(file_info) or "")
+        return bool(entry and entry.get("uploaded_at"))
+
+    def clear(self) -> None:
+        """Deletes the checkpoint (the job completed)."""
+        self._entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read checkpoint {self.path}: {str(e)}")
+            return {}
+
+    def _save(self) -> None:
+        if not self._entries and not os.path.exists(self.path):
+            return
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+                json.dump(self._entries, checkpoint_file, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write checkpoint {self.path}: {str(e)}")
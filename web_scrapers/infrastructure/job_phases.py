@@ -0,0 +1,107 @@
+"""
+State of two-phase (request/collect) jobs.
+
+Carriers that generate reports server-side (Bell Enterprise Centre, T-Mobile) can
+split a job in two runs: the request phase queues the reports on the portal and the
+job is rescheduled (``available_at``) instead of holding the browser while the
+carrier works; the collect phase logs in again later and downloads them. What the
+request phase queued is kept in ``<artifacts>/job_<id>/phase.json`` until the
+collect phase is over.
+
+Configuration (environment variables):
+    SCRAPER_TWO_PHASE_ENABLED: Split jobs of strategies that support it (default true)
+    SCRAPER_COLLECT_MAX_ATTEMPTS: Collect runs before giving up on reports not ready (default 3)
+    SCRAPER_COLLECT_MAX_AGE_SECONDS: Age after which requested reports are discarded and requested again (default 7200)
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from web_scrapers.infrastructure.artifacts import get_job_artifacts_dir
+
+
+def two_phase_enabled() -> bool:
+    return os.getenv("SCRAPER_TWO_PHASE_ENABLED", "true").lower() == "true"
+
+
+def collect_max_attempts() -> int:
+    return int(os.getenv("SCRAPER_COLLECT_MAX_ATTEMPTS", "3"))
+
+
+def collect_max_age_seconds() -> float:
+    return float(os.getenv("SCRAPER_COLLECT_MAX_AGE_SECONDS", "7200"))
+
+
+class JobPhaseState:
+    """Request data of a two-phase job, persisted between the request and the collect runs."""
+
+    def __init__(self, job_id: int, path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.job_id = job_id
+        self.path = path or os.path.join(get_job_artifacts_dir(job_id), "phase.json")
+        self._state: Optional[Dict[str, Any]] = self._load()
+
+    @property
+    def requested(self) -> bool:
+        """True if the reports were requested and are waiting to be collected."""
+        return self._state is not None
+
+    @property
+    def request_data(self) -> Dict[str, Any]:
+        return self._state["request"] if self._state else {}
+
+    @property
+    def requested_at(self) -> Optional[datetime]:
+        return datetime.fromisoformat(self._state["requested_at"]) if self._state else None
+
+    @property
+    def age_seconds(self) -> float:
+        return (datetime.now() - self.requested_at).total_seconds() if self._state else 0.0
+
+    @property
+    def expired(self) -> bool:
+        """True if the request is too old to collect (a stale phase.json, or collect runs that kept failing)."""
+        return self.requested and (
+            self.age_seconds > collect_max_age_seconds() or self.collect_attempts >= collect_max_attempts()
+        )
+
+    @property
+    def collect_attempts(self) -> int:
+        return self._state["collect_attempts"] if self._state else 0
+
+    def save_request(self, request_data: Dict[str, Any]) -> None:
+        self._state = {"request": request_data, "requested_at": datetime.now().isoformat(), "collect_attempts": 0}
+        self._save()
+
+    def record_collect_attempt(self) -> None:
+        if self._state:
+            self._state["collect_attempts"] += 1
+            self._save()
+
+    def clear(self) -> None:
+        """Ends the two-phase cycle (the next run of the job starts with a new request)."""
+        self._state = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as phase_file:
+                return json.load(phase_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read phase state {self.path}: {str(e)}")
+            return None
+
+    def _save(self) -> None:
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as phase_file:
+                json.dump(self._state, phase_file, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write phase state {self.path}: {str(e)}")
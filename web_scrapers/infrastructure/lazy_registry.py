@@ -0,0 +1,81 @@
+"""
+Lazy class registries and package exports.
+
+Strategy classes are registered by dotted path ("package.module:ClassName") and
+their module is imported the first time the class is looked up. A processor run
+that only handles Verizon jobs therefore never imports the Bell, Telus, Rogers...
+strategy modules (nor their dependencies such as pandas or openpyxl), which keeps
+the cold start of the processor low.
+
+``lazy_exports`` gives the same behaviour to package ``__init__`` modules that
+re-export classes from their submodules (PEP 562 module ``__getattr__``).
+
+Import cost can be checked with ``python benchmarks/import_time.py``.
+"""
+
+import importlib
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Type, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+def import_from_path(path: str) -> Any:
+    """Imports an object from a "package.module:attribute" path."""
+    module_path, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Invalid import path (expected 'module:attribute'): {path}")
+    return getattr(importlib.import_module(module_path), attribute)
+
+
+class LazyRegistry(Mapping, Generic[K, T]):
+    """Read-only mapping of keys to classes that are imported on first access."""
+
+    def __init__(self, paths: Dict[K, str]):
+        self._paths = dict(paths)
+        self._loaded: Dict[K, Type[T]] = {}
+
+    def __getitem__(self, key: K) -> Type[T]:
+        if key not in self._loaded:
+            self._loaded[key] = import_from_path(self._paths[key])
+        return self._loaded[key]
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._paths
+
+    def path(self, key: K) -> str:
+        """Returns the import path of a key without importing it."""
+        return self._paths[key]
+
+    def load_all(self) -> List[Type[T]]:
+        """Imports every registered class (e.g. to validate the registry at deploy time)."""
+        return [self[key] for key in self._paths]
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Builds a module ``__getattr__`` that imports re-exported names on first access.
+
+    Args:
+        package: ``__name__`` of the package
+        exports: Exported name -> submodule (relative to the package) that defines it
+
+    Usage (in a package ``__init__``):
+        _EXPORTS = {"BellDailyUsageScraperStrategy": "daily_usage"}
+        __getattr__ = lazy_exports(__name__, _EXPORTS)
+        __all__ = list(_EXPORTS)
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(importlib.import_module(f"{package}.{exports[name]}"), name)
+
+    return __getattr__
@@ -0,0 +1,387 @@
+"""
+Prometheus-style runtime metrics for the scraper processor.
+
+Metrics are kept in an in-process registry and exposed in the Prometheus text
+format through a small local HTTP endpoint (``/metrics``). Because the processor
+is a short-lived run, the registry can also be written to a file for the
+node_exporter textfile collector.
+
+Configuration (environment variables):
+    SCRAPER_METRICS_PORT: Port of the HTTP exposition endpoint (disabled if not set)
+    SCRAPER_METRICS_HOST: Bind address of the endpoint (default 127.0.0.1)
+    SCRAPER_METRICS_TEXTFILE: Optional .prom file written at the end of the run
+"""
+
+import logging
+import os
+import threading
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, /proc is used as fallback on Linux
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs += [f'{name}="{_escape(value)}"' for name, value in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(
+            str(labels[name].value if isinstance(labels[name], Enum) else labels[name]) for name in self.label_names
+        )
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError()
+
+    def expose(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines += self.collect()
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Computes the (unlabelled) value at exposition time."""
+        self._function = function
+
+    def collect(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f"{self.name} {_format_value(self._function())}"]
+            except Exception as e:
+                logger.debug(f"Could not collect {self.name}: {str(e)}")
+                return []
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = ()):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def collect(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in items:
+            for upper_bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.label_names, key, {"le": _format_value(upper_bound)})
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = ()
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def expose(self) -> str:
+        return "\n".join(metric.expose() for metric in self._metrics.values()) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Writes the registry atomically for the node_exporter textfile collector."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as output_file:
+            output_file.write(self.expose())
+        os.replace(temp_path, path)
+
+
+def get_browser_rss_bytes() -> int:
+    """Resident memory of all child processes of the processor (Playwright driver and browsers)."""
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    if not os.path.isdir("/proc"):
+        return 0
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as stat_file:
+                # Format: pid (comm) state ppid ... - comm may contain spaces
+                ppid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    total = 0
+    pending = list(children.get(os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as status_file:
+                for line in status_file:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+registry = MetricsRegistry()
+
+JOBS_TOTAL = registry.counter(
+    "scraper_jobs_total", "Scraper jobs processed by final status", ("carrier", "scraper_type", "status")
+)
+JOB_DURATION_SECONDS = registry.histogram(
+    "scraper_job_duration_seconds",
+    "Wall time of a scraper job",
+    ("carrier", "scraper_type"),
+    buckets=(30, 60, 120, 300, 600, 900, 1200, 1800, 2700, 3600, 7200),
+)
+JOB_FAILURES_TOTAL = registry.counter(
+    "scraper_job_failures_total", "Failed scraper jobs by failure category", ("carrier", "scraper_type", "category")
+)
+LOGIN_DURATION_SECONDS = registry.histogram(
+    "scraper_login_duration_seconds",
+    "Duration of a full portal login (including MFA)",
+    ("carrier", "result"),
+    buckets=(5, 10, 20, 30, 60, 120, 300, 600),
+)
+MFA_WAIT_SECONDS = registry.histogram(
+    "scraper_mfa_wait_seconds",
+    "Time waiting for an MFA code or link from the MFA service",
+    ("carrier", "result"),
+    buckets=(5, 10, 30, 60, 120, 180, 300),
+)
+SESSION_CHECK_SECONDS = registry.histogram(
+    "scraper_session_check_seconds",
+    "Duration of a session login check by method (cache, fast, dom)",
+    ("method",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+SESSION_POOL_SIZE = registry.gauge("scraper_session_pool_size", "Authenticated portal sessions kept in the pool")
+SESSION_POOL_LOOKUPS_TOTAL = registry.counter(
+    "scraper_session_pool_lookups_total", "Session pool lookups at login by result (hit/miss)", ("result",)
+)
+SESSION_POOL_EVICTIONS_TOTAL = registry.counter(
+    "scraper_session_pool_evictions_total", "Sessions evicted from the pool by reason", ("reason",)
+)
+SESSION_KEEPALIVE_TOTAL = registry.counter(
+    "scraper_session_keepalive_total", "Heartbeats sent to idle pooled sessions by result", ("carrier", "result")
+)
+SESSION_KEEPALIVE_AVOIDED_LOGINS_TOTAL = registry.counter(
+    "scraper_session_keepalive_avoided_logins_total",
+    "Idle sessions reused without a new login after receiving heartbeats",
+    ("carrier",),
+)
+CREDENTIAL_LEASE_WAIT_SECONDS = registry.histogram(
+    "scraper_credential_lease_wait_seconds",
+    "Wait for the lease of a credential held by another worker by result (acquired, timeout)",
+    ("result",),
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600),
+)
+CREDENTIAL_BUSY_DEFERRALS_TOTAL = registry.counter(
+    "scraper_credential_busy_deferrals_total",
+    "Jobs rescheduled because their credential was leased by another worker",
+    ("carrier",),
+)
+BROWSER_PROFILES_BYTES = registry.gauge(
+    "scraper_browser_profiles_bytes", "Disk used by the persistent browser profiles directory"
+)
+BROWSER_PROFILE_PRUNED_BYTES_TOTAL = registry.counter(
+    "scraper_browser_profile_pruned_bytes_total",
+    "Bytes freed from closed browser profiles by scope (cache, profile, legacy)",
+    ("scope",),
+)
+DOWNLOADS_TOTAL = registry.counter("scraper_downloads_total", "Browser downloads by result", ("result",))
+TAB_TASKS_TOTAL = registry.counter(
+    "scraper_tab_tasks_total", "Report sub-flows run with run_in_tabs by result", ("result",)
+)
+FILES_PROCESSED_TOTAL = registry.counter(
+    "scraper_files_processed_total", "Files reported by successful jobs", ("carrier", "scraper_type")
+)
+UPLOAD_BYTES_TOTAL = registry.counter("scraper_upload_bytes_total", "Bytes uploaded to the backend", ("upload_type",))
+UPLOAD_DURATION_SECONDS = registry.histogram(
+    "scraper_upload_duration_seconds",
+    "Duration of a single file upload",
+    ("upload_type", "result"),
+    buckets=(0.5, 1, 2, 5, 10, 30, 60, 120, 300),
+)
+UPLOAD_DEDUPLICATED_TOTAL = registry.counter(
+    "scraper_upload_deduplicated_total",
+    "Uploads skipped because the same content was already acknowledged",
+    ("upload_type",),
+)
+UPLOAD_THROUGHPUT_BYTES_PER_SECOND = registry.histogram(
+    "scraper_upload_throughput_bytes_per_second",
+    "Throughput of successful uploads",
+    ("upload_type",),
+    buckets=(64e3, 256e3, 1e6, 4e6, 16e6, 64e6),
+)
+UPLOAD_OUTBOX_PENDING = registry.gauge("scraper_upload_outbox_pending", "Uploads pending in the local outbox")
+UPLOAD_OUTBOX_ATTEMPTS_TOTAL = registry.counter(
+    "scraper_upload_outbox_attempts_total", "Outbox upload attempts by outcome", ("result",)
+)
+REPORT_READINESS_SECONDS = registry.histogram(
+    "scraper_report_readiness_seconds",
+    "Time from requesting a carrier report until the portal publishes it",
+    ("report",),
+    buckets=(10, 30, 60, 120, 180, 300, 600, 900, 1800),
+)
+QUEUE_DEPTH = registry.gauge("scraper_queue_depth", "Pending scraper jobs from get_scraper_statistics", ("state",))
+BROWSER_RSS_BYTES = registry.gauge("scraper_browser_rss_bytes", "Resident memory of browser and driver processes")
+BROWSER_RSS_BYTES.set_function(get_browser_rss_bytes)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Starts the /metrics endpoint in a daemon thread.
+
+    Args:
+        port: Port to listen on (defaults to SCRAPER_METRICS_PORT; disabled if neither is set)
+        host: Bind address (defaults to SCRAPER_METRICS_HOST or 127.0.0.1)
+
+    Returns:
+        The running server, or None if metrics exposition is disabled or the port cannot be bound
+        (observability never stops scraping)
+    """
+    port = port or int(os.getenv("SCRAPER_METRICS_PORT", "0"))
+    if not port:
+        return None
+
+    host = host or os.getenv("SCRAPER_METRICS_HOST", "127.0.0.1")
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    except OSError as e:
+        logger.warning(f"Could not start metrics endpoint on {host}:{port}: {str(e)}")
+        return None
+    thread = threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True)
+    thread.start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
+
+
+def write_metrics_textfile() -> None:
+    """Writes the registry to SCRAPER_METRICS_TEXTFILE if configured."""
+    path = os.getenv("SCRAPER_METRICS_TEXTFILE")
+    if not path:
+        return
+    try:
+        registry.write_textfile(path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics textfile {path}: {str(e)}")
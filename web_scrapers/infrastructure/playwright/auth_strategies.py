@@ -7,7 +7,6 @@ from typing import Optional
 import requests
 from playwright_stealth import Stealth
 
-from mfa.infrastructure.verizon_captcha_solver import extract_text_from_image
 from web_scrapers.domain.entities.auth_strategies import AuthBaseStrategy, MFACodeError
 from web_scrapers.domain.entities.session import Credentials
 from web_scrapers.domain.enums import CarrierPortalUrls
@@ -19,6 +18,10 @@ DEFAULT_MFA_SERVICE_URL = os.getenv("MFA_SERVICE_URL", "http://localhost:8000")
 
 class BellEnterpriseAuthStrategy(AuthBaseStrategy):
 
+    # Enterprise Centre es una SPA: su shell responde 200 con o sin sesión, el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -72,7 +75,8 @@ class BellEnterpriseAuthStrategy(AuthBaseStrategy):
         except Exception:
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return "https://enterprisecentre.bell.ca"
 
     def get_logout_xpath(self) -> str:
@@ -98,6 +102,10 @@ class BellEnterpriseAuthStrategy(AuthBaseStrategy):
 
 class BellAuthStrategy(AuthBaseStrategy):
 
+    # El portal sirve el formulario de login en la misma URL (200): el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -167,7 +175,8 @@ class BellAuthStrategy(AuthBaseStrategy):
         except Exception:
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.BELL.value
 
     def get_logout_xpath(self) -> str:
@@ -186,13 +195,18 @@ class BellAuthStrategy(AuthBaseStrategy):
         try:
             verification_input_xpath = "/html/body/main/div/div[1]/div/div[2]/uxp-flow/div/identity-verification/div/div[1]/form/div[2]/div[2]/div[3]/div[2]/div[1]/input"
             radio_button = "/html/body/main/div/div[1]/div/div[2]/uxp-flow/div/identity-verification/div/div[1]/form/div[1]/section/div[2]/div/label[1]/input"
-            if self.browser_wrapper.is_element_visible(radio_button, timeout=40000):
+            user_button_xpath = "/html[1]/body[1]/div[1]/header[1]/div[2]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[2]/div[1]/logout[1]/div[1]/button[1]"
+
+            # Race the 2FA screen against the logged in header instead of always waiting for the 2FA timeout
+            screen = self.browser_wrapper.wait_for_any(
+                {"2fa": radio_button, "logged_in": user_button_xpath}, timeout=40000
+            )
+            if screen == "2fa":
                 print("2FA field detected. Starting verification process...")
                 return self._process_2fa(verification_input_xpath, credentials)
-            else:
-                print("No 2FA field detected")
-                time.sleep(10)
-                return True
+
+            print("No 2FA field detected" if screen else "No 2FA field detected before timeout")
+            return True
 
         except MFACodeError:
             raise
@@ -241,6 +255,10 @@ class BellAuthStrategy(AuthBaseStrategy):
 
 class TelusAuthStrategy(AuthBaseStrategy):
 
+    # my-telus redirige al login cuando la sesión expiró (ver is_logged_in)
+    session_check_url = "https://www.telus.com/my-telus"
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -255,9 +273,6 @@ class TelusAuthStrategy(AuthBaseStrategy):
             self.browser_wrapper.wait_for_page_load()
             time.sleep(3)
 
-            # Handle potential blocking popup with skip button
-            self._try_skip_popup()
-
             my_telus_button_xpath = '//*[@id="ge-top-nav"]/ul[2]/li[3]/button'
             print("Clicking My Telus...")
             self.browser_wrapper.click_element(my_telus_button_xpath)
@@ -388,7 +403,8 @@ class TelusAuthStrategy(AuthBaseStrategy):
             self.logger.error(f"Error verificando estado de login: {str(e)}")
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.TELUS.value
 
     def get_logout_xpath(self) -> str:
@@ -403,20 +419,6 @@ class TelusAuthStrategy(AuthBaseStrategy):
     def get_login_button_xpath(self) -> str:
         return "/html[1]/body[1]/div[1]/div[1]/div[1]/div[1]/div[1]/div[1]/form[1]/div[4]/div[1]"
 
-    def _try_skip_popup(self) -> None:
-        """Try to dismiss a blocking popup by clicking the skip button if present."""
-        skip_button_xpath = "//*[@id='skip-button']"
-        try:
-            if self.browser_wrapper.is_element_visible(skip_button_xpath, timeout=3000):
-                print("Blocking popup detected, clicking skip button...")
-                self.browser_wrapper.click_element(skip_button_xpath)
-                time.sleep(1)
-                print("Popup dismissed")
-            else:
-                print("No blocking popup detected, continuing...")
-        except Exception as e:
-            print(f"Error handling popup (non-critical): {str(e)}")
-
     # TODO: Implementar _handle_2fa_if_present si Telus requiere 2FA
     # Pasos pendientes:
     # 1. Identificar si el portal requiere 2FA y cómo detectarlo
@@ -428,6 +430,10 @@ class TelusAuthStrategy(AuthBaseStrategy):
 
 class RogersAuthStrategy(AuthBaseStrategy):
 
+    # homePage.do es también la página de login (200 con o sin sesión): el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -447,16 +453,13 @@ class RogersAuthStrategy(AuthBaseStrategy):
                 '//*[@id="login"]/div[2]/div[4]/div/input',
             ]
             self.logger.info("Clicking Sign In button...")
-            for xpath in sign_in_button_xpaths:
-                try:
-                    if self.browser_wrapper.is_element_visible(xpath, timeout=3000):
-                        self.logger.info(f"Sign In button found with xpath: {xpath}")
-                        self.browser_wrapper.click_element(xpath)
-                        break
-                except Exception:
-                    continue
-            else:
+            sign_in_index = self.browser_wrapper.find_first_visible(
+                [(xpath, "xpath") for xpath in sign_in_button_xpaths], timeout=6000
+            )
+            if sign_in_index is None:
                 raise Exception("Sign In button not found with any of the known XPaths")
+            self.logger.info(f"Sign In button found with xpath: {sign_in_button_xpaths[sign_in_index]}")
+            self.browser_wrapper.click_element(sign_in_button_xpaths[sign_in_index])
             time.sleep(3)
 
             # Enter username/email
@@ -549,7 +552,8 @@ class RogersAuthStrategy(AuthBaseStrategy):
             self.logger.error(f"Error checking login status: {str(e)}")
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.ROGERS.value
 
     def get_logout_xpath(self) -> str:
@@ -571,7 +575,12 @@ class RogersAuthStrategy(AuthBaseStrategy):
                 "/html/body/app-root/div/div/div/div/div/div/div/div/otp-device-list/div/h1"
             )
 
-            if self.browser_wrapper.is_element_visible(verification_h1_xpath, timeout=10000):
+            welcome_div_xpath = "/html/body/div[1]/div[2]/div[2]"
+
+            screen = self.browser_wrapper.wait_for_any(
+                {"2fa": verification_h1_xpath, "logged_in": welcome_div_xpath}, timeout=10000
+            )
+            if screen == "2fa":
                 h1_text = self.browser_wrapper.get_text(verification_h1_xpath)
                 if h1_text and "receive verification code" in h1_text.lower():
                     self.logger.info("2FA verification screen detected. Starting verification process...")
@@ -581,7 +590,6 @@ class RogersAuthStrategy(AuthBaseStrategy):
                     return True
             else:
                 self.logger.info("No 2FA verification screen detected")
-                time.sleep(5)
                 return True
 
         except MFACodeError:
@@ -651,6 +659,10 @@ class RogersAuthStrategy(AuthBaseStrategy):
 
 class ATTAuthStrategy(AuthBaseStrategy):
 
+    # premiercare es también la página de login (200 con o sin sesión): el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -746,7 +758,8 @@ class ATTAuthStrategy(AuthBaseStrategy):
             self.logger.error(f"Error verifying login status: {str(e)}")
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.ATT.value
 
     def get_logout_xpath(self) -> str:
@@ -765,7 +778,11 @@ class ATTAuthStrategy(AuthBaseStrategy):
         self.logger.info("Checking if 2FA is required...")
 
         email_option_xpath = "//*[@id='option_3']"
-        if not self.browser_wrapper.is_element_visible(email_option_xpath, timeout=10000):
+        my_profile_xpath = "/html/body/div[1]/div/div[2]/p/a"
+        screen = self.browser_wrapper.wait_for_any(
+            {"2fa": email_option_xpath, "logged_in": my_profile_xpath}, timeout=10000
+        )
+        if screen != "2fa":
             self.logger.info("No 2FA elements detected")
             return True
 
@@ -795,23 +812,17 @@ class ATTAuthStrategy(AuthBaseStrategy):
         self.logger.info("Submitting 2FA code...")
         self.browser_wrapper.click_element(continue_button_xpath)
         time.sleep(30)
-        self._dismiss_modal_if_present()
 
         self.logger.info("2FA processed successfully")
         return True
 
-    def _dismiss_modal_if_present(self) -> None:
-        modal_close_xpath = "/html/body/uws-wrapper[2]/div[2]/div/div[4]/div[2]"
-        if self.browser_wrapper.is_element_visible(modal_close_xpath, timeout=5000):
-            self.logger.info("Modal detected, dismissing...")
-            self.browser_wrapper.click_element(modal_close_xpath)
-            time.sleep(2)
-        else:
-            self.logger.debug("No modal detected")
-
 
 class TMobileAuthStrategy(AuthBaseStrategy):
 
+    # Las apps de TFB son SPAs: su shell responde 200 con o sin sesión, el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -825,9 +836,6 @@ class TMobileAuthStrategy(AuthBaseStrategy):
             self.browser_wrapper.wait_for_page_load(60000)
             time.sleep(3)
 
-            # Handle language modal if present (select English)
-            self._handle_language_modal()
-
             # Enter email/phone number
             email_xpath = '//*[@id="emailOrPhoneNumberTextBox"]'
             self.logger.info(f"Entering email/phone: {credentials.username}")
@@ -922,7 +930,8 @@ class TMobileAuthStrategy(AuthBaseStrategy):
         except Exception:
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.TMOBILE.value
 
     def get_logout_xpath(self) -> str:
@@ -937,59 +946,19 @@ class TMobileAuthStrategy(AuthBaseStrategy):
     def get_login_button_xpath(self) -> str:
         return '//*[@id="lp2-login-btn"]'
 
-    def _handle_language_modal(self) -> None:
-        """Handle the language selection modal if present (select English).
-
-        The language modal is inside an iframe, so we need to switch context.
-        """
-        iframe_selector = "#lightbox_pop"
-        english_button_css = "#en"
-        email_field_xpath = '//*[@id="emailOrPhoneNumberTextBox"]'
-
-        try:
-            # Esperar a que el iframe del modal tenga tiempo de aparecer
-            self.logger.info("Waiting for language modal iframe to potentially appear...")
-            time.sleep(5)
-
-            # Verificar si el iframe existe
-            page = self.browser_wrapper.page
-            iframe_locator = page.locator(iframe_selector)
-
-            if iframe_locator.count() > 0:
-                self.logger.info("Language modal iframe detected, switching context...")
-
-                # Obtener el frame y buscar el botón dentro
-                frame = page.frame_locator(iframe_selector)
-                english_button = frame.locator(english_button_css)
-
-                if english_button.count() > 0:
-                    self.logger.info("English button found inside iframe, clicking...")
-                    english_button.click()
-                    time.sleep(3)
-                    self.logger.info("Language set to English")
-                else:
-                    self.logger.info("English button not found inside iframe")
-            else:
-                self.logger.info("No language modal iframe detected, continuing...")
-
-            # Verificar que el campo de email esté visible después de manejar el modal
-            if not self.browser_wrapper.is_element_visible(email_field_xpath, timeout=10000):
-                self.logger.warning("Email field not visible after language modal handling")
-
-        except Exception as e:
-            self.logger.warning(f"Error handling language modal: {str(e)}")
-
     def _handle_2fa_if_present(self, credentials: Credentials) -> bool:
         """Detect and handle MFA if present. Similar to Bell implementation."""
         try:
             mfa_code_input_xpath = '//*[@id="code"]'
 
-            if self.browser_wrapper.is_element_visible(mfa_code_input_xpath, timeout=10000):
+            screen = self.browser_wrapper.wait_for_any(
+                {"2fa": mfa_code_input_xpath, "logged_in": self.get_logout_xpath()}, timeout=15000
+            )
+            if screen == "2fa":
                 self.logger.info("2FA field detected. Starting verification process...")
                 return self._process_2fa(mfa_code_input_xpath, credentials)
             else:
                 self.logger.info("No 2FA field detected")
-                time.sleep(5)
                 return True
 
         except MFACodeError:
@@ -1028,6 +997,10 @@ class TMobileAuthStrategy(AuthBaseStrategy):
 
 class VerizonAuthStrategy(AuthBaseStrategy):
 
+    # El dashboard es una SPA: su shell responde 200 con o sin sesión, el check queda en el DOM
+    session_check_url = None
+    session_cookie_names = ()  # Sin cookies de autenticación verificadas: se usan las aprendidas en el login
+
     def __init__(self, browser_wrapper: BrowserWrapper, webhook_url: str = None):
         super().__init__(browser_wrapper)
         self.webhook_url = webhook_url or DEFAULT_MFA_SERVICE_URL
@@ -1077,15 +1050,7 @@ class VerizonAuthStrategy(AuthBaseStrategy):
                         self.logger.error("CAPTCHA failed after two attempts")
                         return False
 
-            # Wait a bit for page to settle
-            time.sleep(5)
-
-            # First check if already logged in (no MFA required)
-            if self.is_logged_in():
-                self.logger.info("Login successful in Verizon (no MFA required)")
-                return True
-
-            # Check for MFA
+            # Check for MFA (raced against the logged in page, so no MFA costs no extra wait)
             if not self._handle_2fa_if_present(credentials):
                 self.logger.error("2FA failed - interrupting login")
                 return False
@@ -1190,6 +1155,9 @@ class VerizonAuthStrategy(AuthBaseStrategy):
         """Send CAPTCHA image to AI service for solving."""
         try:
             self.logger.info(f"Sending image to AI for CAPTCHA solving: {image_path}")
+            # Imported here: the solver pulls in the anthropic SDK, which is only needed for Verizon CAPTCHAs
+            from mfa.infrastructure.verizon_captcha_solver import extract_text_from_image
+
             result = extract_text_from_image(Path(image_path))
             self.logger.info(f"AI returned CAPTCHA text: {result}")
             return result
@@ -1250,7 +1218,8 @@ class VerizonAuthStrategy(AuthBaseStrategy):
         except Exception:
             return False
 
-    def get_login_url(self) -> str:
+    @classmethod
+    def get_login_url(cls) -> str:
         return CarrierPortalUrls.VERIZON.value
 
     def get_logout_xpath(self) -> str:
@@ -1268,15 +1237,18 @@ class VerizonAuthStrategy(AuthBaseStrategy):
     def _handle_2fa_if_present(self, credentials: Credentials) -> bool:
         """Detects and handles Verizon MFA by selecting the best Email option."""
         try:
-            # Check if MFA options list is visible (short timeout since we already checked is_logged_in)
             mfa_list_xpath = '//*[@id="app"]/div/div/div/div[2]/div/div/div/div/div/div[2]/li'
+            welcome_label_xpath = '//*[@id="searchContainer"]/div[2]/label'
 
-            if self.browser_wrapper.is_element_visible(mfa_list_xpath, timeout=10000):
+            screen = self.browser_wrapper.wait_for_any(
+                {"2fa": mfa_list_xpath, "logged_in": welcome_label_xpath}, timeout=20000
+            )
+            if screen == "2fa":
                 self.logger.info("MFA options detected. Starting verification process...")
                 return self._process_2fa(credentials)
             else:
-                self.logger.info("No MFA options detected, checking if logged in...")
-                return self.is_logged_in()
+                self.logger.info("No MFA options detected")
+                return True
 
         except MFACodeError:
             raise
@@ -295,11 +295,15 @@ class BrowserDriverFactory:
         self._page: Optional[Page] = None
         self._persistent_context: Optional[BrowserContext] = None
 
-    def get_profile_dir(self, profile_name: str = "default") -> str:
-        """Retorna el directorio del perfil persistente para un scraper especifico."""
+    def get_profiles_base_dir(self) -> Path:
+        """Retorna el directorio que contiene los perfiles persistentes."""
         base_dir = Path(os.getcwd()) / "browser_profiles"
         base_dir.mkdir(exist_ok=True)
-        profile_dir = base_dir / f"{profile_name}_profile"
+        return base_dir
+
+    def get_profile_dir(self, profile_name: str = "default") -> str:
+        """Retorna el directorio del perfil persistente para un scraper especifico."""
+        profile_dir = self.get_profiles_base_dir() / f"{profile_name}_profile"
         profile_dir.mkdir(exist_ok=True)
         return str(profile_dir)
 
@@ -1,15 +1,47 @@
 import os
+import re
 import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
 
-from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper, TableColumn, TabResult
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.playwright.multi_tab import MultiTabExecutor
+from web_scrapers.infrastructure.tracing import traced_class
+
+EXTRACT_TABLE_SCRIPT = """
+(rows, columns) => {
+    const clean = (value) => (value == null ? null : value.trim());
+    const read = (element, column) => {
+        if (column.attribute) {
+            return element.getAttribute(column.attribute);
+        }
+        return clean(column.inner_text ? element.innerText : element.textContent);
+    };
+    return rows.map((row) => {
+        const record = {};
+        for (const [name, column] of Object.entries(columns)) {
+            if (column.all) {
+                record[name] = Array.from(row.querySelectorAll(column.selector)).map((el) => read(el, column));
+            } else {
+                const element = column.selector ? row.querySelector(column.selector) : row;
+                record[name] = element ? read(element, column) : null;
+            }
+        }
+        return record;
+    });
+}
+"""
 
 
+@traced_class("browser")
 class PlaywrightWrapper(BrowserWrapper):
 
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, on_new_context: Optional[Callable[[BrowserContext], None]] = None):
         self.page = page
+        # Se ejecuta sobre los contextos clonados de run_in_tabs (p. ej. handlers de overlays del carrier)
+        self.on_new_context = on_new_context
 
     def _resolve_selector(self, selector: str, selector_type: str = "xpath") -> str:
         strategies = {
@@ -94,6 +126,49 @@ class PlaywrightWrapper(BrowserWrapper):
         except PlaywrightTimeoutError:
             return False
 
+    def wait_for_any(
+        self,
+        selectors: Optional[Dict[str, Union[str, Tuple[str, str]]]] = None,
+        url_patterns: Optional[Dict[str, str]] = None,
+        timeout: int = 10000,
+    ) -> Optional[str]:
+        locators = []
+        for key, selector in (selectors or {}).items():
+            selector, selector_type = (selector, "xpath") if isinstance(selector, str) else selector
+            locators.append((key, self.page.locator(self._resolve_selector(selector, selector_type)).first))
+        patterns = [(key, re.compile(pattern)) for key, pattern in (url_patterns or {}).items()]
+
+        # Polling keeps every branch on the same deadline; the order only breaks ties within a round
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            for key, pattern in patterns:
+                if pattern.search(self.page.url):
+                    return key
+            for key, locator in locators:
+                try:
+                    if locator.is_visible():
+                        return key
+                except Exception:
+                    continue
+            if time.monotonic() >= deadline:
+                return None
+            self.page.wait_for_timeout(100)
+
+    def find_first_visible(self, selectors: Sequence[Tuple[str, str]], timeout: int = 10000) -> Optional[int]:
+        candidates = {str(index): selector for index, selector in enumerate(selectors)}
+        matched = self.wait_for_any(candidates, timeout=timeout)
+        return int(matched) if matched is not None else None
+
+    def extract_table(
+        self, selector: str, column_spec: Dict[str, Union[str, TableColumn]], selector_type: str = "xpath"
+    ) -> List[Dict[str, Any]]:
+        columns = {
+            name: (TableColumn(column) if isinstance(column, str) else column)._asdict()
+            for name, column in column_spec.items()
+        }
+        resolved = self._resolve_selector(selector, selector_type)
+        return self.page.locator(resolved).evaluate_all(EXTRACT_TABLE_SCRIPT, columns)
+
     def get_current_url(self) -> str:
         return self.page.url
 
@@ -257,10 +332,12 @@ class PlaywrightWrapper(BrowserWrapper):
             file_path = os.path.join(downloads_dir, suggested_filename)
 
             download.save_as(file_path)
+            metrics.DOWNLOADS_TOTAL.inc(result="success")
             return file_path
 
         except Exception as e:
             print(f"Error en descarga: {str(e)}")
+            metrics.DOWNLOADS_TOTAL.inc(result="failure")
             return None
 
     def click_and_switch_to_new_tab(self, selector: str, timeout: int = 10000, selector_type: str = "xpath") -> None:
@@ -272,3 +349,17 @@ class PlaywrightWrapper(BrowserWrapper):
         new_tab.bring_to_front()
         self.page = new_tab
         self.page.wait_for_load_state("load")
+
+    def get_cookies(self, urls: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return self.page.context.cookies(urls) if urls else self.page.context.cookies()
+
+    def request_status(self, url: str, method: str = "GET", timeout: int = 10000) -> int:
+        response = self.page.context.request.fetch(url, method=method, max_redirects=0, timeout=timeout)
+        try:
+            return response.status
+        finally:
+            response.dispose()
+
+    def run_in_tabs(self, tasks: Dict[str, Callable[[BrowserWrapper], Any]]) -> List[TabResult]:
+        executor = MultiTabExecutor(self.page, PlaywrightWrapper, on_new_context=self.on_new_context)
+        return executor.run(tasks, main_wrapper=self)
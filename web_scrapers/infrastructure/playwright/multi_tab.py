@@ -0,0 +1,199 @@
+"""
+Runs independent report sub-flows of one job in parallel tabs of the same portal session.
+
+Playwright's sync API binds every browser object to the thread that created it, so the
+pages of the job's context cannot be driven from other threads. MultiTabExecutor runs
+one tab on the calling thread with the job's own page, and each extra tab on a worker
+thread with its own browser whose context is cloned from the job's context storage state
+(cookies and local storage) plus the session storage of the job's page origin: all tabs
+share the authenticated portal session without a new login. Every tab starts on the page
+the job's tab was on when the sub-flows were submitted, and each sub-flow must leave its
+tab on that page for the next one.
+
+The worker contexts get the same setup as the job's context: the factory's context and
+page stealth, and the carrier's overlay handlers (on_new_context).
+
+Limits of the cloned tabs (why the feature is off by default):
+- Each extra tab is a separate Chrome process, not a page of the job's context: state
+  that is neither in cookies nor in web storage (in-memory tokens of a SPA, the session
+  storage of other origins) is not carried over.
+- The portal sees concurrent use of one session from several browsers. Portals that
+  bind a session to a single client may invalidate it; only enable it for carriers
+  verified to tolerate it.
+
+A failing sub-flow (or a tab that cannot be opened) only loses its own result; pending
+sub-flows of a broken tab are picked up by the other tabs.
+
+Configuration (environment variables):
+    SCRAPER_MULTI_TAB_WORKERS: Tabs used per job, including the job's own (default 1 = sequential)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from playwright.sync_api import BrowserContext, Page
+
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper, TabResult
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.playwright.browser_factory import BrowserDriverFactory
+
+# Session storage of the job's page: {"origin": ..., "items": {...}}
+READ_SESSION_STORAGE_SCRIPT = """
+() => {
+    try {
+        return { origin: location.origin, items: Object.assign({}, sessionStorage) };
+    } catch (e) {
+        return null;
+    }
+}
+"""
+
+# Init script of the worker contexts: restores the job page's session storage on its origin
+RESTORE_SESSION_STORAGE_SCRIPT = """
+(() => {
+    const state = %s;
+    if (location.origin !== state.origin) {
+        return;
+    }
+    for (const [key, value] of Object.entries(state.items)) {
+        if (sessionStorage.getItem(key) === null) {
+            sessionStorage.setItem(key, value);
+        }
+    }
+})();
+"""
+
+
+def multi_tab_workers() -> int:
+    return max(1, int(os.getenv("SCRAPER_MULTI_TAB_WORKERS", "1")))
+
+
+class MultiTabExecutor:
+    """Distributes named sub-flows over the job's page and worker tabs cloned from its context."""
+
+    def __init__(
+        self,
+        page: Page,
+        wrapper_factory: Callable[[Page], BrowserWrapper],
+        workers: Optional[int] = None,
+        on_new_context: Optional[Callable[[BrowserContext], None]] = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.page = page
+        self.wrapper_factory = wrapper_factory
+        self.workers = workers if workers is not None else multi_tab_workers()
+        # Installs per-session handlers (e.g. carrier overlays) on the cloned contexts
+        self.on_new_context = on_new_context
+
+    def run(self, tasks: Dict[str, Callable[[BrowserWrapper], Any]], main_wrapper: BrowserWrapper) -> List[TabResult]:
+        """
+        Runs every task once and returns their results in submission order.
+
+        Args:
+            tasks: Sub-flows by name; each receives the wrapper of the tab it runs on
+            main_wrapper: Wrapper of the job's page (the calling thread runs tasks on it)
+        """
+        pending: queue.Queue = queue.Queue()
+        for name, task in tasks.items():
+            pending.put((name, task))
+
+        results: Dict[str, TabResult] = {}
+        results_lock = threading.Lock()
+
+        extra_tabs = min(self.workers, len(tasks)) - 1
+        threads: List[threading.Thread] = []
+        if extra_tabs > 0:
+            start_url = self.page.url
+            storage_state = self.page.context.storage_state()
+            session_storage = self.page.evaluate(READ_SESSION_STORAGE_SCRIPT)
+            self.logger.info(f"Running {len(tasks)} sub-flows in {extra_tabs + 1} tabs")
+            for index in range(extra_tabs):
+                # Each tab runs in a copy of the job's context so its spans join the job's trace
+                thread = threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(
+                        self._run_worker_tab,
+                        index + 1,
+                        start_url,
+                        storage_state,
+                        session_storage,
+                        pending,
+                        results,
+                        results_lock,
+                    ),
+                    name=f"tab-{index + 1}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        self._drain(0, main_wrapper, pending, results, results_lock)
+        for thread in threads:
+            thread.join()
+
+        return [results[name] for name in tasks]
+
+    def _run_worker_tab(
+        self,
+        tab: int,
+        start_url: str,
+        storage_state: Dict[str, Any],
+        session_storage: Optional[Dict[str, Any]],
+        pending: queue.Queue,
+        results: Dict[str, TabResult],
+        results_lock: threading.Lock,
+    ) -> None:
+        factory = BrowserDriverFactory()
+        try:
+            try:
+                factory.create_browser()
+                # create_context/create_page apply the same stealth as the job's context
+                context = factory.create_context(storage_state=storage_state)
+                if session_storage and session_storage.get("items"):
+                    context.add_init_script(script=RESTORE_SESSION_STORAGE_SCRIPT % json.dumps(session_storage))
+                if self.on_new_context:
+                    self.on_new_context(context)
+                page = factory.create_page(context)
+                page.goto(start_url, wait_until="load")
+            except Exception as e:
+                self.logger.warning(f"Could not open tab {tab}, its sub-flows run in the other tabs: {str(e)}")
+                return
+
+            self._drain(tab, self.wrapper_factory(page), pending, results, results_lock)
+        finally:
+            try:
+                factory.cleanup()
+            except Exception as e:
+                self.logger.warning(f"Error closing tab {tab}: {str(e)}")
+
+    def _drain(
+        self,
+        tab: int,
+        wrapper: BrowserWrapper,
+        pending: queue.Queue,
+        results: Dict[str, TabResult],
+        results_lock: threading.Lock,
+    ) -> None:
+        while True:
+            try:
+                name, task = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            self.logger.info(f"Tab {tab}: running '{name}'")
+            try:
+                result = TabResult(name, task(wrapper))
+                metrics.TAB_TASKS_TOTAL.inc(result="success")
+            except Exception as e:
+                self.logger.error(f"Tab {tab}: sub-flow '{name}' failed: {str(e)}\n{traceback.format_exc()}")
+                result = TabResult(name, None, str(e))
+                metrics.TAB_TASKS_TOTAL.inc(result="failure")
+
+            with results_lock:
+                results[name] = result
@@ -0,0 +1,108 @@
+"""
+Per-carrier handlers for modals and interstitials that can show up at any point.
+
+Instead of probing for a popup at fixed points of a flow (and paying the probe
+timeout when it does not appear), each known overlay is declared once here and
+installed on every page of the browser context with Playwright's
+``page.add_locator_handler``. Playwright runs the handler whenever the overlay
+is visible right before an action (click, fill...), so the flows never wait for
+overlays that are not there.
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from playwright.sync_api import BrowserContext, Locator, Page
+
+from web_scrapers.domain.entities.session import Carrier
+
+
+class OverlayHandler(NamedTuple):
+    """An overlay that is dismissed by clicking an element when its trigger becomes visible."""
+
+    name: str
+    trigger: str
+    dismiss: Optional[str] = None  # Element clicked to dismiss the overlay (defaults to the trigger)
+    selector_type: str = "xpath"
+    frame: Optional[str] = None  # CSS selector of the iframe holding the overlay, if any
+
+
+CARRIER_OVERLAYS: Dict[Carrier, List[OverlayHandler]] = {
+    Carrier.TELUS: [
+        # Blocking popup on the login page
+        OverlayHandler("skip_popup", "//*[@id='skip-button']"),
+        # Bill Analyzer terms modal (Telus IQ / Bill Analyzer)
+        OverlayHandler("bill_analyzer_terms", "//*[@id='tandc-content']/div[3]/button"),
+        # Bill Analyzer "don't show again" link (Usage view)
+        OverlayHandler(
+            "bill_analyzer_dont_show_again",
+            "/html/body/div[1]/html/body/div/div/div/div[2]/div/div[2]/div[2]/div[1]/div/div/div[3]/div/div[2]/p/div/a",
+        ),
+    ],
+    Carrier.ATT: [
+        # Modal shown after submitting the 2FA code
+        OverlayHandler("post_login_modal", "/html/body/uws-wrapper[2]/div[2]/div/div[4]/div[2]"),
+    ],
+    Carrier.TMOBILE: [
+        # Language selection modal, rendered inside an iframe
+        OverlayHandler("language_modal", "#en", selector_type="css", frame="#lightbox_pop"),
+    ],
+}
+
+
+class OverlayHandlers:
+    """
+    Installs the overlay handlers of the active carrier on every page of a browser context,
+    including pages opened later (new tabs, popups).
+    """
+
+    def __init__(self, context: BrowserContext):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.context = context
+        self.carrier: Optional[Carrier] = None
+        self._installed: List[Tuple[Page, Locator]] = []
+        self.context.on("page", self._install_on_page)
+
+    def use_carrier(self, carrier: Carrier) -> None:
+        """Switches the handlers of all open pages to the given carrier."""
+        if carrier == self.carrier:
+            return
+
+        self._uninstall_all()
+        self.carrier = carrier
+        for page in self.context.pages:
+            self._install_on_page(page)
+
+    def _locator(self, page: Page, overlay: OverlayHandler, selector: str) -> Locator:
+        resolved = f"xpath={selector}" if overlay.selector_type == "xpath" else selector
+        scope = page.frame_locator(overlay.frame) if overlay.frame else page
+        return scope.locator(resolved).first
+
+    def _install_on_page(self, page: Page) -> None:
+        for overlay in CARRIER_OVERLAYS.get(self.carrier, []):
+            trigger = self._locator(page, overlay, overlay.trigger)
+            dismiss = self._locator(page, overlay, overlay.dismiss) if overlay.dismiss else trigger
+            try:
+                page.add_locator_handler(trigger, self._make_handler(overlay, dismiss))
+                self._installed.append((page, trigger))
+            except Exception as e:
+                self.logger.warning(f"Could not install overlay handler '{overlay.name}': {str(e)}")
+
+    def _make_handler(self, overlay: OverlayHandler, dismiss: Locator):
+        def handler() -> None:
+            self.logger.info(f"Overlay '{overlay.name}' detected, dismissing...")
+            try:
+                dismiss.click(timeout=5000)
+            except Exception as e:
+                self.logger.warning(f"Could not dismiss overlay '{overlay.name}': {str(e)}")
+
+        return handler
+
+    def _uninstall_all(self) -> None:
+        for page, trigger in self._installed:
+            try:
+                if not page.is_closed():
+                    page.remove_locator_handler(trigger)
+            except Exception:
+                continue
+        self._installed = []
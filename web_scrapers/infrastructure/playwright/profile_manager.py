@@ -0,0 +1,326 @@
+"""
+Persistent browser profiles keyed by credential, several open at once.
+
+Carriers with bot detection (Rogers) get a persistent context (launch_persistent_context)
+so the portal sees a browser with history and stable storage. A user-data dir can only
+be used by one browser at a time, so a profile per carrier allowed a single session of
+that carrier and every credential switch wiped the previous credential's cookies. Each
+credential now has its own profile directory and browser, open concurrently with the
+others; the session pool still bounds how many are alive.
+
+The profile directories grow with the browser caches, so before a profile is opened the
+profiles directory is pruned down to SCRAPER_BROWSER_PROFILES_MAX_MB: first the cache
+subdirectories of the least recently used closed profiles, then whole closed profiles
+(oldest first). Open profiles are never touched.
+
+Several processors may share the profiles directory of a host. A process holds an
+exclusive lock (fcntl.flock on "<profile>_profile.lock") while a profile is open, and
+pruning only deletes a profile it can lock whose Chrome SingletonLock is not held by a
+live browser, so a profile another process has open is never deleted under it.
+
+The per-carrier profiles of the previous layout ("rogers_profile") hold the cookies of
+whichever credential used them last, so they are not migrated to a credential (that
+could resume another account's session). With SCRAPER_BROWSER_PROFILES_REMOVE_LEGACY
+they are deleted on the first prune; otherwise they are left on disk and only reported.
+
+Configuration (environment variables):
+    SCRAPER_BROWSER_PROFILES_MAX_MB: Disk budget of the persistent profiles directory (default 2048, 0 = off)
+    SCRAPER_BROWSER_PROFILES_REMOVE_LEGACY: Delete the per-carrier profiles of the previous layout (default false)
+"""
+
+import logging
+import os
+import shutil
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process bookkeeping applies
+    fcntl = None
+
+from playwright.sync_api import BrowserContext
+
+from web_scrapers.domain.entities.session import Carrier
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.playwright.browser_factory import BrowserDriverFactory
+
+PROFILE_DIR_SUFFIX = "_profile"
+PROFILE_LOCK_SUFFIX = f"{PROFILE_DIR_SUFFIX}.lock"
+
+# Seconds open() waits for a profile locked by another process (e.g. while it prunes its cache)
+PROFILE_LOCK_WAIT_SECONDS = 30
+
+# Profile names of the previous layout, one profile per carrier shared by all its credentials
+LEGACY_PROFILE_NAMES = frozenset(carrier.value.lower() for carrier in Carrier)
+
+# Chromium cache directories, rebuilt by the browser on demand (cookies and storage are kept)
+CACHE_SUBDIRS = (
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "Default/DawnCache",
+    "Default/Service Worker/CacheStorage",
+    "Default/Service Worker/ScriptCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "component_crx_cache",
+)
+
+
+def directory_size(path: Path) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def chrome_lock_alive(profile_dir: Path) -> bool:
+    """
+    True if a running Chrome holds the profile (its SingletonLock symlink points to "<host>-<pid>").
+
+    A lock of another host, or one that cannot be read, counts as alive.
+    """
+    lock_path = profile_dir / "SingletonLock"
+    try:
+        target = os.readlink(lock_path)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return os.path.lexists(lock_path)
+
+    host, _, pid = target.rpartition("-")
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (ValueError, PermissionError):
+        return True
+    return True
+
+
+class BrowserProfileManager:
+    """Opens persistent contexts by profile name and keeps the profiles directory within its budget."""
+
+    def __init__(self, factory: BrowserDriverFactory, max_bytes: Optional[int] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.factory = factory
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(os.getenv("SCRAPER_BROWSER_PROFILES_MAX_MB", "2048")) * 1024 * 1024
+        )
+        self.remove_legacy = os.getenv("SCRAPER_BROWSER_PROFILES_REMOVE_LEGACY", "false").lower() == "true"
+        self._open: Dict[str, BrowserContext] = {}
+        # Lock files held while the profiles are open (see _try_lock)
+        self._locks: Dict[str, IO] = {}
+        self._legacy_checked = False
+
+    @staticmethod
+    def profile_name(carrier: str, credential_id: Optional[int]) -> str:
+        """Profile of a credential ("rogers_42"); the carrier's shared profile when the credential has no id."""
+        carrier = carrier.lower()
+        return f"{carrier}_{credential_id}" if credential_id is not None else f"{carrier}_shared"
+
+    @property
+    def open_profiles(self) -> Set[str]:
+        return set(self._open)
+
+    def open(self, profile_name: str) -> BrowserContext:
+        """Launches the persistent context of a profile (its own browser, alongside the other profiles)."""
+        if profile_name in self._open:
+            raise RuntimeError(f"Browser profile '{profile_name}' is already in use")
+
+        base_dir = self.factory.get_profiles_base_dir()
+        lock_file = self._try_lock(base_dir, profile_name, wait_seconds=PROFILE_LOCK_WAIT_SECONDS)
+        if lock_file is None:
+            raise RuntimeError(f"Browser profile '{profile_name}' is in use by another process")
+        self._locks[profile_name] = lock_file
+
+        try:
+            self.prune(keep={profile_name})
+            context = self.factory.create_persistent_context(profile_name)
+        except Exception:
+            self._release(profile_name)
+            raise
+        self._open[profile_name] = context
+        # Closing the context (session evicted, browser crashed) frees the profile
+        context.on("close", lambda _context: self._release(profile_name))
+
+        profile_dir = self.factory.get_profile_dir(profile_name)
+        try:
+            # The directory mtime orders the profiles for pruning
+            os.utime(profile_dir)
+        except OSError:
+            pass
+        self.logger.info(f"Opened browser profile '{profile_name}' ({len(self._open)} open)")
+        return context
+
+    def close_all(self) -> None:
+        for profile_name, context in list(self._open.items()):
+            try:
+                context.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing browser profile '{profile_name}': {str(e)}")
+            self._release(profile_name)
+
+    def prune(self, keep: Iterable[str] = ()) -> int:
+        """
+        Frees disk space of closed profiles until the directory fits its budget.
+
+        Args:
+            keep: Profiles that must not be pruned besides the open ones
+
+        Returns:
+            Bytes freed
+        """
+        base_dir = self.factory.get_profiles_base_dir()
+        if not self._legacy_checked:
+            self.remove_legacy_profiles(base_dir)
+        profiles = self._profiles(base_dir)
+        total = sum(size for _name, _path, _mtime, size in profiles)
+        metrics.BROWSER_PROFILES_BYTES.set(total)
+        if self.max_bytes <= 0 or total <= self.max_bytes:
+            return 0
+
+        protected = self.open_profiles | set(keep)
+        if not self.remove_legacy:
+            protected |= LEGACY_PROFILE_NAMES
+        candidates = [profile for profile in profiles if profile[0] not in protected]
+        freed = 0
+
+        for name, path, _mtime, _size in candidates:
+            if total - freed <= self.max_bytes:
+                break
+            with self._unused_profile(base_dir, name, path) as unused:
+                if not unused:
+                    continue
+                for subdir in CACHE_SUBDIRS:
+                    cache_dir = path / subdir
+                    if cache_dir.is_dir():
+                        size = directory_size(cache_dir)
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                        freed += size
+                        metrics.BROWSER_PROFILE_PRUNED_BYTES_TOTAL.inc(size, scope="cache")
+
+        for name, path, _mtime, _size in candidates:
+            if total - freed <= self.max_bytes:
+                break
+            with self._unused_profile(base_dir, name, path) as unused:
+                if not unused:
+                    continue
+                size = directory_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                freed += size
+                metrics.BROWSER_PROFILE_PRUNED_BYTES_TOTAL.inc(size, scope="profile")
+                self.logger.info(f"Removed browser profile '{name}' ({size / 1024 / 1024:.0f} MB)")
+
+        self.logger.info(
+            f"Pruned {freed / 1024 / 1024:.0f} MB of browser profiles "
+            f"({total / 1024 / 1024:.0f} MB, budget {self.max_bytes / 1024 / 1024:.0f} MB)"
+        )
+        metrics.BROWSER_PROFILES_BYTES.set(total - freed)
+        return freed
+
+    def remove_legacy_profiles(self, base_dir: Path) -> int:
+        """
+        Deletes the per-carrier profiles of the previous layout if SCRAPER_BROWSER_PROFILES_REMOVE_LEGACY
+        is set (otherwise they are only reported). Profiles in use are skipped.
+
+        Returns:
+            Bytes freed
+        """
+        self._legacy_checked = True
+        freed = 0
+        for name in sorted(LEGACY_PROFILE_NAMES - self.open_profiles):
+            path = base_dir / f"{name}{PROFILE_DIR_SUFFIX}"
+            if not path.is_dir():
+                continue
+            if not self.remove_legacy:
+                self.logger.info(
+                    f"Legacy browser profile '{name}' is no longer used "
+                    f"(set SCRAPER_BROWSER_PROFILES_REMOVE_LEGACY=true to delete it)"
+                )
+                continue
+            with self._unused_profile(base_dir, name, path) as unused:
+                if not unused:
+                    continue
+                size = directory_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                freed += size
+                metrics.BROWSER_PROFILE_PRUNED_BYTES_TOTAL.inc(size, scope="legacy")
+                self.logger.info(f"Removed legacy browser profile '{name}' ({size / 1024 / 1024:.0f} MB)")
+        return freed
+
+    @contextmanager
+    def _unused_profile(self, base_dir: Path, name: str, path: Path) -> Iterator[bool]:
+        """Locks a closed profile for deletion; yields False if another process or a live Chrome uses it."""
+        lock_file = self._try_lock(base_dir, name)
+        if lock_file is None:
+            self.logger.info(f"Browser profile '{name}' is in use by another process, not pruned")
+            yield False
+            return
+        try:
+            if chrome_lock_alive(path):
+                self.logger.info(f"Browser profile '{name}' is open in a running browser, not pruned")
+                yield False
+            else:
+                yield True
+        finally:
+            self._unlock(lock_file)
+
+    def _try_lock(self, base_dir: Path, name: str, wait_seconds: float = 0) -> Optional[IO]:
+        """Takes the exclusive lock of a profile, waiting up to wait_seconds. Returns the lock file, or None."""
+        lock_file = open(base_dir / f"{name}{PROFILE_LOCK_SUFFIX}", "a")
+        if not fcntl:
+            return lock_file
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return lock_file
+            except OSError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    return None
+                time.sleep(0.5)
+
+    @staticmethod
+    def _unlock(lock_file: IO) -> None:
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            lock_file.close()
+
+    def _release(self, profile_name: str) -> None:
+        """Forgets a closed profile and releases its lock."""
+        self._open.pop(profile_name, None)
+        lock_file = self._locks.pop(profile_name, None)
+        if lock_file:
+            self._unlock(lock_file)
+
+    @staticmethod
+    def _profiles(base_dir: Path) -> List[Tuple[str, Path, float, int]]:
+        """(name, path, mtime, size) of the profile directories, least recently used first."""
+        profiles = []
+        for path in base_dir.iterdir():
+            if not path.is_dir() or not path.name.endswith(PROFILE_DIR_SUFFIX):
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                mtime = time.time()
+            profiles.append((path.name[: -len(PROFILE_DIR_SUFFIX)], path, mtime, directory_size(path)))
+        profiles.sort(key=lambda profile: profile[2])
+        return profiles
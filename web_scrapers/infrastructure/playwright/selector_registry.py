@@ -0,0 +1,142 @@
+"""
+Selector fallback chains with a per-carrier winner cache.
+
+Each logical element of a portal (e.g. the card of a report in Bell's "My Reports")
+is registered with an ordered list of candidate selectors. When the element is
+resolved, all candidates are probed in quick succession until one is visible, so
+markup drift costs one polling round instead of a full timeout per alternative.
+The candidate that matched is remembered per carrier and persisted, and it is
+probed first on the next run.
+
+Configuration (environment variables):
+    SCRAPER_SELECTOR_CACHE_PATH: JSON file with the winners (default <artifacts>/selector_winners.json)
+"""
+
+import json
+import logging
+import os
+import threading
+from enum import Enum
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from web_scrapers.infrastructure.artifacts import get_artifacts_base_dir
+
+
+class SelectorCandidate(NamedTuple):
+    """A candidate selector. The selector may contain str.format placeholders filled at resolve time."""
+
+    name: str
+    selector: str
+    selector_type: str = "xpath"
+
+
+class ResolvedSelector(NamedTuple):
+    name: str
+    selector: str
+    selector_type: str
+
+
+class SelectorRegistry:
+    """Ordered candidate selectors per (carrier, element), with the last winner probed first."""
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_path = cache_path or os.getenv(
+            "SCRAPER_SELECTOR_CACHE_PATH", os.path.join(get_artifacts_base_dir(), "selector_winners.json")
+        )
+        self._candidates: Dict[str, Dict[str, List[SelectorCandidate]]] = {}
+        self._winners: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _carrier_key(carrier: Union[str, Enum]) -> str:
+        return str(carrier.value if isinstance(carrier, Enum) else carrier).lower()
+
+    def register(self, carrier: Union[str, Enum], element: str, candidates: Sequence[SelectorCandidate]) -> None:
+        """Registers the candidates of a logical element, in default order of preference."""
+        self._candidates.setdefault(self._carrier_key(carrier), {})[element] = list(candidates)
+
+    def get_candidates(self, carrier: Union[str, Enum], element: str) -> List[SelectorCandidate]:
+        """Returns the candidates of an element with the cached winner (if any) first."""
+        carrier_key = self._carrier_key(carrier)
+        candidates = self._candidates.get(carrier_key, {}).get(element)
+        if not candidates:
+            raise KeyError(f"No selectors registered for {carrier_key}/{element}")
+
+        winner = self._load_winners().get(carrier_key, {}).get(element)
+        return sorted(candidates, key=lambda candidate: candidate.name != winner)
+
+    def record_winner(self, carrier: Union[str, Enum], element: str, candidate_name: str) -> None:
+        carrier_key = self._carrier_key(carrier)
+        winners = self._load_winners()
+        if winners.get(carrier_key, {}).get(element) == candidate_name:
+            return
+        with self._lock:
+            winners.setdefault(carrier_key, {})[element] = candidate_name
+            self._save_winners(winners)
+        self.logger.info(f"Selector winner for {carrier_key}/{element} is now '{candidate_name}'")
+
+    def resolve(
+        self,
+        browser_wrapper: BrowserWrapper,
+        carrier: Union[str, Enum],
+        element: str,
+        timeout: int = 10000,
+        **params: str,
+    ) -> Optional[ResolvedSelector]:
+        """
+        Probes the candidates of an element until one is visible.
+
+        Args:
+            browser_wrapper: Browser used to probe the selectors
+            carrier: Carrier the element belongs to
+            element: Logical element name
+            timeout: Total time (ms) shared by all candidates
+            **params: Values for the placeholders of the candidate selectors
+
+        Returns:
+            The selector that matched, or None if no candidate became visible before the timeout
+        """
+        candidates = self.get_candidates(carrier, element)
+        selectors = [(candidate.selector.format(**params), candidate.selector_type) for candidate in candidates]
+
+        index = browser_wrapper.find_first_visible(selectors, timeout=timeout)
+        if index is None:
+            self.logger.warning(f"None of the {len(candidates)} selectors for {element} matched")
+            return None
+
+        candidate = candidates[index]
+        if index > 0:
+            self.logger.info(f"Selector '{candidate.name}' matched for {element} (fallback #{index})")
+        self.record_winner(carrier, element, candidate.name)
+        return ResolvedSelector(candidate.name, *selectors[index])
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load_winners(self) -> Dict[str, Dict[str, str]]:
+        if self._winners is None:
+            try:
+                with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                    self._winners = json.load(cache_file)
+            except FileNotFoundError:
+                self._winners = {}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read selector cache {self.cache_path}: {str(e)}")
+                self._winners = {}
+        return self._winners
+
+    def _save_winners(self, winners: Dict[str, Dict[str, str]]) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(winners, cache_file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write selector cache {self.cache_path}: {str(e)}")
+
+
+selector_registry = SelectorRegistry()
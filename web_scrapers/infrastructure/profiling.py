@@ -0,0 +1,154 @@
+"""
+Optional per-job CPU and allocation profiling.
+
+When enabled for a job, a sampling profiler records the stack of the thread
+running the job at a fixed interval and writes it as folded stacks
+(``profile.folded``), which can be opened directly with speedscope or rendered
+with flamegraph.pl. Optionally, tracemalloc is started for the job and the top
+allocation sites are written to ``allocations.txt``. Both files go to the job's
+artifact directory.
+
+Configuration (environment variables):
+    SCRAPER_PROFILE: Comma separated modes to enable: "cpu", "memory" (disabled if empty)
+    SCRAPER_PROFILE_JOB_IDS: Optional comma separated job IDs to profile (all jobs if empty)
+    SCRAPER_PROFILE_INTERVAL_MS: Sampling interval in milliseconds (default 10)
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional, Set
+
+from web_scrapers.infrastructure.artifacts import get_job_artifacts_dir
+
+logger = logging.getLogger(__name__)
+
+
+def get_profile_modes(job_id: int) -> Set[str]:
+    """Returns the profiling modes configured for a job ("cpu", "memory"), empty if profiling is disabled."""
+    modes = {mode.strip().lower() for mode in os.getenv("SCRAPER_PROFILE", "").split(",") if mode.strip()}
+    if not modes:
+        return set()
+
+    job_ids = {value.strip() for value in os.getenv("SCRAPER_PROFILE_JOB_IDS", "").split(",") if value.strip()}
+    if job_ids and str(job_id) not in job_ids:
+        return set()
+    return modes
+
+
+class SamplingProfiler:
+    """Samples the stack of one thread from a background thread and aggregates folded stacks."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.01):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        name = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return name.replace(";", ",")
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="job-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as output_file:
+            for stack, count in self.samples.most_common():
+                output_file.write(f"{stack} {count}\n")
+
+
+class JobProfiler:
+    """
+    Context manager that profiles the code run inside it for a job.
+
+    Usage:
+        with JobProfiler(job_id, modes={"cpu", "memory"}):
+            run_job()
+    """
+
+    def __init__(self, job_id: int, modes: Set[str], top_allocations: int = 30):
+        self.job_id = job_id
+        self.modes = modes
+        self.top_allocations = top_allocations
+        self._sampler: Optional[SamplingProfiler] = None
+        self._started_tracemalloc = False
+        self._started_at = 0.0
+
+    def __enter__(self) -> "JobProfiler":
+        self._started_at = time.monotonic()
+        if "cpu" in self.modes:
+            interval = int(os.getenv("SCRAPER_PROFILE_INTERVAL_MS", "10")) / 1000
+            self._sampler = SamplingProfiler(interval=interval)
+            self._sampler.start()
+        if "memory" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._started_tracemalloc = True
+        logger.info(f"Profiling job {self.job_id} ({', '.join(sorted(self.modes))})")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            job_dir = get_job_artifacts_dir(self.job_id)
+            if self._sampler:
+                self._sampler.stop()
+                profile_path = os.path.join(job_dir, "profile.folded")
+                self._sampler.write_folded(profile_path)
+                logger.info(f"CPU profile written to {profile_path} ({sum(self._sampler.samples.values())} samples)")
+            if self._started_tracemalloc:
+                allocations_path = os.path.join(job_dir, "allocations.txt")
+                self._write_allocations(allocations_path)
+                logger.info(f"Allocation report written to {allocations_path}")
+        except Exception as e:
+            logger.warning(f"Could not write profile for job {self.job_id}: {str(e)}")
+        finally:
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def _write_allocations(self, path: str) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, "w", encoding="utf-8") as output_file:
+            output_file.write(f"Job {self.job_id} - duration {time.monotonic() - self._started_at:.1f}s\n")
+            output_file.write(
+                f"Traced memory: current={current / 1024 ** 2:.1f} MiB, peak={peak / 1024 ** 2:.1f} MiB\n\n"
+            )
+            output_file.write(f"Top {self.top_allocations} allocation sites (by line):\n")
+            for i, stat in enumerate(snapshot.statistics("lineno")[: self.top_allocations], 1):
+                output_file.write(f"[{i}] {stat}\n")
+            output_file.write(f"\nTop {self.top_allocations} allocation sites (by traceback):\n")
+            for i, stat in enumerate(snapshot.statistics("traceback")[: self.top_allocations], 1):
+                output_file.write(f"[{i}] {stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                for line in stat.traceback.format(limit=8):
+                    output_file.write(f"    {line}\n")
@@ -0,0 +1,213 @@
+"""
+Adaptive polling of carrier reports that are generated asynchronously.
+
+Portals publish generated reports in a results table or a notification panel. Instead
+of sleeping a fixed time between checks, ReadinessPoller:
+
+- starts checking shortly before the report is typically ready (exponentially weighted
+  moving average of past readiness times per carrier report, persisted across runs),
+- then checks on a backoff curve (initial interval, growth factor, maximum interval)
+  until the timeout,
+- and, when given a snapshot function (e.g. one extract_table of the results table),
+  only runs the expensive check when the snapshot changed since the previous round.
+
+Configuration (environment variables):
+    SCRAPER_POLL_INITIAL_SECONDS: First interval between checks (default 10)
+    SCRAPER_POLL_BACKOFF_FACTOR: Growth of the interval after each check (default 1.5)
+    SCRAPER_POLL_MAX_INTERVAL_SECONDS: Maximum interval between checks (default 120)
+    SCRAPER_READINESS_EWMA_ALPHA: Weight of the latest readiness time in the average (default 0.3)
+    SCRAPER_READINESS_STATS_PATH: JSON file with the averages (default <artifacts>/readiness_stats.json)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar, Union
+
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.artifacts import get_artifacts_base_dir
+
+T = TypeVar("T")
+
+# Fraction of the typical readiness time waited before the first check
+FIRST_CHECK_FRACTION = 0.8
+
+
+class BackoffSchedule:
+    """Intervals between checks: initial, initial * factor, ... capped at max_interval."""
+
+    def __init__(
+        self,
+        initial: Optional[float] = None,
+        factor: Optional[float] = None,
+        max_interval: Optional[float] = None,
+    ):
+        self.initial = initial if initial is not None else float(os.getenv("SCRAPER_POLL_INITIAL_SECONDS", "10"))
+        self.factor = factor if factor is not None else float(os.getenv("SCRAPER_POLL_BACKOFF_FACTOR", "1.5"))
+        self.max_interval = (
+            max_interval if max_interval is not None else float(os.getenv("SCRAPER_POLL_MAX_INTERVAL_SECONDS", "120"))
+        )
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield min(interval, self.max_interval)
+            interval *= self.factor
+
+
+class ReadinessStats:
+    """Moving average of the readiness time of each carrier report."""
+
+    def __init__(self, path: Optional[str] = None, alpha: Optional[float] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path or os.getenv(
+            "SCRAPER_READINESS_STATS_PATH", os.path.join(get_artifacts_base_dir(), "readiness_stats.json")
+        )
+        self.alpha = alpha if alpha is not None else float(os.getenv("SCRAPER_READINESS_EWMA_ALPHA", "0.3"))
+        self._stats: Optional[Dict[str, Dict[str, float]]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(carrier: Union[str, Enum], report: str) -> str:
+        carrier_name = carrier.value if isinstance(carrier, Enum) else carrier
+        return f"{str(carrier_name).lower()}:{report}"
+
+    def expected_seconds(self, key: str) -> Optional[float]:
+        """Typical readiness time of the report, or None if it was never observed."""
+        entry = self._load().get(key)
+        return entry["ewma"] if entry else None
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._load()
+            entry = stats.get(key)
+            if entry:
+                entry["ewma"] = self.alpha * seconds + (1 - self.alpha) * entry["ewma"]
+                entry["samples"] += 1
+            else:
+                stats[key] = {"ewma": seconds, "samples": 1}
+            self._save(stats)
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._stats is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as stats_file:
+                    self._stats = json.load(stats_file)
+            except FileNotFoundError:
+                self._stats = {}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read readiness stats {self.path}: {str(e)}")
+                self._stats = {}
+        return self._stats
+
+    def _save(self, stats: Dict[str, Dict[str, float]]) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as stats_file:
+                json.dump(stats, stats_file, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write readiness stats {self.path}: {str(e)}")
+
+
+def snapshot_fingerprint(snapshot: Any) -> str:
+    """Stable hash of an extracted table (or any JSON-serializable snapshot)."""
+    return hashlib.sha256(json.dumps(snapshot, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ReadinessPoller:
+    """Polls a readiness check on a learned first delay and a backoff curve."""
+
+    def __init__(
+        self,
+        carrier: Union[str, Enum],
+        report: str,
+        timeout: float,
+        schedule: Optional[BackoffSchedule] = None,
+        stats: Optional[ReadinessStats] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+        learn: bool = True,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats = stats if stats is not None else readiness_stats
+        self.key = ReadinessStats.key(carrier, report)
+        self.timeout = timeout
+        self.schedule = schedule or BackoffSchedule()
+        self._sleep = sleep
+        self._clock = clock
+        # Readiness times are only learned when measured from the actual request (not e.g. a later collect run)
+        self.learn = learn
+
+    def poll(
+        self,
+        check: Callable[[Any], Optional[T]],
+        snapshot: Optional[Callable[[], Any]] = None,
+        refresh: Optional[Callable[[], None]] = None,
+        since: Optional[float] = None,
+    ) -> Optional[T]:
+        """
+        Runs check until it returns a value or the timeout expires.
+
+        Args:
+            check: Receives the latest snapshot (None without snapshot function) and returns
+                the ready result, or None if the report is not ready yet
+            snapshot: Cheap read of the table/panel; check is skipped while it is unchanged
+            refresh: Called before each round after the first (e.g. page reload)
+            since: Epoch seconds when the report was requested (default: now); readiness
+                times are measured from it
+
+        Returns:
+            The first non-None result of check, or None on timeout
+        """
+        started_at = since if since is not None else self._clock()
+        deadline = self._clock() + self.timeout
+
+        expected = self.stats.expected_seconds(self.key)
+        if expected is not None:
+            first_wait = min(started_at + expected * FIRST_CHECK_FRACTION - self._clock(), self.timeout)
+            if first_wait > 0:
+                self.logger.info(
+                    f"{self.key} is usually ready after {expected:.0f}s, first check in {first_wait:.0f}s"
+                )
+                self._sleep(first_wait)
+
+        previous_fingerprint = None
+        intervals = self.schedule.intervals()
+        checks = 0
+        while True:
+            if checks and refresh:
+                refresh()
+
+            current = snapshot() if snapshot else None
+            fingerprint = snapshot_fingerprint(current) if snapshot else None
+            if snapshot and checks and fingerprint == previous_fingerprint:
+                self.logger.debug(f"{self.key}: no changes since the previous check")
+            else:
+                result = check(current)
+                if result is not None:
+                    elapsed = self._clock() - started_at
+                    self.logger.info(f"{self.key} ready after {elapsed:.0f}s ({checks + 1} check(s))")
+                    if self.learn:
+                        self.stats.record(self.key, elapsed)
+                        metrics.REPORT_READINESS_SECONDS.observe(elapsed, report=self.key)
+                    return result
+            previous_fingerprint = fingerprint
+            checks += 1
+
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                self.logger.warning(f"{self.key} not ready after {self.timeout:.0f}s ({checks} check(s))")
+                return None
+            interval = min(next(intervals), remaining)
+            self.logger.info(f"{self.key} not ready yet, checking again in {interval:.0f}s")
+            self._sleep(interval)
+
+
+# Shared instance: the averages are loaded once per process
+readiness_stats = ReadinessStats()
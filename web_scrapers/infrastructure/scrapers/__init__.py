@@ -5,61 +5,71 @@ Este módulo contiene las implementaciones concretas de scrapers para cada carri
 siguiendo el patrón template definido en las clases base.
 """
 
-from web_scrapers.infrastructure.scrapers.att import (
-    ATTDailyUsageScraperStrategy,
-    ATTMonthlyReportsScraperStrategy,
-    ATTPDFInvoiceScraperStrategy,
-)
-from web_scrapers.infrastructure.scrapers.bell import (
-    BellDailyUsageScraperStrategy,
-    BellMonthlyReportsScraperStrategy,
-    BellMonthlyReportsScraperStrategyLegacy,
-    BellPDFInvoiceScraperStrategy,
-)
-from web_scrapers.infrastructure.scrapers.rogers import (
-    RogersDailyUsageScraperStrategy,
-    RogersMonthlyReportsScraperStrategy,
-    RogersPDFInvoiceScraperStrategy,
-)
-from web_scrapers.infrastructure.scrapers.telus import (
-    TelusDailyUsageScraperStrategy,
-    TelusMonthlyReportsScraperStrategy,
-    TelusPDFInvoiceScraperStrategy,
-)
-from web_scrapers.infrastructure.scrapers.tmobile import (
-    TMobileDailyUsageScraperStrategy,
-    TMobileMonthlyReportsScraperStrategy,
-    TMobilePDFInvoiceScraperStrategy,
-)
-from web_scrapers.infrastructure.scrapers.verizon import (
-    VerizonDailyUsageScraperStrategy,
-    VerizonMonthlyReportsScraperStrategy,
-    VerizonPDFInvoiceScraperStrategy,
-)
+from typing import TYPE_CHECKING
 
-__all__ = [
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.att import (
+        ATTDailyUsageScraperStrategy,
+        ATTMonthlyReportsScraperStrategy,
+        ATTPDFInvoiceScraperStrategy,
+    )
+    from web_scrapers.infrastructure.scrapers.bell import (
+        BellDailyUsageScraperStrategy,
+        BellMonthlyReportsScraperStrategy,
+        BellMonthlyReportsScraperStrategyLegacy,
+        BellPDFInvoiceScraperStrategy,
+    )
+    from web_scrapers.infrastructure.scrapers.rogers import (
+        RogersDailyUsageScraperStrategy,
+        RogersMonthlyReportsScraperStrategy,
+        RogersPDFInvoiceScraperStrategy,
+    )
+    from web_scrapers.infrastructure.scrapers.telus import (
+        TelusDailyUsageScraperStrategy,
+        TelusMonthlyReportsScraperStrategy,
+        TelusPDFInvoiceScraperStrategy,
+    )
+    from web_scrapers.infrastructure.scrapers.tmobile import (
+        TMobileDailyUsageScraperStrategy,
+        TMobileMonthlyReportsScraperStrategy,
+        TMobilePDFInvoiceScraperStrategy,
+    )
+    from web_scrapers.infrastructure.scrapers.verizon import (
+        VerizonDailyUsageScraperStrategy,
+        VerizonMonthlyReportsScraperStrategy,
+        VerizonPDFInvoiceScraperStrategy,
+    )
+
+# Carrier packages are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
     # Bell
-    "BellMonthlyReportsScraperStrategy",
-    "BellDailyUsageScraperStrategy",
-    "BellPDFInvoiceScraperStrategy",
+    "BellMonthlyReportsScraperStrategy": "bell",
+    "BellMonthlyReportsScraperStrategyLegacy": "bell",
+    "BellDailyUsageScraperStrategy": "bell",
+    "BellPDFInvoiceScraperStrategy": "bell",
     # Telus
-    "TelusMonthlyReportsScraperStrategy",
-    "TelusDailyUsageScraperStrategy",
-    "TelusPDFInvoiceScraperStrategy",
+    "TelusMonthlyReportsScraperStrategy": "telus",
+    "TelusDailyUsageScraperStrategy": "telus",
+    "TelusPDFInvoiceScraperStrategy": "telus",
     # Rogers
-    "RogersMonthlyReportsScraperStrategy",
-    "RogersDailyUsageScraperStrategy",
-    "RogersPDFInvoiceScraperStrategy",
+    "RogersMonthlyReportsScraperStrategy": "rogers",
+    "RogersDailyUsageScraperStrategy": "rogers",
+    "RogersPDFInvoiceScraperStrategy": "rogers",
     # ATT
-    "ATTMonthlyReportsScraperStrategy",
-    "ATTDailyUsageScraperStrategy",
-    "ATTPDFInvoiceScraperStrategy",
+    "ATTMonthlyReportsScraperStrategy": "att",
+    "ATTDailyUsageScraperStrategy": "att",
+    "ATTPDFInvoiceScraperStrategy": "att",
     # T-Mobile
-    "TMobileMonthlyReportsScraperStrategy",
-    "TMobileDailyUsageScraperStrategy",
-    "TMobilePDFInvoiceScraperStrategy",
+    "TMobileMonthlyReportsScraperStrategy": "tmobile",
+    "TMobileDailyUsageScraperStrategy": "tmobile",
+    "TMobilePDFInvoiceScraperStrategy": "tmobile",
     # Verizon
-    "VerizonMonthlyReportsScraperStrategy",
-    "VerizonDailyUsageScraperStrategy",
-    "VerizonPDFInvoiceScraperStrategy",
-]
+    "VerizonMonthlyReportsScraperStrategy": "verizon",
+    "VerizonDailyUsageScraperStrategy": "verizon",
+    "VerizonPDFInvoiceScraperStrategy": "verizon",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
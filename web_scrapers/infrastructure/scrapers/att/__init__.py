@@ -1,9 +1,18 @@
-from web_scrapers.infrastructure.scrapers.att.daily_usage import ATTDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.att.monthly_reports import ATTMonthlyReportsScraperStrategy
-from web_scrapers.infrastructure.scrapers.att.pdf_invoice import ATTPDFInvoiceScraperStrategy
-
-__all__ = [
-    "ATTMonthlyReportsScraperStrategy",
-    "ATTDailyUsageScraperStrategy",
-    "ATTPDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.att.daily_usage import ATTDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.att.monthly_reports import ATTMonthlyReportsScraperStrategy
+    from web_scrapers.infrastructure.scrapers.att.pdf_invoice import ATTPDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "ATTMonthlyReportsScraperStrategy": "monthly_reports",
+    "ATTDailyUsageScraperStrategy": "daily_usage",
+    "ATTPDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
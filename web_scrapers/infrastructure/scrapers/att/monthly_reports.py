@@ -185,41 +185,20 @@ class ATTMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             ]
             inventory_reports = [ATTFileSlug.UPGRADE_AND_INVENTORY.value]
 
-            # 1. Procesar reportes de "Charges and usage"
-            self.logger.info("Processing Charges and usage reports...")
-            self._click_tab("Charges and usage")
-            time.sleep(3)
-
-            # Verificar y configurar filtros (cuenta + fecha)
-            self._ensure_filters_configured(billing_cycle, needs_date_filter=True)
-
-            for slug in charges_reports:
-                report_config = self.REPORT_CONFIG.get(slug)
-                if report_config:
-                    file_info = self._download_single_report(
-                        slug, report_config, billing_cycle_file_map, billing_cycle
-                    )
-                    if file_info:
-                        downloaded_files.append(file_info)
-
-            # 2. Procesar reportes de "Inventory"
-            self.logger.info("Processing Inventory reports...")
-            self._click_tab("Inventory")
-            time.sleep(5)
-
-            # Verificar y configurar solo filtro de cuenta (no hay filtro de fecha en Inventory)
-            self._ensure_filters_configured(billing_cycle, needs_date_filter=False)
-
-            for slug in inventory_reports:
-                report_config = self.REPORT_CONFIG.get(slug)
-                if report_config:
-                    file_info = self._download_single_report(
-                        slug, report_config, billing_cycle_file_map, billing_cycle
-                    )
-                    if file_info:
-                        downloaded_files.append(file_info)
+            # Cada pestaña hace click en su tab y configura sus filtros, asi que pueden correr en
+            # pestañas paralelas (SCRAPER_MULTI_TAB_WORKERS)
+            downloaded_files = self._download_in_tabs(
+                {
+                    "charges_and_usage": lambda tab: tab._download_tab_reports(
+                        "Charges and usage", charges_reports, billing_cycle_file_map, billing_cycle
+                    ),
+                    "inventory": lambda tab: tab._download_tab_reports(
+                        "Inventory", inventory_reports, billing_cycle_file_map, billing_cycle
+                    ),
+                }
+            )
 
-            # 3. Reset a pantalla principal
+            # Reset a pantalla principal
             self._reset_to_main_screen()
 
             self.logger.info(f"Download completed. Total files: {len(downloaded_files)}")
@@ -233,6 +212,29 @@ class ATTMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                 pass
             return downloaded_files
 
+    def _download_tab_reports(
+        self, tab_name: str, slugs: List[str], billing_cycle_file_map: dict, billing_cycle: BillingCycle
+    ) -> List[FileDownloadInfo]:
+        """Descarga los reportes de una pestaña del listado (solo "Charges and usage" filtra por fecha)."""
+        downloaded_files = []
+        needs_date_filter = tab_name == "Charges and usage"
+
+        self.logger.info(f"Processing {tab_name} reports...")
+        self._click_tab(tab_name)
+        time.sleep(3 if needs_date_filter else 5)
+
+        # Verificar y configurar filtros (cuenta, y fecha si la pestaña la tiene)
+        self._ensure_filters_configured(billing_cycle, needs_date_filter=needs_date_filter)
+
+        for slug in slugs:
+            report_config = self.REPORT_CONFIG.get(slug)
+            if report_config and not self._is_checkpointed(slug):
+                file_info = self._download_single_report(slug, report_config, billing_cycle_file_map, billing_cycle)
+                if file_info:
+                    downloaded_files.append(file_info)
+
+        return downloaded_files
+
     def _ensure_filters_configured(self, billing_cycle: BillingCycle, needs_date_filter: bool = True):
         """Verifica que los filtros estén configurados correctamente, si no, los configura."""
         self.logger.info("Verifying filters configuration...")
@@ -756,7 +758,11 @@ class ATTMonthlyReportsScraperStrategyLegacy(MonthlyReportsScraperStrategy):
 
             self._configure_date_range(billing_cycle)
 
-            charges_reports = [slug for slug, cfg in slug_to_report_config.items() if cfg["tab"] == "charges"]
+            charges_reports = [
+                slug
+                for slug, cfg in slug_to_report_config.items()
+                if cfg["tab"] == "charges" and not self._is_checkpointed(slug)
+            ]
             for slug in charges_reports:
                 self._download_single_report(
                     slug, slug_to_report_config[slug], billing_cycle_file_map, downloaded_files
@@ -767,7 +773,11 @@ class ATTMonthlyReportsScraperStrategyLegacy(MonthlyReportsScraperStrategy):
             self.browser_wrapper.click_element(unbilled_tab_xpath)
             time.sleep(3)
 
-            unbilled_reports = [slug for slug, cfg in slug_to_report_config.items() if cfg["tab"] == "unbilled"]
+            unbilled_reports = [
+                slug
+                for slug, cfg in slug_to_report_config.items()
+                if cfg["tab"] == "unbilled" and not self._is_checkpointed(slug)
+            ]
             for slug in unbilled_reports:
                 self._download_single_report(
                     slug, slug_to_report_config[slug], billing_cycle_file_map, downloaded_files
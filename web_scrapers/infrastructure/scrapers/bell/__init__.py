@@ -1,13 +1,22 @@
-from web_scrapers.infrastructure.scrapers.bell.daily_usage import BellDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.bell.monthly_reports import (
-    BellMonthlyReportsScraperStrategy,
-    BellMonthlyReportsScraperStrategyLegacy,
-)
-from web_scrapers.infrastructure.scrapers.bell.pdf_invoice import BellPDFInvoiceScraperStrategy
-
-__all__ = [
-    "BellMonthlyReportsScraperStrategy",
-    "BellMonthlyReportsScraperStrategyLegacy",
-    "BellDailyUsageScraperStrategy",
-    "BellPDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.bell.daily_usage import BellDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.bell.monthly_reports import (
+        BellMonthlyReportsScraperStrategy,
+        BellMonthlyReportsScraperStrategyLegacy,
+    )
+    from web_scrapers.infrastructure.scrapers.bell.pdf_invoice import BellPDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "BellMonthlyReportsScraperStrategy": "monthly_reports",
+    "BellMonthlyReportsScraperStrategyLegacy": "monthly_reports",
+    "BellDailyUsageScraperStrategy": "daily_usage",
+    "BellPDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
@@ -1,10 +1,10 @@
 import logging
 import os
-import re
 import time
 from datetime import datetime
 from typing import Any, List, Optional
 
+from shared.infrastructure.normalization import parse_data_amounts
 from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
 from web_scrapers.domain.entities.models import BillingCycle, ScraperConfig
 from web_scrapers.domain.entities.scraper_strategies import (
@@ -94,61 +94,30 @@ class BellDailyUsageScraperStrategy(DailyUsageScraperStrategy):
         time.sleep(30)  # Esperar 30 segundos como especificado
 
     def _extract_pool_data(self):
-        """Extract pool_size and pool_used from the shared allowance container."""
-
-        def gb_to_bytes(gb_value: float) -> int:
-            """Convert GB to bytes."""
-            return int(gb_value * 1024 * 1024 * 1024)
-
-        def extract_gb_value(text: str) -> float:
-            """Extract numeric GB value from text."""
-            match = re.search(r"([\d,]+\.?\d*)\s*GB", text)
-            if match:
-                return float(match.group(1).replace(",", ""))
-            return 0.0
-
-        def extract_used_gb(text: str) -> float:
-            """Extract 'used' GB value from text."""
-            match = re.search(r"([\d,]+\.?\d*)\s*GB\s*used", text, re.IGNORECASE)
-            if match:
-                return float(match.group(1).replace(",", ""))
-            return 0.0
-
-        total_pool_size_gb = 0.0
-        total_pool_used_gb = 0.0
-
+        """Extract pool_size and pool_used from the shared allowance containers."""
         try:
-            # Get all shared allowance containers
+            # Get all shared allowance containers in a single page evaluation
             containers_xpath = "//*[@id='sharedAllowanceAdminContainer']/div[2]"
-            containers = self.browser_wrapper.page.locator(containers_xpath).all()
+            containers = self.browser_wrapper.extract_table(
+                containers_xpath,
+                {
+                    "included": ":scope > div:nth-of-type(1) > span",
+                    "used": ":scope > div:nth-of-type(2) > span:nth-of-type(1)",
+                },
+            )
 
             self.logger.info(f"Found {len(containers)} shared allowance containers")
 
-            for i, container in enumerate(containers):
-                try:
-                    # Extract "Included" value (pool size)
-                    included_span = container.locator("xpath=div[1]/span").first
-                    if included_span.count() > 0:
-                        included_text = included_span.text_content() or ""
-                        included_gb = extract_gb_value(included_text)
-                        total_pool_size_gb += included_gb
-                        self.logger.info(f"Container {i+1} - Included: {included_gb} GB")
-
-                    # Extract "used" value (pool used)
-                    used_span = container.locator("xpath=div[2]/span[1]").first
-                    if used_span.count() > 0:
-                        used_text = used_span.text_content() or ""
-                        used_gb = extract_used_gb(used_text)
-                        total_pool_used_gb += used_gb
-                        self.logger.info(f"Container {i+1} - Used: {used_gb} GB")
-
-                except Exception as e:
-                    self.logger.warning(f"Error extracting data from container {i+1}: {str(e)}")
-                    continue
-
-            # Convert to bytes and set class attributes
-            self.pool_size = gb_to_bytes(total_pool_size_gb)
-            self.pool_used = gb_to_bytes(total_pool_used_gb)
+            # "Included" is the pool size, "X GB used" is the pool used
+            included_bytes = parse_data_amounts([container["included"] for container in containers])
+            used_bytes = parse_data_amounts([container["used"] for container in containers], suffix="used")
+            for i, (included, used) in enumerate(zip(included_bytes, used_bytes)):
+                self.logger.info(f"Container {i+1} - Included: {included / 1024**3} GB, Used: {used / 1024**3} GB")
+
+            self.pool_size = int(included_bytes.sum())
+            self.pool_used = int(used_bytes.sum())
+            total_pool_size_gb = self.pool_size / 1024**3
+            total_pool_used_gb = self.pool_used / 1024**3
 
             self.logger.info(f"Total Pool Size: {total_pool_size_gb} GB ({self.pool_size} bytes)")
             self.logger.info(f"Total Pool Used: {total_pool_used_gb} GB ({self.pool_used} bytes)")
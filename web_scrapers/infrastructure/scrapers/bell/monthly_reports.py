@@ -3,20 +3,62 @@ import os
 import re
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
-from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper, TableColumn
 from web_scrapers.domain.entities.models import BillingCycle, ScraperConfig
 from web_scrapers.domain.entities.scraper_strategies import (
     FileDownloadInfo,
     MonthlyReportsScraperStrategy,
 )
-from web_scrapers.domain.entities.session import Credentials
+from web_scrapers.domain.entities.session import Carrier, Credentials
 from web_scrapers.domain.enums import BellFileSlug
+from web_scrapers.infrastructure.job_phases import collect_max_age_seconds
+from web_scrapers.infrastructure.playwright.selector_registry import SelectorCandidate, selector_registry
+from web_scrapers.infrastructure.readiness_poller import ReadinessPoller
 
 DOWNLOADS_DIR = os.path.abspath("downloads")
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+# Container that holds the report cards in "My Reports"
+REPORTS_CONTAINER_XPATH = "/html/body/div[2]/app-base/section/block-ui/div/div/div/app-workspace/app-ana-page/div[2]/div/div/div/div/div/app-ws-view/div/app-ws-icon-view/app-ws-my-folder/div/div/div/div[2]"
+_LOWERCASE = "translate({}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+# Items of the alerts/notifications panel of Bell Enterprise Centre
+NOTIFICATION_ITEM_XPATH = "//li[contains(@class, 'kt-notifi-li')]"
+
+
+class NotificationEntry(NamedTuple):
+    """A report notification of the alerts panel, as indexed by _index_notifications."""
+
+    slug: str
+    report_name: str  # Lowercase report name (second <b> tag)
+    position: int  # 1-based position in the panel when indexed
+    minutes_ago: int
+
+
+selector_registry.register(
+    Carrier.BELL,
+    "monthly_reports.report_card",
+    [
+        # Description div of the card (case-insensitive)
+        SelectorCandidate(
+            "description",
+            f"{REPORTS_CONTAINER_XPATH}//div[@class='ws-grid__item__description ng-star-inserted' and contains({_LOWERCASE.format('.')}, '{{report_name}}')]",
+        ),
+        # Parent ws-grid__item div by aria-label (case-insensitive)
+        SelectorCandidate(
+            "aria_label",
+            f"{REPORTS_CONTAINER_XPATH}//div[@class and contains(@class, 'ws-grid__item') and contains({_LOWERCASE.format('@aria-label')}, '{{report_name}}')]",
+        ),
+        # Any description div, in case the container path changed
+        SelectorCandidate(
+            "description_anywhere",
+            f"//div[contains(@class, 'ws-grid__item__description') and contains({_LOWERCASE.format('.')}, '{{report_name}}')]",
+        ),
+    ],
+)
+
 
 class BellMonthlyReportsScraperStrategyLegacy(MonthlyReportsScraperStrategy):
     """LEGACY: Monthly reports scraper for Bell (old portal). Deprecated - use BellMonthlyReportsScraperStrategy instead."""
@@ -352,6 +394,42 @@ class BellMonthlyReportsScraperStrategyLegacy(MonthlyReportsScraperStrategy):
 class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
     """Monthly reports scraper for Bell Enterprise Centre"""
 
+    traced_phases = (
+        "_apply_report_filters",
+        "_click_report_by_name",
+        "_export_report_to_excel",
+        "_wait_for_and_download_reports",
+    )
+    supports_two_phase = True
+    # Exports usually reach the alerts panel within a few minutes
+    collect_delay_seconds = 300
+    # Maximum wait, shared by all the reports, for their notifications to show up in the alerts panel
+    notification_timeout_seconds = 180
+
+    # Report configuration
+    REPORTS = [
+        {
+            "name": "cost overview report",
+            "slug": BellFileSlug.COST_OVERVIEW.value,
+            "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
+        },
+        {
+            "name": "usage overview report",
+            "slug": BellFileSlug.USAGE_OVERVIEW.value,
+            "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
+        },
+        {
+            "name": "enhanced user profile report",
+            "slug": BellFileSlug.ENHANCED_USER_PROFILE.value,
+            "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
+        },
+        {
+            "name": "invoice charge report",
+            "slug": BellFileSlug.INVOICE_CHARGE_REPORT.value,
+            "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
+        },
+    ]
+
     def __init__(self, browser_wrapper: BrowserWrapper, job_id: int):
         super().__init__(browser_wrapper, job_id=job_id)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -362,6 +440,8 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             BellFileSlug.USAGE_OVERVIEW.value: None,
             BellFileSlug.INVOICE_CHARGE_REPORT.value: None,
         }
+        # Epoch seconds at which each report was exported (readiness times are measured from it)
+        self.reports_requested_at: Dict[str, float] = {}
 
     def _find_files_section(self, config: ScraperConfig, billing_cycle: BillingCycle) -> Optional[Any]:
         """Navigate to the My Reports section in Bell Enterprise Centre."""
@@ -479,36 +559,20 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                 self.logger.warning(f"Error closing tab during error recovery: {str(close_error)}")
             return None
 
+    def _request_reports(
+        self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
+    ) -> Optional[Dict[str, Any]]:
+        """Generate the reports (exported to alerts asynchronously) and close the reports tab."""
+        generated_reports = self._generate_reports(billing_cycle)
+        self._close_reports_tab()
+        if not generated_reports:
+            raise Exception("No report could be generated")
+        return {"generated_reports": generated_reports}
+
     def _download_files(
         self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
     ) -> List[FileDownloadInfo]:
         """Download files for all 4 reports with account and invoice month filters."""
-        downloaded_files = []
-
-        # Report configuration
-        reports = [
-            {
-                "name": "cost overview report",
-                "slug": BellFileSlug.COST_OVERVIEW.value,
-                "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
-            },
-            {
-                "name": "usage overview report",
-                "slug": BellFileSlug.USAGE_OVERVIEW.value,
-                "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
-            },
-            {
-                "name": "enhanced user profile report",
-                "slug": BellFileSlug.ENHANCED_USER_PROFILE.value,
-                "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
-            },
-            {
-                "name": "invoice charge report",
-                "slug": BellFileSlug.INVOICE_CHARGE_REPORT.value,
-                "workbook_button": "//*[@id='ds-sec-expand']/div[2]/div/div[2]/div/div[12]/button",
-            },
-        ]
-
         # Mapear BillingCycleFiles por slug
         billing_cycle_file_map = {}
         if billing_cycle.billing_cycle_files:
@@ -518,6 +582,38 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                     billing_cycle_file_map[slug] = bcf
                     self.logger.info(f"Mapping BillingCycleFile ID {bcf.id} -> Slug: '{slug}'")
 
+        if self.phase_state:
+            # Collect phase: the reports were generated by a previous run, only pick up the missing ones
+            generated_reports = [
+                slug
+                for slug in self.phase_state.request_data.get("generated_reports", [])
+                if slug in billing_cycle_file_map
+            ]
+            # Notifications since the request, capped at the age after which the request is discarded
+            elapsed_minutes = int(self.phase_state.age_seconds // 60)
+            max_age_minutes = min(max(60, elapsed_minutes + 10), max(60, int(collect_max_age_seconds() // 60)))
+        else:
+            generated_reports = self._generate_reports(billing_cycle)
+            max_age_minutes = 60
+
+        # Step 8: Download files from alerts/notifications
+        self.logger.info("Downloading generated reports from alerts...")
+        downloaded_files = self._wait_for_and_download_reports(
+            generated_reports, billing_cycle_file_map, max_age_minutes=max_age_minutes
+        )
+        self.logger.info(f"Downloaded {len(downloaded_files)} files from alerts")
+
+        # Step 9: Close the new tab and return to the original tab
+        self._close_reports_tab()
+
+        return downloaded_files
+
+    def _generate_reports(self, billing_cycle: BillingCycle) -> List[str]:
+        """Generate each report with account and invoice month filters and export it to Excel.
+
+        Returns:
+            Slugs of the reports whose export was requested (they show up in alerts when ready)
+        """
         # Calculate invoice month from billing cycle
         invoice_month = self._calculate_invoice_month(billing_cycle)
         self.logger.info(f"Invoice month for filters: {invoice_month}")
@@ -528,7 +624,9 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
         # Generate each report
         generated_reports = []
-        for report_config in reports:
+        for report_config in self.REPORTS:
+            if self._is_checkpointed(report_config["slug"]):
+                continue
             try:
                 self.logger.info(f"Processing report: {report_config['name']}")
 
@@ -559,6 +657,7 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
                 # Step 6: Export to Excel
                 self._export_report_to_excel(report_config["slug"])
+                self.reports_requested_at[report_config["slug"]] = time.time()
 
                 generated_reports.append(report_config["slug"])
                 self.logger.info(f"Report '{report_config['name']}' generation completed")
@@ -574,13 +673,10 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                 continue
 
         self.logger.info(f"All reports generated. Order: {generated_reports}")
+        return generated_reports
 
-        # Step 8: Download files from alerts/notifications
-        self.logger.info("Downloading generated reports from alerts...")
-        downloaded_files = self._wait_for_and_download_reports(generated_reports, billing_cycle_file_map)
-        self.logger.info(f"Downloaded {len(downloaded_files)} files from alerts")
-
-        # Step 9: Close the new tab and return to the original tab
+    def _close_reports_tab(self) -> None:
+        """Close the Enhanced Mobility Reports tab and return to the original tab."""
         try:
             if self.browser_wrapper.get_tab_count() > 1:
                 self.logger.info("Closing Enhanced Mobility Reports tab...")
@@ -592,67 +688,32 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
         except Exception as e:
             self.logger.warning(f"Error closing tab: {str(e)}")
 
-        return downloaded_files
-
     def _click_report_by_name(self, report_name: str) -> None:
-        """Click on a report by searching for the description div containing the report name.
+        """Click on a report by searching for the card whose description or aria-label contains the report name.
 
-        Uses a focused search from the main container to find the report cards.
+        Both report card selectors are probed together (last successful one first), so a markup change
+        does not cost a full timeout before the alternative is tried.
         Handles case-insensitive matching for report names.
         """
-        try:
-            self.logger.info(f"Searching for report: '{report_name}'...")
-            self.logger.info("Waiting 15 seconds for reports to fully load...")
-            time.sleep(15)
-
-            # Main container XPath that holds all report cards
-            container_xpath = "/html/body/div[2]/app-base/section/block-ui/div/div/div/app-workspace/app-ana-page/div[2]/div/div/div/div/div/app-ws-view/div/app-ws-icon-view/app-ws-my-folder/div/div/div/div[2]"
-
-            # Wait for container to be visible
-            self.logger.debug(f"Waiting for report container to be visible...")
-            self.browser_wrapper.wait_for_element(container_xpath, timeout=10000)
-            time.sleep(1)
-            self.logger.debug("Report container found")
-
-            # Search for the description div within the container using case-insensitive matching
-            # The text in HTML has proper case, so we need to match case-insensitively
-            report_xpath = f"{container_xpath}//div[@class='ws-grid__item__description ng-star-inserted' and contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), translate('{report_name.lower()}', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'))]"
-            self.logger.debug(f"Searching for report within container (case-insensitive): {report_name}")
-
-            # Wait for the specific report to appear
-            self.browser_wrapper.wait_for_element(report_xpath, timeout=10000)
-            time.sleep(1)
-
-            self.logger.info(f"Report '{report_name}' found, clicking it...")
-            self.browser_wrapper.click_element(report_xpath)
-            time.sleep(2)
-
-            self.logger.info(f"Report '{report_name}' found and clicked successfully")
-
-        except Exception as e:
-            self.logger.error(f"Error clicking report '{report_name}': {str(e)}")
-            # Try alternative approach: search for the parent ws-grid__item div by aria-label
-            try:
-                self.logger.info(f"Trying alternative search for report '{report_name}'...")
-
-                container_xpath = "/html/body/div[2]/app-base/section/block-ui/div/div/div/app-workspace/app-ana-page/div[2]/div/div/div/div/div/app-ws-view/div/app-ws-icon-view/app-ws-my-folder/div/div/div/div[2]"
-
-                # Search for the parent item div by aria-label (case-insensitive)
-                alt_report_xpath = f"{container_xpath}//div[@class and contains(@class, 'ws-grid__item') and contains(translate(@aria-label, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), translate('{report_name.lower()}', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'))]"
-                self.logger.debug(
-                    f"Alternative XPath: searching for parent container with aria-label (case-insensitive)"
-                )
-
-                self.browser_wrapper.wait_for_element(alt_report_xpath, timeout=10000)
-                time.sleep(1)
-                self.browser_wrapper.click_element(alt_report_xpath)
-                time.sleep(2)
+        self.logger.info(f"Searching for report: '{report_name}'...")
+
+        # Reports can take a while to render after the filters are applied
+        report_selector = selector_registry.resolve(
+            self.browser_wrapper,
+            Carrier.BELL,
+            "monthly_reports.report_card",
+            timeout=35000,
+            report_name=report_name.lower(),
+        )
+        if report_selector is None:
+            raise Exception(f"Report '{report_name}' not found in My Reports")
 
-                self.logger.info(f"Report '{report_name}' found via alternative method and clicked successfully")
+        time.sleep(1)
+        self.logger.info(f"Report '{report_name}' found ({report_selector.name}), clicking it...")
+        self.browser_wrapper.click_element(report_selector.selector, selector_type=report_selector.selector_type)
+        time.sleep(2)
 
-            except Exception as e2:
-                self.logger.error(f"Alternative search also failed: {str(e2)}")
-                raise e
+        self.logger.info(f"Report '{report_name}' found and clicked successfully")
 
     def _calculate_invoice_month(self, billing_cycle: BillingCycle) -> str:
         """Calculate the invoice month string from billing cycle end date.
@@ -712,48 +773,6 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
         self.logger.warning(f"Could not parse time text: '{time_text}'")
         return None
 
-    def _is_notification_recent(self, notification_xpath: str, max_minutes: int = 60) -> bool:
-        """
-        Check if notification was generated within the last N minutes.
-
-        Args:
-            notification_xpath: XPath of the notification <li>
-            max_minutes: Maximum age in minutes (default: 60)
-
-        Returns:
-            True if notification is recent enough, False otherwise
-        """
-        try:
-            # Find the time element within this notification
-            time_xpath = f"{notification_xpath}//div[contains(@class, 'kt-notifi-time')]"
-
-            time_element = self.browser_wrapper.find_element_by_xpath(time_xpath, timeout=3000)
-            if not time_element:
-                self.logger.warning("Time element not found in notification")
-                return False
-
-            time_text = self.browser_wrapper.get_text(time_xpath)
-            self.logger.debug(f"Notification time text: '{time_text}'")
-
-            minutes_ago = self._parse_notification_time(time_text)
-
-            if minutes_ago is None:
-                self.logger.warning(f"Could not parse time, rejecting notification: '{time_text}'")
-                return False
-
-            is_recent = minutes_ago <= max_minutes
-
-            if is_recent:
-                self.logger.info(f"Notification is recent: {minutes_ago} minutes ago (max: {max_minutes})")
-            else:
-                self.logger.warning(f"Notification is too old: {minutes_ago} minutes ago (max: {max_minutes})")
-
-            return is_recent
-
-        except Exception as e:
-            self.logger.error(f"Error checking notification time: {e}")
-            return False
-
     def _create_report_name_mappings(self) -> Dict[str, List[str]]:
         """Map slugs to expected notification text (from second <b> tag)."""
         return {
@@ -763,58 +782,85 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             BellFileSlug.INVOICE_CHARGE_REPORT.value: ["invoice charge report"],
         }
 
-    def _find_notification_by_report_slug(self, report_slug: str, max_age_minutes: int = 60) -> Optional[str]:
+    def _read_notifications(self) -> List[Dict[str, Any]]:
+        """Read every notification of the alerts panel (bold texts and time) in a single page evaluation."""
+        return self.browser_wrapper.extract_table(
+            NOTIFICATION_ITEM_XPATH,
+            {"bold": TableColumn("span.ng-star-inserted > b", all=True), "time": "div.kt-notifi-time"},
+        )
+
+    def _index_notifications(
+        self, rows: List[Dict[str, Any]], max_age_minutes: int = 60
+    ) -> Dict[str, NotificationEntry]:
         """
-        Find notification by matching the SECOND <b> tag and validating timestamp.
+        Index the notifications by report slug, keeping the most recent one of each report.
+
+        The report is identified by the SECOND <b> tag of the notification:
+        <span class="ng-star-inserted"><b>Costoverview</b> from <b>Cost overview report</b></span>
 
         Args:
-            report_slug: Slug of the report to find
+            rows: Notifications read with _read_notifications, in panel order
             max_age_minutes: Maximum age of notification in minutes
 
         Returns:
-            XPath of the notification if found and recent, None otherwise
+            Report slug -> most recent notification no older than max_age_minutes
         """
-        name_mappings = self._create_report_name_mappings()
-        possible_names = name_mappings.get(report_slug, [])
-
-        if not possible_names:
-            self.logger.warning(f"No name mappings for slug '{report_slug}'")
-            return None
-
-        for report_name in possible_names:
-            try:
-                # XPath: Find <li> containing a <span> with SECOND <b> matching report name
-                # Structure:
-                # <span class="ng-star-inserted">
-                #   <b>Costoverview</b> from <b>Cost overview report</b>
-                # </span>
-                notification_xpath = (
-                    f"//li[contains(@class, 'kt-notifi-li')]"
-                    f"[.//span[@class='ng-star-inserted']"
-                    f"/b[2][translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz') = "
-                    f"'{report_name.lower()}']]"
-                )
-
-                # Check if notification exists
-                if not self.browser_wrapper.find_element_by_xpath(notification_xpath, timeout=3000):
-                    self.logger.debug(f"Notification not found for text '{report_name}'")
-                    continue
+        slug_by_name = {name: slug for slug, names in self._create_report_name_mappings().items() for name in names}
+        index: Dict[str, NotificationEntry] = {}
+        for position, row in enumerate(rows, 1):
+            bold_texts = row.get("bold") or []
+            if len(bold_texts) < 2:
+                continue
+            report_name = " ".join(bold_texts[1].split()).lower()
+            slug = slug_by_name.get(report_name)
+            if not slug:
+                continue
 
-                self.logger.info(f"Found notification for '{report_slug}' using text '{report_name}'")
+            minutes_ago = self._parse_notification_time(row.get("time") or "")
+            if minutes_ago is None or minutes_ago > max_age_minutes:
+                self.logger.debug(f"Notification {position} for '{slug}' is too old or has no valid time")
+                continue
 
-                # Validate timestamp
-                if not self._is_notification_recent(notification_xpath, max_age_minutes):
-                    self.logger.warning(f"Notification for '{report_slug}' is too old, skipping")
-                    continue
+            current = index.get(slug)
+            if current is None or minutes_ago < current.minutes_ago:
+                index[slug] = NotificationEntry(slug, report_name, position, minutes_ago)
+        return index
+
+    def _notification_xpath(self, entry: NotificationEntry) -> str:
+        """XPath of an indexed notification: its position, guarded by the report name it had when indexed."""
+        return (
+            f"({NOTIFICATION_ITEM_XPATH})[{entry.position}]"
+            "[.//span[contains(concat(' ', normalize-space(@class), ' '), ' ng-star-inserted ')]"
+            f"/b[2][{_LOWERCASE.format('normalize-space(.)')} = '{entry.report_name}']]"
+        )
 
-                # Found and validated!
-                return notification_xpath
+    def _download_notification(
+        self, entry: NotificationEntry, index: Dict[str, NotificationEntry], max_age_minutes: int
+    ) -> Optional[str]:
+        """
+        Click the download icon of an indexed notification.
 
-            except Exception as e:
-                self.logger.debug(f"Error searching for '{report_name}': {e}")
-                continue
+        New notifications shift the positions of the panel; if the indexed position no longer
+        holds the report, the panel is indexed again once and the new position is used.
 
-        self.logger.warning(f"No valid recent notification found for '{report_slug}'")
+        Returns:
+            Path of the downloaded file, or None if it could not be downloaded
+        """
+        for attempt in range(2):
+            download_icon_xpath = f"{self._notification_xpath(entry)}//em[contains(@class, 'line-download')]"
+            if self.browser_wrapper.find_element_by_xpath(download_icon_xpath, timeout=3000):
+                return self.browser_wrapper.expect_download_and_click(
+                    download_icon_xpath, timeout=30000, downloads_dir=self.job_downloads_dir
+                )
+            if attempt == 0:
+                self.logger.info(f"Notification for '{entry.slug}' moved, indexing the panel again...")
+                index.clear()
+                index.update(self._index_notifications(self._read_notifications(), max_age_minutes))
+                if entry.slug not in index:
+                    break
+                entry = index[entry.slug]
+
+        self.logger.warning(f"Download icon not found for '{entry.slug}'")
         return None
 
     def _click_apply_filters_if_needed(self, context: str) -> None:
@@ -1187,16 +1233,20 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             self.logger.error(f"Error exporting report: {str(e)}")
 
     def _wait_for_and_download_reports(
-        self, generated_reports: List[str], billing_cycle_file_map: dict
+        self, generated_reports: List[str], billing_cycle_file_map: dict, max_age_minutes: int = 60
     ) -> List[FileDownloadInfo]:
         """Wait for reports to appear in alerts/notifications and download them by matching text content.
 
         Uses intelligent notification matching by report name (second <b> tag) and timestamp validation.
+        Notifications not published yet are polled (see ReadinessPoller) for up to
+        notification_timeout_seconds in total; in the collect phase of a two-phase job they are
+        checked once, since the job is rescheduled if reports are missing.
         Continues processing even if individual reports fail to download.
 
         Args:
             generated_reports: List of report slugs that were successfully generated
             billing_cycle_file_map: Mapping of report slug to BillingCycleFile object
+            max_age_minutes: Maximum age of the notifications (older ones belong to previous exports)
 
         Returns:
             List of FileDownloadInfo objects for successfully downloaded files
@@ -1220,37 +1270,47 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             time.sleep(2)
             self.logger.debug("Notifications list found")
 
-            # Step 3: Count available notifications
-            notification_items = self.browser_wrapper.page.locator("//li[contains(@class, 'kt-notifi-li')]")
-            total_notifications = notification_items.count()
+            # Step 3: Index the notifications panel (single page evaluation)
+            index = self._index_notifications(self._read_notifications(), max_age_minutes)
             self.logger.info(
-                f"Generated reports: {len(generated_reports)}, Available notifications: {total_notifications}"
+                f"Generated reports: {len(generated_reports)}, Recent report notifications: {sorted(index)}"
             )
 
-            # Step 4: Download each report by identifying it by text content (NOT position)
-            for report_slug in generated_reports:
+            # Step 4: Download the reports already published back to back, then poll for the rest;
+            # every poll round re-reads the panel once and refreshes the whole index
+            timeout = 0 if self.phase_state else self.notification_timeout_seconds
+            deadline = time.time() + timeout
+            ready_first = sorted(generated_reports, key=lambda slug: slug not in index)
+            for report_slug in ready_first:
                 try:
-                    self.logger.info(f"Searching for notification: '{report_slug}'...")
-
-                    # Find notification by text content and validate timestamp (max 60 minutes old)
-                    notification_xpath = self._find_notification_by_report_slug(report_slug, max_age_minutes=60)
+                    entry = index.get(report_slug)
+                    if entry is None:
+                        self.logger.info(f"Waiting for notification: '{report_slug}'...")
+
+                        def indexed_entry(rows: List[Dict[str, Any]]) -> Optional[NotificationEntry]:
+                            index.clear()
+                            index.update(self._index_notifications(rows, max_age_minutes))
+                            return index.get(report_slug)
+
+                        poller = ReadinessPoller(
+                            Carrier.BELL,
+                            report_slug,
+                            timeout=max(0.0, deadline - time.time()),
+                            learn=report_slug in self.reports_requested_at,
+                        )
+                        entry = poller.poll(
+                            indexed_entry,
+                            snapshot=self._read_notifications,
+                            since=self.reports_requested_at.get(report_slug),
+                        )
 
-                    if not notification_xpath:
+                    if entry is None:
                         self.logger.warning(f"Skipping '{report_slug}' - notification not found or too old")
                         continue
 
-                    # Find download icon within this specific notification
-                    download_icon_xpath = f"{notification_xpath}//em[contains(@class, 'line-download')]"
-
-                    # Wait for download icon
-                    self.browser_wrapper.wait_for_element(download_icon_xpath, timeout=10000)
-                    time.sleep(1)
-
                     # Download the file
-                    self.logger.info(f"Downloading '{report_slug}'...")
-                    downloaded_file_path = self.browser_wrapper.expect_download_and_click(
-                        download_icon_xpath, timeout=30000, downloads_dir=self.job_downloads_dir
-                    )
+                    self.logger.info(f"Downloading '{report_slug}' ({entry.minutes_ago} minutes ago)...")
+                    downloaded_file_path = self._download_notification(entry, index, max_age_minutes)
 
                     if downloaded_file_path:
                         actual_file_name = os.path.basename(downloaded_file_path)
@@ -1280,7 +1340,7 @@ class BellMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                     else:
                         self.logger.error(f"Download failed for '{report_slug}' - no file path returned")
 
-                    time.sleep(3)
+                    time.sleep(1)
 
                 except Exception as e:
                     self.logger.error(f"Error downloading '{report_slug}': {str(e)}")
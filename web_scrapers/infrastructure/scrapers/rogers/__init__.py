@@ -1,9 +1,18 @@
-from web_scrapers.infrastructure.scrapers.rogers.daily_usage import RogersDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.rogers.monthly_reports import RogersMonthlyReportsScraperStrategy
-from web_scrapers.infrastructure.scrapers.rogers.pdf_invoice import RogersPDFInvoiceScraperStrategy
-
-__all__ = [
-    "RogersMonthlyReportsScraperStrategy",
-    "RogersDailyUsageScraperStrategy",
-    "RogersPDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.rogers.daily_usage import RogersDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.rogers.monthly_reports import RogersMonthlyReportsScraperStrategy
+    from web_scrapers.infrastructure.scrapers.rogers.pdf_invoice import RogersPDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "RogersMonthlyReportsScraperStrategy": "monthly_reports",
+    "RogersDailyUsageScraperStrategy": "daily_usage",
+    "RogersPDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
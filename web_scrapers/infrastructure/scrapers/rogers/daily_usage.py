@@ -7,16 +7,20 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
-from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from shared.infrastructure.normalization import digits_only, parse_data_amounts
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper, TableColumn
 from web_scrapers.domain.entities.models import BillingCycle, ScraperConfig
 from web_scrapers.domain.entities.scraper_strategies import (
     DailyUsageScraperStrategy,
     FileDownloadInfo,
 )
+from web_scrapers.infrastructure.spreadsheet_writer import StreamingSheetWriter
 
 DOWNLOADS_DIR = os.path.abspath("downloads")
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+USAGE_COLUMNS = ["mobile_username", "mobile_number", "data_used"]
+
 
 class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
     """Scraper de uso diario para Rogers.
@@ -31,7 +35,7 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
     7. Select all pages of users
     8. Click View Data Usage
     9. Extract all user data from paginated table
-    10. Generate Excel file with extracted data
+    10. Stream the extracted data to an Excel file (page by page)
     """
 
     def __init__(self, browser_wrapper: BrowserWrapper, job_id: int):
@@ -70,10 +74,6 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
         """Normalizes account number by removing dashes, spaces and other characters."""
         return re.sub(r"[^0-9]", "", account)
 
-    def _normalize_phone_number(self, phone: str) -> str:
-        """Normalizes phone number by removing dashes, spaces and other characters."""
-        return re.sub(r"[^0-9]", "", phone)
-
     # ==================== MAIN SCRAPER METHODS ====================
 
     def _find_files_section(self, config: ScraperConfig, billing_cycle: BillingCycle) -> Optional[Any]:
@@ -141,36 +141,35 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
                 self._reset_to_main_screen()
                 return downloaded_files
 
-            # Step 9: Extract all user data from paginated table
-            user_data = self._extract_all_user_data()
+            # Step 9 + 10: Extract all user data from paginated table, streaming it to the Excel file
+            writer = self._open_usage_writer()
+            with writer:
+                user_count = self._extract_all_user_data(writer)
 
-            if not user_data:
+            if not user_count:
                 self.logger.error("No user data extracted")
+                writer.discard()
                 self._reset_to_main_screen()
                 return downloaded_files
 
-            self.logger.info(f"Extracted {len(user_data)} users")
-
-            # Step 10: Generate Excel file
-            file_path = self._generate_excel(user_data)
-
-            if file_path:
-                actual_filename = os.path.basename(file_path)
-                self.logger.info(f"Excel generated: {actual_filename}")
-
-                file_info = FileDownloadInfo(
-                    file_id=daily_usage_file.id if daily_usage_file else 0,
-                    file_name=actual_filename,
-                    download_url="N/A",
-                    file_path=file_path,
-                    daily_usage_file=daily_usage_file,
+            self.logger.info(f"Extracted {user_count} users")
+            file_path = writer.file_path
+            actual_filename = os.path.basename(file_path)
+            self.logger.info(f"Excel generated: {actual_filename}")
+
+            file_info = FileDownloadInfo(
+                file_id=daily_usage_file.id if daily_usage_file else 0,
+                file_name=actual_filename,
+                download_url="N/A",
+                file_path=file_path,
+                daily_usage_file=daily_usage_file,
+            )
+            downloaded_files.append(file_info)
+
+            if daily_usage_file:
+                self.logger.info(
+                    f"MAPPING CONFIRMED: {actual_filename} -> BillingCycleDailyUsageFile ID {daily_usage_file.id}"
                 )
-                downloaded_files.append(file_info)
-
-                if daily_usage_file:
-                    self.logger.info(
-                        f"MAPPING CONFIRMED: {actual_filename} -> BillingCycleDailyUsageFile ID {daily_usage_file.id}"
-                    )
 
             self._reset_to_main_screen()
 
@@ -455,10 +454,8 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
             self.logger.error(f"Error clicking View Data Usage: {str(e)}")
             return False
 
-    def _extract_all_user_data(self) -> List[Dict[str, Any]]:
-        """Extracts all user data from paginated table."""
-        all_users = []
-
+    def _extract_all_user_data(self, writer: StreamingSheetWriter) -> int:
+        """Extracts all user data from paginated table, appending each page to the writer. Returns rows written."""
         try:
             self.logger.info("Extracting user data from table...")
             page = self.browser_wrapper.page
@@ -470,7 +467,7 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
 
                 # Extract data from current page
                 users_on_page = self._extract_users_from_current_page()
-                all_users.extend(users_on_page)
+                writer.append_rows(users_on_page)
                 self.logger.info(f"Extracted {len(users_on_page)} users from page {page_count}")
 
                 # Check pagination
@@ -492,19 +489,18 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
                 else:
                     break
 
-            self.logger.info(f"Total users extracted: {len(all_users)}")
-            return all_users
+            self.logger.info(f"Total users extracted: {writer.row_count}")
+            return writer.row_count
 
         except Exception as e:
             self.logger.error(f"Error extracting user data: {str(e)}")
-            return all_users
+            return writer.row_count
 
     def _extract_users_from_current_page(self) -> List[Dict[str, Any]]:
-        """Extracts user data from the current page's table."""
+        """Extracts user data from the current page's table (all rows in a single page evaluation)."""
         users = []
 
         try:
-            page = self.browser_wrapper.page
             table_xpath = '//*[@id="dunsAccountsListTableId"]'
 
             if not self.browser_wrapper.is_element_visible(table_xpath, timeout=5000):
@@ -512,52 +508,29 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
                 return users
 
             # Get all data rows (skip header rows - those with class extract-table-body in first td)
-            rows = page.locator(f"xpath={table_xpath}//tbody//tr[contains(@class, 'odd') or contains(@class, 'even')]")
-            row_count = rows.count()
-
-            for i in range(row_count):
-                try:
-                    row = rows.nth(i)
-
-                    # Skip header/subheader rows
-                    first_td = row.locator("td").first
-                    if first_td.count() > 0:
-                        first_td_class = first_td.get_attribute("class") or ""
-                        if "extract-table-body" in first_td_class:
-                            continue
-
-                    # Extract Mobile User Name (first td)
-                    name_td = row.locator("td").nth(0)
-                    mobile_username = (name_td.text_content() or "").strip()
-
-                    # Extract Mobile Number (second td)
-                    number_td = row.locator("td").nth(1)
-                    mobile_number_raw = (number_td.text_content() or "").strip()
-                    mobile_number = self._normalize_phone_number(mobile_number_raw)
-
-                    if not mobile_number:
-                        continue
-
-                    # Extract Real-time Usage from span with id spanUsage_{phone}
-                    data_used = 0
-                    usage_span_id = f"spanUsage_{mobile_number}"
-                    usage_div = row.locator(
-                        f"xpath=.//span[@id='{usage_span_id}']//div[contains(@style, 'position: absolute')]"
-                    )
-
-                    if usage_div.count() > 0:
-                        usage_text = (usage_div.first.text_content() or "").strip()
-                        data_used = self._parse_gb_to_bytes(usage_text)
-
-                    users.append({
-                        "mobile_username": mobile_username,
-                        "mobile_number": mobile_number,
-                        "data_used": data_used,
-                    })
-
-                except Exception as row_error:
-                    self.logger.warning(f"Error extracting row {i}: {str(row_error)}")
-                    continue
+            rows = self.browser_wrapper.extract_table(
+                f"{table_xpath}//tbody//tr[contains(@class, 'odd') or contains(@class, 'even')]",
+                {
+                    "first_td_class": TableColumn("td", attribute="class"),
+                    "mobile_username": "td:nth-of-type(1)",
+                    "mobile_number": "td:nth-of-type(2)",
+                    # Real-time Usage from span with id spanUsage_{phone}
+                    "usage": "span[id^='spanUsage_'] div[style*='position: absolute']",
+                },
+            )
+
+            if not rows:
+                return users
+
+            # Normalize the whole page at once (phone digits, GB to bytes)
+            table = pd.DataFrame(rows)
+            table = table[~table["first_td_class"].fillna("").str.contains("extract-table-body", regex=False)]
+            table["mobile_number"] = digits_only(table["mobile_number"])
+            table = table[table["mobile_number"] != ""]
+            table["mobile_username"] = table["mobile_username"].fillna("")
+            table["data_used"] = parse_data_amounts(table["usage"]).to_numpy()
+
+            users = table[USAGE_COLUMNS].to_dict("records")
 
         except Exception as e:
             self.logger.error(f"Error extracting users from page: {str(e)}")
@@ -566,31 +539,13 @@ class RogersDailyUsageScraperStrategy(DailyUsageScraperStrategy):
 
     # ==================== FILE GENERATION ====================
 
-    def _generate_excel(self, user_data: List[Dict[str, Any]]) -> Optional[str]:
-        """Generates Excel file with user data."""
-        try:
-            self.logger.info("Generating Excel file...")
-
-            # Create DataFrame
-            df = pd.DataFrame(user_data)
-
-            # Ensure correct column order
-            df = df[["mobile_username", "mobile_number", "data_used"]]
-
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"rogers_daily_usage_{timestamp}.xlsx"
-            file_path = os.path.join(self.job_downloads_dir, filename)
-
-            # Save to Excel
-            df.to_excel(file_path, index=False, engine="openpyxl")
-
-            self.logger.info(f"Excel saved: {file_path}")
-            return file_path
-
-        except Exception as e:
-            self.logger.error(f"Error generating Excel: {str(e)}")
-            return None
+    def _open_usage_writer(self) -> StreamingSheetWriter:
+        """Opens the Excel file the user data is streamed to while pages are extracted."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"rogers_daily_usage_{timestamp}.xlsx"
+        file_path = os.path.join(self.job_downloads_dir, filename)
+        self.logger.info(f"Streaming user data to {file_path}")
+        return StreamingSheetWriter(file_path, USAGE_COLUMNS)
 
     # ==================== RESET ====================
 
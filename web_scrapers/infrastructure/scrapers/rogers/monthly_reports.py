@@ -82,6 +82,8 @@ class RogersMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
             total_reports = len(ROGERS_REPORTS_CONFIG)
             for idx, (category_text, report_type_text, slug) in enumerate(ROGERS_REPORTS_CONFIG, 1):
+                if self._is_checkpointed(slug):
+                    continue
                 self.logger.info(f"=== DOWNLOADING REPORT {idx}/{total_reports}: {slug} ===")
                 self.logger.info(f"Category: {category_text}")
                 self.logger.info(f"Report Type: {report_type_text}")
@@ -1,9 +1,18 @@
-from web_scrapers.infrastructure.scrapers.telus.daily_usage import TelusDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.telus.monthly_reports import TelusMonthlyReportsScraperStrategy
-from web_scrapers.infrastructure.scrapers.telus.pdf_invoice import TelusPDFInvoiceScraperStrategy
-
-__all__ = [
-    "TelusMonthlyReportsScraperStrategy",
-    "TelusDailyUsageScraperStrategy",
-    "TelusPDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.telus.daily_usage import TelusDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.telus.monthly_reports import TelusMonthlyReportsScraperStrategy
+    from web_scrapers.infrastructure.scrapers.telus.pdf_invoice import TelusPDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "TelusMonthlyReportsScraperStrategy": "monthly_reports",
+    "TelusDailyUsageScraperStrategy": "daily_usage",
+    "TelusPDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
@@ -11,10 +11,15 @@ from web_scrapers.domain.entities.scraper_strategies import (
     DailyUsageScraperStrategy,
     FileDownloadInfo,
 )
+from web_scrapers.infrastructure.readiness_poller import ReadinessPoller
 
 DOWNLOADS_DIR = os.path.abspath("downloads")
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+# Columns of the results table read by _read_results_table: (key, 1-based column, cell text selector)
+# The Status cell is read whole ("Download" / "In Queue" link)
+RESULTS_TABLE_COLUMNS = (("names", 2, "span"), ("statuses", 3, ""), ("bans", 5, "span"), ("dates", 8, "span"))
+
 
 class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
     """Daily usage scraper for Telus.
@@ -25,6 +30,9 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
     3. Generates and downloads the Daily Usage Report
     """
 
+    # Maximum wait for the exported report to show up as ready in the results table
+    report_ready_timeout_seconds = 900
+
     def __init__(self, browser_wrapper: BrowserWrapper, job_id: int):
         super().__init__(browser_wrapper, job_id=job_id)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -87,9 +95,6 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
             self.logger.info("Waiting 30 seconds for Telus IQ to load...")
             time.sleep(30)
 
-            # 8. Handle Bill Analyzer modal if it appears
-            self._dismiss_bill_analyzer_modal()
-
             # 9. Click on Manage tab
             manage_tab_xpath = '//*[@id="site-header__root"]/div[1]/div/div/div/div/ul[1]/li[2]/a'
             self.logger.info("Clicking on Manage tab...")
@@ -298,26 +303,6 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
             self.logger.error(f"Error parsing '{value_text}' to bytes: {str(e)}")
             return None
 
-    def _dismiss_bill_analyzer_modal(self) -> bool:
-        """Detects and closes Bill Analyzer modal if it appears."""
-        try:
-            # Search for "don't show again" button in Bill Analyzer modal
-            dont_show_again_xpath = "/html/body/div[1]/html/body/div/div/div/div[2]/div/div[2]/div[2]/div[1]/div/div/div[3]/div/div[2]/p/div/a"
-
-            if self.browser_wrapper.find_element_by_xpath(dont_show_again_xpath, timeout=5000):
-                self.logger.info("Bill Analyzer modal detected, closing...")
-                self.browser_wrapper.click_element(dont_show_again_xpath)
-                time.sleep(2)
-                self.logger.info("Bill Analyzer modal closed")
-                return True
-            else:
-                self.logger.info("Bill Analyzer modal not detected, continuing...")
-                return True
-
-        except Exception as e:
-            self.logger.warning(f"Error handling Bill Analyzer modal: {str(e)}")
-            return True  # Continue anyway
-
     def _configure_advanced_search(self, billing_cycle: BillingCycle) -> bool:
         """Configures advanced search with account BAN."""
         try:
@@ -431,13 +416,14 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
             continue_button_xpath = '//*[@id="confirmation__dialog1"]/div/div[2]/a[2]'
             self.logger.info("Clicking on Continue button...")
             self.browser_wrapper.click_element(continue_button_xpath)
-            self.logger.info("Waiting 3 minutes for report generation...")
-            time.sleep(180)
+            requested_at = time.time()
 
             # 5. Monitor results table and download
             # Pass account number to validate BAN in table
             target_account = billing_cycle.account.number
-            download_info = self._monitor_results_table_and_download(report_name, daily_usage_file, target_account)
+            download_info = self._monitor_results_table_and_download(
+                report_name, daily_usage_file, target_account, requested_at=requested_at
+            )
 
             if download_info:
                 downloaded_files.append(download_info)
@@ -459,105 +445,114 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
             return downloaded_files
 
     def _monitor_results_table_and_download(
-        self, report_name: str, daily_usage_file, target_account: str
+        self, report_name: str, daily_usage_file, target_account: str, requested_at: Optional[float] = None
     ) -> Optional[FileDownloadInfo]:
         """Monitors results table and downloads when ready.
 
+        The table is polled on an adaptive schedule (see ReadinessPoller): the first check
+        happens shortly before the report is usually ready, and the row lookup only runs
+        again when the table content changed.
+
         Args:
             report_name: Report name to search for
             daily_usage_file: Daily usage file for mapping
             target_account: Account number (BAN) to validate
+            requested_at: Epoch seconds when the export was requested
         """
-        max_attempts = 2  # Maximum 2 attempts (3 min + 3 min = 6 min total)
-        attempt = 0
+        dynamic_table_xpath = '//*[@id="dynamicTable"]'
 
-        while attempt < max_attempts:
-            try:
-                attempt += 1
-                self.logger.info(f"Attempt {attempt}/{max_attempts} - Checking results table...")
-
-                # Check if dynamic table exists
-                dynamic_table_xpath = '//*[@id="dynamicTable"]'
-
-                if not self.browser_wrapper.find_element_by_xpath(dynamic_table_xpath, timeout=10000):
-                    self.logger.info("Dynamic table not found, waiting 3 more minutes...")
-                    time.sleep(180)
-                    continue
+        def read_table() -> Optional[Dict[str, List[Optional[str]]]]:
+            if not self.browser_wrapper.find_element_by_xpath(dynamic_table_xpath, timeout=10000):
+                return None
+            return self._read_results_table()
 
-                self.logger.info("Dynamic table found")
+        def ready_download_link(table: Optional[Dict[str, List[Optional[str]]]]) -> Optional[str]:
+            try:
+                if table is None:
+                    self.logger.info("Dynamic table not found")
+                    return None
 
                 # Find correct row: name + BAN + most recent date
-                report_row = self._find_best_report_row(report_name, target_account)
-
+                report_row = self._find_best_report_row(report_name, target_account, table=table)
                 if not report_row:
-                    self.logger.info(
-                        f"Report '{report_name}' with BAN '{target_account}' not found, waiting 3 more minutes..."
-                    )
-                    time.sleep(180)
-                    continue
+                    self.logger.info(f"Report '{report_name}' with BAN '{target_account}' not found")
+                    return None
 
                 self.logger.info(f"Report '{report_name}' found in row {report_row}")
 
                 # Check status (column 3 - Status)
                 download_link = self._get_download_link_for_report(report_row)
-
-                if download_link:
-                    link_text = self.browser_wrapper.get_text(download_link)
-                    self.logger.info(f"Report status: {link_text}")
-
-                    if "Download" in link_text:
-                        self.logger.info("Report ready for download!")
-
-                        # Download file
-                        downloaded_file_path = self.browser_wrapper.expect_download_and_click(
-                            download_link, timeout=60000, downloads_dir=self.job_downloads_dir
-                        )
-
-                        if downloaded_file_path:
-                            actual_filename = os.path.basename(downloaded_file_path)
-                            self.logger.info(f"File downloaded: {actual_filename}")
-
-                            file_info = FileDownloadInfo(
-                                file_id=daily_usage_file.id if daily_usage_file else 1,
-                                file_name=actual_filename,
-                                download_url="N/A",
-                                file_path=downloaded_file_path,
-                                daily_usage_file=daily_usage_file,
-                            )
-
-                            if daily_usage_file:
-                                self.logger.info(
-                                    f"MAPPING CONFIRMED: {actual_filename} -> BillingCycleDailyUsageFile ID {daily_usage_file.id}"
-                                )
-
-                            return file_info
-                        else:
-                            self.logger.error("Error downloading file")
-                            return None
-
-                    elif "In Queue" in link_text or "queue" in link_text.lower():
-                        self.logger.info("Report in queue, waiting 3 more minutes...")
-                        time.sleep(180)
-                        continue
-                    else:
-                        self.logger.info(f"Unknown status: {link_text}, waiting 3 more minutes...")
-                        time.sleep(180)
-                        continue
+                if not download_link:
+                    self.logger.info("Download link not found")
+                    return None
+
+                link_text = self.browser_wrapper.get_text(download_link)
+                self.logger.info(f"Report status: {link_text}")
+                if "Download" in link_text:
+                    return download_link
+                if "In Queue" in link_text or "queue" in link_text.lower():
+                    self.logger.info("Report in queue")
                 else:
-                    self.logger.info("Download link not found, waiting 3 more minutes...")
-                    time.sleep(180)
-                    continue
+                    self.logger.info(f"Unknown status: {link_text}")
+                return None
 
             except Exception as e:
-                self.logger.error(f"Error in attempt {attempt}: {str(e)}")
-                if attempt < max_attempts:
-                    time.sleep(180)
-                continue
+                self.logger.error(f"Error checking results table: {str(e)}")
+                return None
 
-        self.logger.error("Maximum attempts reached without being able to download report")
-        return None
+        poller = ReadinessPoller("telus", "daily_usage_report", timeout=self.report_ready_timeout_seconds)
+        download_link = poller.poll(ready_download_link, snapshot=read_table, since=requested_at)
+        if not download_link:
+            self.logger.error("Report not ready in time, could not download it")
+            return None
 
-    def _find_best_report_row(self, report_name: str, target_account: str) -> Optional[int]:
+        self.logger.info("Report ready for download!")
+
+        # Download file
+        downloaded_file_path = self.browser_wrapper.expect_download_and_click(
+            download_link, timeout=60000, downloads_dir=self.job_downloads_dir
+        )
+        if not downloaded_file_path:
+            self.logger.error("Error downloading file")
+            return None
+
+        actual_filename = os.path.basename(downloaded_file_path)
+        self.logger.info(f"File downloaded: {actual_filename}")
+
+        file_info = FileDownloadInfo(
+            file_id=daily_usage_file.id if daily_usage_file else 1,
+            file_name=actual_filename,
+            download_url="N/A",
+            file_path=downloaded_file_path,
+            daily_usage_file=daily_usage_file,
+        )
+
+        if daily_usage_file:
+            self.logger.info(
+                f"MAPPING CONFIRMED: {actual_filename} -> BillingCycleDailyUsageFile ID {daily_usage_file.id}"
+            )
+
+        return file_info
+
+    def _read_results_table(self) -> Dict[str, List[Optional[str]]]:
+        """
+        Reads the name, Status, BAN and Date generated columns of the results table (one page
+        evaluation each). The Status column ("In Queue" -> "Download") is the readiness signal,
+        so it must be part of the snapshot the poller compares.
+        """
+        table = {}
+        for key, column, cell_text in RESULTS_TABLE_COLUMNS:
+            cells = self.browser_wrapper.extract_table(
+                f"//div[contains(@class, 'new__dynamic__table__column')][{column}]"
+                f"//div[contains(@class, 'new-dynamic-table__table__cell')]",
+                {"text": cell_text},
+            )
+            table[key] = [cell["text"] for cell in cells]
+        return table
+
+    def _find_best_report_row(
+        self, report_name: str, target_account: str, table: Optional[Dict[str, List[Optional[str]]]] = None
+    ) -> Optional[int]:
         """Finds the best row matching the report.
 
         Criteria:
@@ -576,6 +571,9 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
         - Column 8: Date generated
         - Column 9: empty (lastColumnId)
 
+        Args:
+            table: Table already read with _read_results_table (read from the page if None)
+
         Returns:
             int: Row index (1-based) or None if not found
         """
@@ -584,18 +582,16 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
 
             candidates = []  # List of tuples: (row_index, date_generated_text)
 
-            # Scan up to 10 rows looking for matches
-            for i in range(1, 11):
-                # Get report name (column 2)
-                name_xpath = (
-                    f"//div[contains(@class, 'new__dynamic__table__column')][2]"
-                    f"//div[contains(@class, 'new-dynamic-table__table__cell')][{i}]//span"
-                )
-
-                if not self.browser_wrapper.find_element_by_xpath(name_xpath, timeout=1000):
-                    break  # No more rows
+            if table is None:
+                table = self._read_results_table()
+            names, bans, dates = table["names"], table["bans"], table["dates"]
+            if not names:
+                self.logger.warning("Report table not found or empty")
+                return None
 
-                name_text = self.browser_wrapper.get_text(name_xpath).strip()
+            # Scan up to 10 rows looking for matches
+            for i, name_text in enumerate(names[:10], 1):
+                name_text = name_text or ""
 
                 # Check if name matches
                 if report_name not in name_text:
@@ -604,34 +600,18 @@ class TelusDailyUsageScraperStrategy(DailyUsageScraperStrategy):
 
                 self.logger.debug(f"Row {i}: name matches '{name_text}'")
 
-                # Get BAN (column 5)
-                ban_xpath = (
-                    f"//div[contains(@class, 'new__dynamic__table__column')][5]"
-                    f"//div[contains(@class, 'new-dynamic-table__table__cell')][{i}]//span"
-                )
-
-                if self.browser_wrapper.find_element_by_xpath(ban_xpath, timeout=1000):
-                    ban_text = self.browser_wrapper.get_text(ban_xpath).strip()
-                    self.logger.debug(f"Row {i}: BAN = '{ban_text}'")
-
-                    # Validate BAN: must be account number OR "Multiple"
-                    if target_account not in ban_text and "Multiple" not in ban_text:
-                        self.logger.debug(f"Row {i}: BAN doesn't match (expected: {target_account})")
-                        continue
-                else:
+                # Validate BAN: must be account number OR "Multiple"
+                ban_text = bans[i - 1] if i <= len(bans) else None
+                if ban_text is None:
                     self.logger.debug(f"Row {i}: could not get BAN")
                     continue
+                self.logger.debug(f"Row {i}: BAN = '{ban_text}'")
+                if target_account not in ban_text and "Multiple" not in ban_text:
+                    self.logger.debug(f"Row {i}: BAN doesn't match (expected: {target_account})")
+                    continue
 
-                # Get Date generated (column 8)
-                date_xpath = (
-                    f"//div[contains(@class, 'new__dynamic__table__column')][8]"
-                    f"//div[contains(@class, 'new-dynamic-table__table__cell')][{i}]//span"
-                )
-
-                date_text = ""
-                if self.browser_wrapper.find_element_by_xpath(date_xpath, timeout=1000):
-                    date_text = self.browser_wrapper.get_text(date_xpath).strip()
-                    self.logger.debug(f"Row {i}: Date generated = '{date_text}'")
+                date_text = (dates[i - 1] if i <= len(dates) else None) or ""
+                self.logger.debug(f"Row {i}: Date generated = '{date_text}'")
 
                 # This row is a candidate
                 candidates.append((i, date_text))
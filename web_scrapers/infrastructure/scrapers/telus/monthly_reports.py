@@ -1,6 +1,7 @@
 import logging
 import os
 import time
+import zipfile
 from typing import Any, List, Optional
 
 from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
@@ -9,11 +10,38 @@ from web_scrapers.domain.entities.scraper_strategies import (
     FileDownloadInfo,
     MonthlyReportsScraperStrategy,
 )
+from web_scrapers.domain.entities.session import Carrier
 from web_scrapers.domain.enums import TelusFileSlug
+from web_scrapers.infrastructure.playwright.selector_registry import SelectorCandidate, selector_registry
 
 DOWNLOADS_DIR = os.path.abspath("downloads")
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+selector_registry.register(
+    Carrier.TELUS,
+    "account_selection.account_card",
+    [
+        SelectorCandidate(
+            "north_star_card",
+            "//div[@data-testid='account-card-north-star'][.//div[contains(text(), '{account_number}')]]",
+        ),
+        SelectorCandidate(
+            "account_card",
+            "//div[starts-with(@data-testid, 'account-card')][.//*[contains(text(), '{account_number}')]]",
+        ),
+    ],
+)
+selector_registry.register(
+    Carrier.TELUS,
+    "account_header.change_link",
+    [
+        SelectorCandidate(
+            "header_link", "//*[@id='app']/div/div[2]/div/div[1]/div/div[2]//a[contains(text(), 'Change')]"
+        ),
+        SelectorCandidate("link_with_div", "//a[.//div[contains(text(), 'Change')]]"),
+    ],
+)
+
 
 class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
     """Monthly reports scraper for Telus."""
@@ -115,9 +143,6 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             self.logger.info("Waiting 30 seconds...")
             time.sleep(30)
 
-            # 1.1. Detect and close Bill Analyzer modal if it appears
-            self._dismiss_bill_analyzer_modal()
-
             # 2. Click on reports header
             reports_header_xpath = '//*[@id="navMenuGroupReports"]'
             self.logger.info("Clicking on reports header...")
@@ -184,15 +209,17 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             target_account_number = billing_cycle.account.number
             self.logger.info(f"Searching for account: {target_account_number}")
 
-            # Search for div containing specific account number
-            account_number_xpath = (
-                f"//div[@data-testid='account-card-north-star']//div[contains(text(), '{target_account_number}')]"
+            # Probe the known account card layouts together
+            account_card = selector_registry.resolve(
+                self.browser_wrapper,
+                Carrier.TELUS,
+                "account_selection.account_card",
+                account_number=target_account_number,
             )
 
-            if self.browser_wrapper.find_element_by_xpath(account_number_xpath):
+            if account_card:
                 self.logger.info(f"Account {target_account_number} found, clicking...")
-                target_card_xpath = f"//div[@data-testid='account-card-north-star'][.//div[contains(text(), '{target_account_number}')]]"
-                self.browser_wrapper.click_element(target_card_xpath)
+                self.browser_wrapper.click_element(account_card.selector, selector_type=account_card.selector_type)
                 self.browser_wrapper.wait_for_page_load()
                 time.sleep(3)
                 self.logger.info(f"Account {target_account_number} selected successfully")
@@ -239,17 +266,11 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             self.logger.info("Clicking 'Change' to switch account...")
 
             # Find and click 'Change' link
-            change_link_xpath = "//*[@id='app']/div/div[2]/div/div[1]/div/div[2]//a[contains(text(), 'Change')]"
-            # More specific alternative based on provided structure
-            change_link_alt_xpath = "//a[.//div[contains(text(), 'Change')]]"
-
-            if self.browser_wrapper.find_element_by_xpath(change_link_xpath):
-                self.browser_wrapper.click_element(change_link_xpath)
-            elif self.browser_wrapper.find_element_by_xpath(change_link_alt_xpath):
-                self.browser_wrapper.click_element(change_link_alt_xpath)
-            else:
+            change_link = selector_registry.resolve(self.browser_wrapper, Carrier.TELUS, "account_header.change_link")
+            if not change_link:
                 self.logger.error("'Change' link not found")
                 return False
+            self.browser_wrapper.click_element(change_link.selector, selector_type=change_link.selector_type)
 
             time.sleep(5)
 
@@ -317,27 +338,23 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
     def _process_downloaded_zip(self, zip_file_path: str, file_map: dict) -> List[FileDownloadInfo]:
         """
-        Processes downloaded ZIP, extracts files and maps to BillingCycleFiles.
+        Processes downloaded ZIP and maps its files to BillingCycleFiles.
         IMPORTANT: Only files with valid mapping are added to downloaded_files.
         Only needed from ZIP: individual_detail, group_summary
+        The files are not extracted: they are uploaded straight from the ZIP (archive_member).
         """
         downloaded_files = []
 
         try:
             self.logger.info(f"Processing ZIP: {os.path.basename(zip_file_path)}")
 
-            # Extract files from ZIP
-            extracted_files = self._extract_zip_files(zip_file_path)
-            if not extracted_files:
-                self.logger.error("Could not extract files from ZIP")
+            if not zipfile.is_zipfile(zip_file_path):
+                self.logger.error(f"File is not a valid ZIP: {zip_file_path}")
                 return downloaded_files
 
-            self.logger.info(f"Extracted {len(extracted_files)} files from ZIP")
-
-            # Process extracted files and map them
             # ONLY add files with valid mapping (individual_detail, group_summary)
-            for file_path in extracted_files:
-                original_filename = os.path.basename(file_path)
+            for member in self._list_zip_members(zip_file_path):
+                original_filename = os.path.basename(member.filename)
                 self.logger.info(f"Processing file: {original_filename}")
 
                 # Find corresponding BillingCycleFile
@@ -349,7 +366,8 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                         file_id=corresponding_bcf.id,
                         file_name=original_filename,
                         download_url="N/A",
-                        file_path=file_path,
+                        file_path=zip_file_path,
+                        archive_member=member.filename,
                         billing_cycle_file=corresponding_bcf,
                     )
                     downloaded_files.append(file_info)
@@ -463,30 +481,6 @@ class TelusMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
         return None
 
-    def _dismiss_bill_analyzer_modal(self) -> bool:
-        """
-        Detects and closes Bill Analyzer modal if it appears.
-        This modal may appear when navigating to reports section.
-        Returns True if modal was closed or if it didn't appear.
-        """
-        try:
-            modal_button_xpath = "//*[@id='tandc-content']/div[3]/button"
-
-            # Check if modal is present (with short timeout)
-            if self.browser_wrapper.is_element_visible(modal_button_xpath, timeout=3000):
-                self.logger.info("Bill Analyzer modal detected, closing...")
-                self.browser_wrapper.click_element(modal_button_xpath)
-                time.sleep(2)
-                self.logger.info("Bill Analyzer modal closed")
-                return True
-            else:
-                self.logger.info("Bill Analyzer modal not detected, continuing...")
-                return True
-
-        except Exception as e:
-            self.logger.warning(f"Error handling Bill Analyzer modal: {str(e)}")
-            return True  # Continue anyway
-
     def _configure_date_selection(self, billing_cycle: BillingCycle):
         """Configures date selection for individual reports."""
         try:
@@ -55,9 +55,6 @@ class TelusPDFInvoiceScraperStrategy(PDFInvoiceScraperStrategy):
             self.logger.info("Waiting 30 seconds for Bill Analyzer to load...")
             time.sleep(30)
 
-            # 4. Handle Bill Analyzer modal if it appears
-            self._dismiss_bill_analyzer_modal()
-
             # 5. Click on Statements tab
             statements_xpath = '//*[@id="navMenuItem14"]'
             self.logger.info("Clicking on Statements tab...")
@@ -89,30 +86,6 @@ class TelusPDFInvoiceScraperStrategy(PDFInvoiceScraperStrategy):
             self.logger.error(f"Error navigating to PDF invoices: {str(e)}")
             return None
 
-    def _dismiss_bill_analyzer_modal(self) -> bool:
-        """
-        Detects and closes Bill Analyzer modal if it appears.
-        This modal may appear when navigating to reports section.
-        Returns True if modal was closed or if it didn't appear.
-        """
-        try:
-            modal_button_xpath = "//*[@id='tandc-content']/div[3]/button"
-
-            # Check if modal is present (with short timeout)
-            if self.browser_wrapper.is_element_visible(modal_button_xpath, timeout=3000):
-                self.logger.info("Bill Analyzer modal detected, closing...")
-                self.browser_wrapper.click_element(modal_button_xpath)
-                time.sleep(2)
-                self.logger.info("Bill Analyzer modal closed")
-                return True
-            else:
-                self.logger.info("Bill Analyzer modal not detected, continuing...")
-                return True
-
-        except Exception as e:
-            self.logger.warning(f"Error handling Bill Analyzer modal: {str(e)}")
-            return True  # Continue anyway
-
     def _configure_scope_filter(self, billing_cycle: BillingCycle) -> bool:
         """Configures Scope filter to select the correct account."""
         try:
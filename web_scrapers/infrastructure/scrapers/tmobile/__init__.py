@@ -1,9 +1,18 @@
-from web_scrapers.infrastructure.scrapers.tmobile.daily_usage import TMobileDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.tmobile.monthly_reports import TMobileMonthlyReportsScraperStrategy
-from web_scrapers.infrastructure.scrapers.tmobile.pdf_invoice import TMobilePDFInvoiceScraperStrategy
-
-__all__ = [
-    "TMobileMonthlyReportsScraperStrategy",
-    "TMobileDailyUsageScraperStrategy",
-    "TMobilePDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.tmobile.daily_usage import TMobileDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.tmobile.monthly_reports import TMobileMonthlyReportsScraperStrategy
+    from web_scrapers.infrastructure.scrapers.tmobile.pdf_invoice import TMobilePDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "TMobileMonthlyReportsScraperStrategy": "monthly_reports",
+    "TMobileDailyUsageScraperStrategy": "daily_usage",
+    "TMobilePDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
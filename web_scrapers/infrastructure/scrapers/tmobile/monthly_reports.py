@@ -4,7 +4,7 @@ import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper
+from web_scrapers.domain.entities.browser_wrapper import BrowserWrapper, TableColumn
 from web_scrapers.domain.entities.models import BillingCycle, ScraperConfig
 from web_scrapers.domain.entities.scraper_strategies import (
     FileDownloadInfo,
@@ -28,6 +28,10 @@ REPORT_NAME_TO_SLUG = {
 class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
     """Scraper de reportes mensuales para T-Mobile."""
 
+    supports_two_phase = True
+    # Los reportes suelen estar completados en My Reports a los 3 minutos
+    collect_delay_seconds = 180
+
     def __init__(self, browser_wrapper: BrowserWrapper, job_id: int):
         super().__init__(browser_wrapper, job_id=job_id)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -682,8 +686,19 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
         try:
             self.logger.info("Buscando reportes completados para hoy (1 de cada tipo, max 5)...")
 
-            # Obtener todos los rows de reportes
-            report_rows = self.browser_wrapper.page.query_selector_all("mat-expansion-panel.history-content")
+            # Obtener todos los rows de reportes en una sola evaluacion
+            report_rows_selector = "mat-expansion-panel.history-content"
+            report_rows = self.browser_wrapper.extract_table(
+                report_rows_selector,
+                {
+                    "name": TableColumn(".report-name", inner_text=True),
+                    "detail": TableColumn(".report-det", inner_text=True),
+                    "run_date": TableColumn(".run-date", inner_text=True),
+                    "status": TableColumn(".report-status", inner_text=True),
+                },
+                selector_type="css",
+            )
+            row_elements = None
 
             today_short = datetime.now().strftime("%b")  # Ej: "Jan"
             today_day = datetime.now().day
@@ -696,8 +711,7 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
                 try:
                     # Obtener nombre del reporte
-                    name_elem = row.query_selector(".report-name")
-                    report_name = name_elem.inner_text().strip() if name_elem else ""
+                    report_name = row["name"] or ""
 
                     # Saltar si ya tenemos este tipo de reporte
                     if report_name in found_report_types:
@@ -707,17 +721,10 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                     if report_name not in target_report_types:
                         continue
 
-                    # Obtener detalles (cuenta y periodo)
-                    detail_elem = row.query_selector(".report-det")
-                    detail_text = detail_elem.inner_text().strip() if detail_elem else ""
-
-                    # Obtener fecha de ejecucion
-                    date_elem = row.query_selector(".run-date")
-                    run_date = date_elem.inner_text().strip() if date_elem else ""
-
-                    # Obtener status
-                    status_elem = row.query_selector(".report-status")
-                    status = status_elem.inner_text().strip() if status_elem else ""
+                    # Detalles (cuenta y periodo), fecha de ejecucion y status
+                    detail_text = row["detail"] or ""
+                    run_date = row["run_date"] or ""
+                    status = row["status"] or ""
 
                     # Verificar si es de hoy y esta completado
                     is_today = today_short in run_date and str(today_day) in run_date and today_year in run_date
@@ -726,6 +733,9 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
                     if is_completed and is_today and has_account:
                         self.logger.info(f"Reporte encontrado: {report_name} | {detail_text} | {run_date} | {status}")
+                        # Los elementos solo se piden cuando hay un reporte a descargar
+                        if row_elements is None:
+                            row_elements = self.browser_wrapper.page.query_selector_all(report_rows_selector)
                         completed_reports.append(
                             {
                                 "index": idx,
@@ -733,7 +743,7 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                                 "detail": detail_text,
                                 "run_date": run_date,
                                 "status": status,
-                                "element": row,
+                                "element": row_elements[idx],
                             }
                         )
                         found_report_types.add(report_name)
@@ -832,6 +842,17 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
             self.logger.error(f"Error descargando reporte: {str(e)}")
             return None
 
+    def _request_reports(
+        self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
+    ) -> Optional[Dict[str, Any]]:
+        """Encola los 5 reportes en T-Mobile; se descargan desde My Reports en la fase de recogida."""
+        account_number = files_section.get("account", "")
+        try:
+            self._generate_reports(billing_cycle, account_number)
+        finally:
+            self._reset_to_main_screen()
+        return {"account": account_number}
+
     def _download_files(
         self, files_section: Any, config: ScraperConfig, billing_cycle: BillingCycle
     ) -> List[FileDownloadInfo]:
@@ -842,6 +863,9 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
         2. Generar 2 reportes en Other templates (Equipment templates)
         3. Esperar 3 minutos para que se generen
         4. Descargar los 5 reportes completados desde My Reports
+
+        En la fase de recogida de un job en dos fases (self.phase_state) los reportes ya se
+        generaron en una ejecucion anterior y solo se ejecuta el paso 4.
         """
         downloaded_files = []
         account_number = files_section.get("account", "")
@@ -855,104 +879,23 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                     self.logger.info(f"Mapeando BillingCycleFile ID {bcf.id} -> Slug: '{bcf.carrier_report.slug}'")
 
         try:
-            self.logger.info("=== INICIANDO GENERACION DE REPORTES T-MOBILE ===")
-
-            # ========== FASE 1: Generar reportes en Billing templates ==========
-            self.logger.info("\n--- FASE 1: Billing templates (3 reportes) ---")
-
-            # Lista de reportes de Billing templates
-            # Cada reporte requiere: configurar filtros + expandir accordion + Run as is
-            billing_reports = [
-                "Charges and Usage Summary",
-                "Usage Detail",
-                "Statement Detail",
-            ]
-
-            for report_name in billing_reports:
-                # Cada reporte necesita configurar filtros desde cero porque se resetean
-                if not self._generate_billing_template_report(
-                    report_title=report_name,
-                    accordion_title="Billing & Statements",
-                    billing_cycle=billing_cycle,
-                    account_number=account_number,
-                ):
-                    self.logger.warning(f"No se pudo generar: {report_name}")
-                time.sleep(2)
-
-            # ========== FASE 2: Generar reportes en Other templates ==========
-            self.logger.info("\n--- FASE 2: Other templates (2 reportes) ---")
-
-            # Lista de reportes de Equipment templates
-            equipment_reports = [
-                "Equipment Inventory",
-                "Equipment Installment",
-            ]
-
-            for report_name in equipment_reports:
-                # Cambiar a tab Other templates (se resetea despues de cada Run as is)
-                if not self._click_other_templates_tab():
-                    self.logger.error("No se pudo cambiar a Other templates")
-                    continue
-
-                time.sleep(2)
+            if not self.phase_state:
+                self._generate_reports(billing_cycle, account_number)
 
-                # Generar reporte con filtros y accordion
-                if not self._generate_other_template_report(
-                    report_title=report_name,
-                    accordion_title="Equipment templates",
-                    account_number=account_number,
-                ):
-                    self.logger.warning(f"No se pudo generar: {report_name}")
-                time.sleep(2)
-
-            # ========== FASE 3: Esperar generacion de reportes ==========
-            self.logger.info("\n--- FASE 3: Esperando generacion de reportes ---")
-            wait_time_seconds = 180  # 3 minutos
-            self.logger.info(f"Esperando {wait_time_seconds // 60} minutos para que se generen los reportes...")
+                # ========== FASE 3: Esperar generacion de reportes ==========
+                self.logger.info("\n--- FASE 3: Esperando generacion de reportes ---")
+                wait_time_seconds = 180  # 3 minutos
+                self.logger.info(f"Esperando {wait_time_seconds // 60} minutos para que se generen los reportes...")
 
-            # Reset a la pantalla principal mientras esperamos
-            self._reset_to_main_screen()
-            time.sleep(wait_time_seconds)
+                # Reset a la pantalla principal mientras esperamos
+                self._reset_to_main_screen()
+                time.sleep(wait_time_seconds)
 
             # ========== FASE 4: Descargar reportes completados ==========
-            self.logger.info("\n--- FASE 4: Descargando reportes completados ---")
-
-            # Navegar nuevamente a Reporting
-            if not self._navigate_to_reporting():
-                self.logger.error("No se pudo navegar a Reporting")
-                return downloaded_files
-
-            # Click en tab My reports
-            if not self._click_my_reports_tab():
-                self.logger.error("No se pudo cambiar a My reports")
-                return downloaded_files
-
-            time.sleep(3)
-
-            # Buscar reportes completados para hoy
-            completed_reports = self._find_completed_reports_for_today(account_number)
-
-            if not completed_reports:
-                self.logger.warning("No se encontraron reportes completados para hoy")
-                # Intentar una vez mas despues de esperar un poco
-                self.logger.info("Esperando 60 segundos adicionales y reintentando...")
-                time.sleep(60)
-                self.browser_wrapper.page.reload()
-                time.sleep(5)
-                if not self._click_my_reports_tab():
-                    return downloaded_files
-                time.sleep(3)
-                completed_reports = self._find_completed_reports_for_today(account_number)
-
-            # Descargar cada reporte
-            for report_info in completed_reports:
-                file_info = self._download_single_report(report_info, billing_cycle_file_map)
-                if file_info:
-                    downloaded_files.append(file_info)
-                time.sleep(2)
-
-            # Reset a pantalla principal
-            self._reset_to_main_screen()
+            # En la fase de recogida no se espera: si faltan reportes el job se reprograma
+            downloaded_files = self._collect_completed_reports(
+                account_number, billing_cycle_file_map, retry_wait=self.phase_state is None
+            )
 
             # Log resumen final
             self.logger.info(f"\n{'='*60}")
@@ -978,6 +921,116 @@ class TMobileMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                 pass
             return downloaded_files
 
+    def _generate_reports(self, billing_cycle: BillingCycle, account_number: str) -> None:
+        """Encola la generacion de los 5 reportes (fases 1 y 2), salvo los ya descargados en un intento anterior."""
+        self.logger.info("=== INICIANDO GENERACION DE REPORTES T-MOBILE ===")
+
+        # ========== FASE 1: Generar reportes en Billing templates ==========
+        self.logger.info("\n--- FASE 1: Billing templates (3 reportes) ---")
+
+        # Lista de reportes de Billing templates
+        # Cada reporte requiere: configurar filtros + expandir accordion + Run as is
+        billing_reports = [
+            ("Charges and Usage Summary", TmobileFileSlug.CHARGES_AND_USAGE.value),
+            ("Usage Detail", TmobileFileSlug.USAGE_DETAIL.value),
+            ("Statement Detail", TmobileFileSlug.STATEMENT_DETAIL.value),
+        ]
+
+        for report_name, slug in billing_reports:
+            if self._is_checkpointed(slug):
+                continue
+            # Cada reporte necesita configurar filtros desde cero porque se resetean
+            if not self._generate_billing_template_report(
+                report_title=report_name,
+                accordion_title="Billing & Statements",
+                billing_cycle=billing_cycle,
+                account_number=account_number,
+            ):
+                self.logger.warning(f"No se pudo generar: {report_name}")
+            time.sleep(2)
+
+        # ========== FASE 2: Generar reportes en Other templates ==========
+        self.logger.info("\n--- FASE 2: Other templates (2 reportes) ---")
+
+        # Lista de reportes de Equipment templates
+        equipment_reports = [
+            ("Equipment Inventory", TmobileFileSlug.INVENTORY_REPORT.value),
+            ("Equipment Installment", TmobileFileSlug.EQUIPMENT_INSTALLMENT.value),
+        ]
+
+        for report_name, slug in equipment_reports:
+            if self._is_checkpointed(slug):
+                continue
+            # Cambiar a tab Other templates (se resetea despues de cada Run as is)
+            if not self._click_other_templates_tab():
+                self.logger.error("No se pudo cambiar a Other templates")
+                continue
+
+            time.sleep(2)
+
+            # Generar reporte con filtros y accordion
+            if not self._generate_other_template_report(
+                report_title=report_name,
+                accordion_title="Equipment templates",
+                account_number=account_number,
+            ):
+                self.logger.warning(f"No se pudo generar: {report_name}")
+            time.sleep(2)
+
+    def _collect_completed_reports(
+        self, account_number: str, billing_cycle_file_map: Dict[str, Any], retry_wait: bool = True
+    ) -> List[FileDownloadInfo]:
+        """Descarga desde My Reports los reportes completados hoy (fase 4).
+
+        Args:
+            account_number: Cuenta de los reportes
+            billing_cycle_file_map: Mapeo de slug a BillingCycleFile
+            retry_wait: Si no hay reportes completados, esperar 60 segundos y buscar de nuevo
+        """
+        downloaded_files = []
+        self.logger.info("\n--- FASE 4: Descargando reportes completados ---")
+
+        # Navegar nuevamente a Reporting
+        if not self._navigate_to_reporting():
+            self.logger.error("No se pudo navegar a Reporting")
+            return downloaded_files
+
+        # Click en tab My reports
+        if not self._click_my_reports_tab():
+            self.logger.error("No se pudo cambiar a My reports")
+            return downloaded_files
+
+        time.sleep(3)
+
+        # Buscar reportes completados para hoy
+        completed_reports = self._find_completed_reports_for_today(account_number)
+
+        if not completed_reports and retry_wait:
+            self.logger.warning("No se encontraron reportes completados para hoy")
+            # Intentar una vez mas despues de esperar un poco
+            self.logger.info("Esperando 60 segundos adicionales y reintentando...")
+            time.sleep(60)
+            self.browser_wrapper.page.reload()
+            time.sleep(5)
+            if not self._click_my_reports_tab():
+                return downloaded_files
+            time.sleep(3)
+            completed_reports = self._find_completed_reports_for_today(account_number)
+
+        # Descargar cada reporte (los ya descargados por un intento anterior se omiten)
+        for report_info in completed_reports:
+            if self._is_checkpointed(REPORT_NAME_TO_SLUG.get(report_info["name"])):
+                continue
+            file_info = self._download_single_report(report_info, billing_cycle_file_map)
+            if file_info:
+                downloaded_files.append(file_info)
+            time.sleep(2)
+
+        # Reset a pantalla principal
+        self._reset_to_main_screen()
+
+        return downloaded_files
+
     def _reset_to_main_screen(self):
         """Reset a la pantalla inicial de T-Mobile dashboard."""
         try:
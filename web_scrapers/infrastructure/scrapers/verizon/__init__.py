@@ -1,9 +1,18 @@
-from web_scrapers.infrastructure.scrapers.verizon.daily_usage import VerizonDailyUsageScraperStrategy
-from web_scrapers.infrastructure.scrapers.verizon.monthly_reports import VerizonMonthlyReportsScraperStrategy
-from web_scrapers.infrastructure.scrapers.verizon.pdf_invoice import VerizonPDFInvoiceScraperStrategy
-
-__all__ = [
-    "VerizonMonthlyReportsScraperStrategy",
-    "VerizonDailyUsageScraperStrategy",
-    "VerizonPDFInvoiceScraperStrategy",
-]
+from typing import TYPE_CHECKING
+
+from web_scrapers.infrastructure.lazy_registry import lazy_exports
+
+if TYPE_CHECKING:
+    from web_scrapers.infrastructure.scrapers.verizon.daily_usage import VerizonDailyUsageScraperStrategy
+    from web_scrapers.infrastructure.scrapers.verizon.monthly_reports import VerizonMonthlyReportsScraperStrategy
+    from web_scrapers.infrastructure.scrapers.verizon.pdf_invoice import VerizonPDFInvoiceScraperStrategy
+
+# Strategy modules are imported on first access (see web_scrapers.infrastructure.lazy_registry)
+_EXPORTS = {
+    "VerizonMonthlyReportsScraperStrategy": "monthly_reports",
+    "VerizonDailyUsageScraperStrategy": "daily_usage",
+    "VerizonPDFInvoiceScraperStrategy": "pdf_invoice",
+}
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
+__all__ = list(_EXPORTS)
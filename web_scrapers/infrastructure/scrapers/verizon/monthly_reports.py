@@ -1,6 +1,7 @@
 import logging
 import os
 import time
+import zipfile
 from datetime import date
 from typing import Any, List, Optional
 
@@ -83,32 +84,20 @@ class VerizonMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                     self.logger.info(f"Mapping BillingCycleFile ID {bcf.id} -> Slug: '{bcf.carrier_report.slug}'")
 
         try:
-            # === PART 1: RAW DATA DOWNLOAD ZIP ===
-            self.logger.info("=== PART 1: DOWNLOADING RAW DATA ZIP ===")
-            zip_files = self._download_raw_data_zip(billing_cycle, billing_cycle_file_map)
-            downloaded_files.extend(zip_files)
-            self.logger.info(f"Part 1 completed: {len(zip_files)} files from ZIP")
-
-            # === PART 2: DEVICE REPORT ===
-            self.logger.info("=== PART 2: DOWNLOADING DEVICE REPORT ===")
-            device_file = self._download_device_report(billing_cycle, billing_cycle_file_map)
-            if device_file:
-                downloaded_files.append(device_file)
-                self.logger.info("Device Report downloaded")
-
-            # === PART 3: ACTIVATION & DEACTIVATION REPORT ===
-            self.logger.info("=== PART 3: DOWNLOADING ACTIVATION & DEACTIVATION REPORT ===")
-            activation_file = self._download_activation_deactivation_report(billing_cycle, billing_cycle_file_map)
-            if activation_file:
-                downloaded_files.append(activation_file)
-                self.logger.info("Activation & Deactivation Report downloaded")
-
-            # === PART 4: SUSPENDED WIRELESS NUMBERS REPORT ===
-            self.logger.info("=== PART 4: DOWNLOADING SUSPENDED WIRELESS NUMBERS REPORT ===")
-            suspended_file = self._download_suspended_wireless_report(billing_cycle, billing_cycle_file_map)
-            if suspended_file:
-                downloaded_files.append(suspended_file)
-                self.logger.info("Suspended Wireless Numbers Report downloaded")
+            # The 4 parts start and end on the reports page, so they can run in parallel tabs
+            # (SCRAPER_MULTI_TAB_WORKERS); a failing part only loses its own files
+            downloaded_files = self._download_in_tabs(
+                {
+                    "raw_data_zip": lambda tab: tab._download_raw_data_zip(billing_cycle, billing_cycle_file_map),
+                    "device_report": lambda tab: tab._download_device_report(billing_cycle, billing_cycle_file_map),
+                    "activation_deactivation_report": lambda tab: tab._download_activation_deactivation_report(
+                        billing_cycle, billing_cycle_file_map
+                    ),
+                    "suspended_wireless_report": lambda tab: tab._download_suspended_wireless_report(
+                        billing_cycle, billing_cycle_file_map
+                    ),
+                }
+            )
 
             # Reset to main screen
             self._reset_to_main_screen()
@@ -178,17 +167,14 @@ class VerizonMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
 
             self.logger.info(f"ZIP downloaded: {os.path.basename(zip_file_path)}")
 
-            # 4. Extract ZIP files
-            extracted_files = self._extract_zip_files(zip_file_path)
-            if not extracted_files:
-                self.logger.error("Could not extract files from ZIP")
+            # 4. Check the ZIP (files are uploaded straight from it, without extraction)
+            if not zipfile.is_zipfile(zip_file_path):
+                self.logger.error(f"File is not a valid ZIP: {zip_file_path}")
                 return downloaded_files
 
-            self.logger.info(f"Extracted {len(extracted_files)} files from ZIP")
-
             # 5. Process only relevant files (2 out of 4)
-            for file_path in extracted_files:
-                original_filename = os.path.basename(file_path)
+            for member in self._list_zip_members(zip_file_path):
+                original_filename = os.path.basename(member.filename)
                 self.logger.info(f"Processing file: {original_filename}")
 
                 corresponding_bcf = self._find_matching_zip_file(original_filename, file_map)
@@ -201,7 +187,8 @@ class VerizonMonthlyReportsScraperStrategy(MonthlyReportsScraperStrategy):
                         file_id=corresponding_bcf.id,
                         file_name=original_filename,
                         download_url="N/A",
-                        file_path=file_path,
+                        file_path=zip_file_path,
+                        archive_member=member.filename,
                         billing_cycle_file=corresponding_bcf,
                     )
                     downloaded_files.append(file_info)
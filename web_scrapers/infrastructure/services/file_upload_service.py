@@ -1,23 +1,91 @@
 """
 Universal file upload service for external API.
+
+File bodies are streamed (see multipart_encoder), so memory stays constant with the
+file size. Content already acknowledged for the same file id is skipped (see upload_manifest).
+
+Resumable uploads are off unless the backend declares support for them. Backend
+contract required by EIQ_BACKEND_ACCEPTS_UPLOAD_URL=true: the upload endpoints accept
+an ``upload_url`` form field (the URL of a completed tus upload on
+EIQ_BACKEND_RESUMABLE_UPLOAD_URL) and a ``file_name`` field in place of the ``file``
+part. With both set, files of at least EIQ_BACKEND_RESUMABLE_MIN_BYTES go through the
+resumable session; otherwise every file is sent as a multipart post.
 """
 
+import email.utils
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import requests
 
 from web_scrapers.domain.entities.models import BillingCycle, FileDownloadInfo
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.services.multipart_encoder import MultipartEncoder, ProgressCallback
+from web_scrapers.infrastructure.services.resumable_upload import ResumableUploader
+from web_scrapers.infrastructure.services.upload_manifest import UploadManifest, sha256_of_stream
+from web_scrapers.infrastructure.tracing import traced
+
+
+@contextmanager
+def open_file_content(file_info: FileDownloadInfo) -> Iterator[Tuple[BinaryIO, int]]:
+    """
+    Opens the content of a downloaded file and yields (stream, size in bytes).
+
+    For archive members (file_info.archive_member set) the decompressed bytes are read
+    straight from the ZIP at file_info.file_path, without extracting them to disk.
+    """
+    if file_info.archive_member:
+        with zipfile.ZipFile(file_info.file_path, "r") as archive:
+            member = archive.getinfo(file_info.archive_member)
+            with archive.open(member) as content:
+                yield content, member.file_size
+    else:
+        with open(file_info.file_path, "rb") as content:
+            yield content, os.path.getsize(file_info.file_path)
+
+
+def file_content_size(file_info: FileDownloadInfo) -> int:
+    """Size in bytes of the content open_file_content yields, read from metadata only."""
+    if file_info.archive_member:
+        with zipfile.ZipFile(file_info.file_path, "r") as archive:
+            return archive.getinfo(file_info.archive_member).file_size
+    return os.path.getsize(file_info.file_path)
+
+
+class UploadAttempt(NamedTuple):
+    """Outcome of a single upload attempt."""
+
+    success: bool
+    status_code: Optional[int] = None  # None when no response was received (connection error, timeout...)
+    retry_after: Optional[float] = None  # Seconds requested by the backend through Retry-After
+    error: Optional[str] = None
 
 
 class FileUploadService:
     """Service for uploading files to external API."""
 
-    def __init__(self):
+    def __init__(
+        self, progress_callback: Optional[ProgressCallback] = None, manifest: Optional[UploadManifest] = None
+    ):
         # Configuration from environment variables
         self.api_base_url = os.getenv("EIQ_BACKEND_API_BASE_URL", "https://api.expertel.com")
         self.api_key = os.getenv("EIQ_BACKEND_API_KEY", "")
+        # Resumable uploads only against a backend that accepts upload_url (see module docstring)
+        self.resumable_upload_url = ""
+        if os.getenv("EIQ_BACKEND_ACCEPTS_UPLOAD_URL", "false").lower() == "true":
+            self.resumable_upload_url = os.getenv("EIQ_BACKEND_RESUMABLE_UPLOAD_URL", "")
+        self.resumable_min_bytes = int(os.getenv("EIQ_BACKEND_RESUMABLE_MIN_BYTES", str(50 * 1024 * 1024)))
+        self.resumable_chunk_bytes = int(os.getenv("EIQ_BACKEND_RESUMABLE_CHUNK_BYTES", str(8 * 1024 * 1024)))
+        self.progress_callback = progress_callback
+        self.dedup_enabled = os.getenv("SCRAPER_UPLOAD_DEDUP_ENABLED", "true").lower() == "true"
+        if manifest is None and self.dedup_enabled:
+            manifest = UploadManifest()
+        self.manifest = manifest
         self.logger = logging.getLogger(self.__class__.__name__)
 
         if not self.api_key:
@@ -67,6 +135,97 @@ class FileUploadService:
 
         return configs.get(upload_type)
 
+    def _open_file_content(self, file_info: FileDownloadInfo) -> ContextManager[Tuple[BinaryIO, int]]:
+        return open_file_content(file_info)
+
+    def _content_hash(self, file_info: FileDownloadInfo) -> Optional[bytes]:
+        """SHA-256 of the content to upload, or None if deduplication is disabled or the hash fails."""
+        if self.manifest is None:
+            return None
+        try:
+            with self._open_file_content(file_info) as (content, _):
+                return sha256_of_stream(content)
+        except Exception as e:
+            self.logger.warning(f"Could not hash {file_info.file_name}, uploading without dedup: {str(e)}")
+            return None
+
+    def _progress_logger(self, file_name: str) -> ProgressCallback:
+        """Progress callback that logs every 25% (and forwards to the configured callback)."""
+        last_quarter = [0]
+
+        def on_progress(bytes_sent: int, total_bytes: int) -> None:
+            if self.progress_callback:
+                self.progress_callback(bytes_sent, total_bytes)
+            quarter = bytes_sent * 4 // total_bytes if total_bytes else 4
+            if quarter > last_quarter[0]:
+                last_quarter[0] = quarter
+                self.logger.info(f"Upload progress {file_name}: {quarter * 25}% ({bytes_sent}/{total_bytes} bytes)")
+
+        return on_progress
+
+    def _post_file(
+        self,
+        url: str,
+        file_info: FileDownloadInfo,
+        billing_cycle: BillingCycle,
+        payload_data: Dict[str, Any],
+        content_type: str,
+    ) -> Tuple[requests.Response, int]:
+        """Sends the file to the endpoint with a streamed multipart body. Returns (response, file size)."""
+        headers = self._get_headers(billing_cycle)
+        if self.resumable_upload_url:
+            file_size = file_content_size(file_info)
+            if file_size >= self.resumable_min_bytes:
+                # The content goes through a resumable session (which opens it itself to resume);
+                # the endpoint receives the session URL
+                uploader = ResumableUploader(
+                    self.resumable_upload_url,
+                    headers,
+                    chunk_size=self.resumable_chunk_bytes,
+                    on_progress=self._progress_logger(file_info.file_name),
+                )
+                upload_url = uploader.upload(
+                    lambda: self._open_file_content(file_info), file_info.file_name, file_size
+                )
+                data = {**payload_data, "file_name": file_info.file_name, "upload_url": upload_url}
+                return requests.post(url=url, headers=headers, data=data, timeout=300), file_size
+
+        with self._open_file_content(file_info) as (file, file_size):
+            body = MultipartEncoder(
+                {name: str(value) for name, value in payload_data.items()},
+                "file",
+                file_info.file_name,
+                file,
+                file_size,
+                content_type,
+                on_progress=self._progress_logger(file_info.file_name),
+            )
+            response = requests.post(
+                url=url,
+                headers={**headers, "Content-Type": body.content_type},
+                data=body,
+                timeout=300,
+            )
+            return response, file_size
+
+    @staticmethod
+    def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+        """Parses the Retry-After header (delta seconds or HTTP date)."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
     def _upload_single_file(
         self,
         file_info: FileDownloadInfo,
@@ -75,18 +234,35 @@ class FileUploadService:
         additional_data: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Unified method for uploading a file to the corresponding endpoint."""
+        return self.attempt_upload(file_info, billing_cycle, upload_type, additional_data).success
+
+    @traced("upload.single_file")
+    def attempt_upload(
+        self,
+        file_info: FileDownloadInfo,
+        billing_cycle: BillingCycle,
+        upload_type: str,
+        additional_data: Optional[Dict[str, Any]] = None,
+    ) -> UploadAttempt:
+        """
+        Uploads a file to the corresponding endpoint and describes the outcome.
+
+        Returns:
+            UploadAttempt with the HTTP status (None if no response was received) and the
+            Retry-After delay requested by the backend, so callers can decide whether to retry
+        """
         try:
             # Get specific configuration for upload type
             config = self._get_upload_config(upload_type, file_info, billing_cycle)
             if not config:
                 self.logger.error(f"Unknown upload type: {upload_type}")
-                return False
+                return UploadAttempt(False, error=f"Unknown upload type: {upload_type}")
 
             # Verify file has corresponding mapping
             file_obj = getattr(file_info, config["file_id_attr"], None)
             if not file_obj:
                 self.logger.error(f"No {config['file_id_attr']} mapping for {file_info.file_name}")
-                return False
+                return UploadAttempt(False, error=f"No {config['file_id_attr']} mapping")
 
             # Build URL
             if "{file_id}" in config["url_template"]:
@@ -94,6 +270,13 @@ class FileUploadService:
             else:
                 url = config["url_template"]
 
+            # Skip content the backend already acknowledged for this file id (e.g. retry of a partial job)
+            content_hash = self._content_hash(file_info)
+            if content_hash and self.manifest.contains(config["file_id_attr"], file_obj.id, content_hash):
+                self.logger.info(f"Skipping {file_info.file_name}: identical content already uploaded for this file")
+                metrics.UPLOAD_DEDUPLICATED_TOTAL.inc(upload_type=upload_type)
+                return UploadAttempt(True)
+
             self.logger.info(f"Uploading {config['description']} file: {file_info.file_name}")
             self.logger.debug(f"Upload URL: {url}")
 
@@ -102,29 +285,34 @@ class FileUploadService:
             if additional_data:
                 self.logger.info(f"Additional data: {additional_data}")
 
-            # Prepare and upload file
-            with open(file_info.file_path, "rb") as file:
-                files = {"file": (file_info.file_name, file, config["content_type"])}
-
-                response = requests.post(
-                    url=url,
-                    headers=self._get_headers(billing_cycle),
-                    data=payload_data,
-                    files=files,
-                    timeout=300,
-                )
+            # Upload file (or ZIP member)
+            started_at = time.monotonic()
+            response, file_size = self._post_file(url, file_info, billing_cycle, payload_data, config["content_type"])
+            elapsed = time.monotonic() - started_at
 
             # Verify response
             if response.status_code in [200, 201]:
                 self.logger.info(f"File {file_info.file_name} uploaded successfully")
-                return True
+                if content_hash:
+                    self.manifest.record(config["file_id_attr"], file_obj.id, content_hash)
+                metrics.UPLOAD_DURATION_SECONDS.observe(elapsed, upload_type=upload_type, result="success")
+                metrics.UPLOAD_BYTES_TOTAL.inc(file_size, upload_type=upload_type)
+                if elapsed > 0:
+                    metrics.UPLOAD_THROUGHPUT_BYTES_PER_SECOND.observe(file_size / elapsed, upload_type=upload_type)
+                return UploadAttempt(True, response.status_code)
             else:
                 self.logger.error(f"Error uploading {file_info.file_name}: {response.status_code} - {response.text}")
-                return False
+                metrics.UPLOAD_DURATION_SECONDS.observe(elapsed, upload_type=upload_type, result="failure")
+                return UploadAttempt(
+                    False,
+                    response.status_code,
+                    self._retry_after_seconds(response),
+                    f"{response.status_code} - {response.text[:500]}",
+                )
 
         except Exception as e:
             self.logger.error(f"Error uploading {upload_type} file {file_info.file_name}: {str(e)}")
-            return False
+            return UploadAttempt(False, error=str(e))
 
     def upload_files_batch(
         self,
@@ -0,0 +1,103 @@
+"""
+Streaming multipart/form-data encoder.
+
+``requests.post(files=...)`` builds the whole multipart body in memory before
+sending it. ``MultipartEncoder`` is a file-like body that produces the form
+fields, the file headers, the file content (read in chunks from the source
+stream) and the closing boundary on demand, so memory stays constant whatever
+the file size. The total length is known up front and sent as Content-Length.
+
+Usage:
+    with open(path, "rb") as source:
+        body = MultipartEncoder({"note": "x"}, "file", "report.csv", source, os.path.getsize(path))
+        requests.post(url, data=body, headers={"Content-Type": body.content_type})
+"""
+
+import uuid
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional
+
+ProgressCallback = Callable[[int, int], None]  # (bytes_sent, total_bytes)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", " ").replace("\n", " ")
+
+
+class MultipartEncoder:
+    """File-like multipart/form-data body with one file part, read lazily from its source stream."""
+
+    def __init__(
+        self,
+        fields: Optional[Dict[str, str]],
+        file_field: str,
+        file_name: str,
+        file_obj: BinaryIO,
+        file_size: int,
+        file_content_type: str = "application/octet-stream",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+
+        preamble = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(name)}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in (fields or {}).items()
+        )
+        preamble += (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(file_field)}"; filename="{_quote(file_name)}"\r\n'
+            f"Content-Type: {file_content_type}\r\n\r\n"
+        ).encode()
+        epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self.length = len(preamble) + file_size + len(epilogue)
+        self.bytes_read = 0
+        self._file_obj = file_obj
+        self._file_remaining = file_size
+        self._pending: List[bytes] = [preamble]
+        self._epilogue = epilogue
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _next_chunk(self) -> bytes:
+        if self._pending:
+            return self._pending.pop(0)
+        if self._file_remaining > 0:
+            chunk = self._file_obj.read(min(self.chunk_size, self._file_remaining))
+            if not chunk:
+                raise IOError(f"Source ended {self._file_remaining} bytes before its declared size")
+            self._file_remaining -= len(chunk)
+            return chunk
+        epilogue, self._epilogue = self._epilogue, b""
+        return epilogue
+
+    def read(self, size: int = -1) -> bytes:
+        """Returns up to size bytes of the body (all the remaining body if size < 0, b"" at the end)."""
+        output = bytearray()
+        while size < 0 or len(output) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            if size >= 0 and len(output) + len(chunk) > size:
+                split = size - len(output)
+                self._pending.insert(0, chunk[split:])
+                chunk = chunk[:split]
+            output += chunk
+
+        self.bytes_read += len(output)
+        if output and self.on_progress:
+            self.on_progress(self.bytes_read, self.length)
+        return bytes(output)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,144 @@
+"""
+Resumable uploads (tus 1.0 protocol, core + creation extensions).
+
+Large files are sent in chunks to an upload session created on the backend. If a
+chunk fails, the uploader asks the server for the offset it has stored (HEAD) and
+continues from there, so a failure at 90% of a 300 MB report does not restart the
+upload from zero. The finished session URL is then referenced in the regular
+upload endpoint instead of sending the file again.
+
+Only used when the backend exposes a tus endpoint (EIQ_BACKEND_RESUMABLE_UPLOAD_URL)
+and its upload endpoints accept the session URL (EIQ_BACKEND_ACCEPTS_UPLOAD_URL, see
+file_upload_service).
+"""
+
+import base64
+import logging
+import time
+from contextlib import AbstractContextManager
+from typing import BinaryIO, Callable, Dict, Optional, Tuple
+
+import requests
+
+from web_scrapers.infrastructure.services.multipart_encoder import ProgressCallback
+
+TUS_VERSION = "1.0.0"
+
+# Opens the content to upload and yields (stream, size); called again to resume after a failure
+ContentOpener = Callable[[], AbstractContextManager[Tuple[BinaryIO, int]]]
+
+
+class ResumableUploadError(Exception):
+    pass
+
+
+class ResumableUploader:
+    """Uploads a stream to a tus endpoint in chunks, resuming from the server offset after failures."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: Dict[str, str],
+        chunk_size: int = 8 * 1024 * 1024,
+        max_retries: int = 5,
+        timeout: int = 300,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.endpoint = endpoint
+        self.headers = {**headers, "Tus-Resumable": TUS_VERSION}
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.on_progress = on_progress
+
+    def upload(self, open_content: ContentOpener, file_name: str, file_size: int) -> str:
+        """
+        Uploads the content and returns the URL of the completed upload session.
+
+        Raises:
+            ResumableUploadError: If the session cannot be created or the retries are exhausted
+        """
+        upload_url = self._create_session(file_name, file_size)
+        self.logger.info(f"Resumable upload session for {file_name}: {upload_url}")
+
+        offset = 0
+        failures = 0
+        resync = False
+        while offset < file_size:
+            try:
+                if resync:
+                    # Resume from the offset the server stored (a failure here also uses up a retry)
+                    offset = self._server_offset(upload_url)
+                    resync = False
+                    self.logger.info(f"Resuming {file_name} at {offset}/{file_size} bytes")
+                offset = self._send_from(open_content, upload_url, offset, file_size)
+            except (requests.RequestException, ResumableUploadError, IOError, ValueError) as e:
+                failures += 1
+                if failures > self.max_retries:
+                    raise ResumableUploadError(f"Upload of {file_name} failed after {failures} attempts: {str(e)}")
+                self.logger.warning(
+                    f"Upload of {file_name} failed at {offset}/{file_size} bytes ({str(e)}), "
+                    f"attempt {failures}/{self.max_retries}"
+                )
+                time.sleep(min(2**failures, 30))
+                resync = True
+        return upload_url
+
+    def _create_session(self, file_name: str, file_size: int) -> str:
+        encoded_name = base64.b64encode(file_name.encode()).decode()
+        response = requests.post(
+            self.endpoint,
+            headers={**self.headers, "Upload-Length": str(file_size), "Upload-Metadata": f"filename {encoded_name}"},
+            timeout=self.timeout,
+        )
+        if response.status_code != 201 or "Location" not in response.headers:
+            raise ResumableUploadError(f"Could not create upload session: {response.status_code} - {response.text}")
+        return requests.compat.urljoin(self.endpoint, response.headers["Location"])
+
+    def _server_offset(self, upload_url: str) -> int:
+        response = requests.head(upload_url, headers=self.headers, timeout=self.timeout)
+        if response.status_code != 200 or "Upload-Offset" not in response.headers:
+            raise ResumableUploadError(f"Could not get upload offset: {response.status_code}")
+        return int(response.headers["Upload-Offset"])
+
+    def _send_from(self, open_content: ContentOpener, upload_url: str, offset: int, file_size: int) -> int:
+        """Sends the content from offset to the end, chunk by chunk. Returns the final offset."""
+        with open_content() as (stream, _):
+            self._skip(stream, offset)
+            while offset < file_size:
+                chunk = stream.read(min(self.chunk_size, file_size - offset))
+                if not chunk:
+                    raise IOError(f"Source ended at {offset} bytes, expected {file_size}")
+
+                response = requests.patch(
+                    upload_url,
+                    headers={
+                        **self.headers,
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    },
+                    data=chunk,
+                    timeout=self.timeout,
+                )
+                if response.status_code != 204:
+                    raise ResumableUploadError(f"Chunk rejected at offset {offset}: {response.status_code}")
+
+                offset = int(response.headers.get("Upload-Offset", offset + len(chunk)))
+                if self.on_progress:
+                    self.on_progress(offset, file_size)
+        return offset
+
+    def _skip(self, stream: BinaryIO, offset: int) -> None:
+        """Positions the stream at offset (seeks when possible, e.g. not for ZIP members)."""
+        if offset == 0:
+            return
+        if stream.seekable():
+            stream.seek(offset)
+            return
+        remaining = offset
+        while remaining > 0:
+            skipped = stream.read(min(self.chunk_size, remaining))
+            if not skipped:
+                raise IOError(f"Source ended before resume offset {offset}")
+            remaining -= len(skipped)
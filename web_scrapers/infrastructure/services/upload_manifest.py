@@ -0,0 +1,194 @@
+"""
+Local manifest of acknowledged uploads, keyed by backend file id and content hash.
+
+When a monthly job partially fails its download folder is kept and the next attempt
+uploads every file again. Before sending a file, FileUploadService looks up
+(file kind, file id, SHA-256 of the content) here and skips content the backend
+already acknowledged for that same file id.
+
+On-disk format: a 5-byte header (b"UPMF" + version) followed by fixed-size 45-byte
+records (kind: u8, file id: u64, SHA-256: 32 bytes, acknowledged at: u32 epoch
+seconds). New acknowledgements are appended as single records. Appends and the
+compaction (records older than the maximum age are evicted when the manifest is
+loaded) hold an exclusive lock on ``<manifest>.lock``, so concurrent processors do
+not lose each other's records. A torn trailing record left by an interrupted append
+is truncated before the next append, and records that do not decode are skipped.
+
+Configuration (environment variables):
+    SCRAPER_UPLOAD_DEDUP_ENABLED: Consult the manifest before uploading (default true)
+    SCRAPER_UPLOAD_MANIFEST_PATH: Manifest file (default <artifacts>/upload_manifest.bin)
+    SCRAPER_UPLOAD_MANIFEST_MAX_AGE_DAYS: Age after which entries are evicted (default 30)
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+from web_scrapers.infrastructure.artifacts import get_artifacts_base_dir
+
+MAGIC = b"UPMF"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+RECORD = struct.Struct("<BQ32sI")  # kind, file id, sha256, acknowledged_at
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# File id attribute of FileDownloadInfo -> record kind (ids of different tables may collide)
+FILE_KINDS: Dict[str, int] = {
+    "billing_cycle_file": 1,
+    "daily_usage_file": 2,
+    "pdf_file": 3,
+}
+
+ManifestKey = Tuple[int, int, bytes]
+
+
+def sha256_of_stream(stream: BinaryIO) -> bytes:
+    """SHA-256 digest of a stream, read in chunks."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.digest()
+
+
+class UploadManifest:
+    """Set of (file kind, file id, content hash) acknowledged by the backend, persisted in a compact binary file."""
+
+    def __init__(self, path: Optional[str] = None, max_age_days: Optional[float] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path or os.getenv(
+            "SCRAPER_UPLOAD_MANIFEST_PATH", os.path.join(get_artifacts_base_dir(), "upload_manifest.bin")
+        )
+        if max_age_days is None:
+            max_age_days = float(os.getenv("SCRAPER_UPLOAD_MANIFEST_MAX_AGE_DAYS", "30"))
+        self.max_age_seconds = int(max_age_days * 24 * 3600)
+        self._entries: Optional[Dict[ManifestKey, int]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_kind: str, file_id: int, content_hash: bytes) -> ManifestKey:
+        return FILE_KINDS[file_kind], int(file_id), content_hash
+
+    def contains(self, file_kind: str, file_id: int, content_hash: bytes) -> bool:
+        """True if this exact content was already acknowledged for the file id."""
+        return self._key(file_kind, file_id, content_hash) in self._load()
+
+    def record(self, file_kind: str, file_id: int, content_hash: bytes) -> None:
+        """Records an acknowledged upload (appends one record to the manifest file)."""
+        key = self._key(file_kind, file_id, content_hash)
+        acknowledged_at = int(time.time())
+        with self._lock:
+            entries = self._load()
+            entries[key] = acknowledged_at
+            try:
+                with self._file_lock():
+                    self._prepare_append()
+                    with open(self.path, "ab") as manifest_file:
+                        manifest_file.write(RECORD.pack(*key, acknowledged_at))
+            except OSError as e:
+                self.logger.warning(f"Could not write upload manifest {self.path}: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared by every process using the manifest (held on a side file, see _write)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[ManifestKey, int]:
+        if self._entries is None:
+            try:
+                with self._file_lock():
+                    self._entries = self._load_and_compact()
+            except OSError as e:
+                self.logger.warning(f"Could not lock upload manifest {self.path}: {str(e)}")
+                self._entries = {}
+        return self._entries
+
+    def _load_and_compact(self) -> Dict[ManifestKey, int]:
+        entries, record_count = self._read()
+        cutoff = int(time.time()) - self.max_age_seconds
+        current = {key: acked_at for key, acked_at in entries.items() if acked_at >= cutoff}
+        if len(current) < record_count:
+            self.logger.info(
+                f"Compacting upload manifest: {record_count} records -> {len(current)} "
+                f"(stale, duplicated or malformed records dropped)"
+            )
+            self._write(current)
+        return current
+
+    def _read(self) -> Tuple[Dict[ManifestKey, int], int]:
+        """Returns (latest acknowledgement per key, number of records in the file)."""
+        try:
+            with open(self.path, "rb") as manifest_file:
+                data = manifest_file.read()
+        except FileNotFoundError:
+            return {}, 0
+        except OSError as e:
+            self.logger.warning(f"Could not read upload manifest {self.path}: {str(e)}")
+            return {}, 0
+
+        if not data.startswith(HEADER):
+            self.logger.warning(f"Ignoring upload manifest {self.path}: unknown format")
+            return {}, 1  # Counted as one stale record so the file is rewritten
+
+        # A truncated trailing record (interrupted append) is dropped and counted as stale
+        body = data[len(HEADER) :]
+        record_count = 1 if len(body) % RECORD.size else 0
+        body = body[: len(body) - len(body) % RECORD.size]
+        entries: Dict[ManifestKey, int] = {}
+        valid_kinds = set(FILE_KINDS.values())
+        latest_valid = int(time.time()) + 86400
+        for kind, file_id, content_hash, acknowledged_at in RECORD.iter_unpack(body):
+            record_count += 1
+            if kind not in valid_kinds or not 0 < acknowledged_at <= latest_valid:
+                continue  # Malformed record: dropped by the compaction
+            key = (kind, file_id, content_hash)
+            entries[key] = max(acknowledged_at, entries.get(key, 0))
+        return entries, record_count
+
+    def _prepare_append(self) -> None:
+        """Writes the header of a new manifest, or truncates a torn trailing record (call with the file lock)."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < len(HEADER):
+            with open(self.path, "wb") as manifest_file:
+                manifest_file.write(HEADER)
+        elif (size - len(HEADER)) % RECORD.size:
+            with open(self.path, "r+b") as manifest_file:
+                manifest_file.truncate(size - (size - len(HEADER)) % RECORD.size)
+
+    def _write(self, entries: Dict[ManifestKey, int]) -> None:
+        # os.replace swaps the inode, which is why the lock lives on a side file (call with the file lock)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "wb") as manifest_file:
+                manifest_file.write(HEADER)
+                for key, acknowledged_at in entries.items():
+                    manifest_file.write(RECORD.pack(*key, acknowledged_at))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write upload manifest {self.path}: {str(e)}")
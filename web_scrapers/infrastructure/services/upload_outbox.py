@@ -0,0 +1,499 @@
+"""
+Durable upload outbox (SQLite) and its background retry worker.
+
+Instead of uploading inside ``execute`` (with the browser session idle while the
+backend is slow or failing), strategies enqueue the downloaded files and the job
+is marked UPLOAD_PENDING. ``UploadOutboxWorker`` drains the outbox concurrently:
+failed uploads are retried with exponential backoff (or after the Retry-After
+delay sent by the backend), and once every file of a job is settled the job
+status is resolved to SUCCESS or ERROR through the ``on_job_finished`` callback.
+Uploaded files are recorded in the job checkpoint, which is cleared once every
+file of the job is uploaded.
+
+Entries survive the process, so uploads left pending by a run are picked up by
+the next one. Settled jobs are recorded in the outbox too, so a job is resolved
+once even when several processes drain the same outbox.
+
+Configuration (environment variables):
+    SCRAPER_UPLOAD_OUTBOX_ENABLED: Enqueue uploads instead of uploading in execute (default false)
+    SCRAPER_UPLOAD_OUTBOX_PATH: SQLite database (default <artifacts>/upload_outbox.sqlite3)
+    SCRAPER_UPLOAD_WORKERS: Concurrent uploads (default 4)
+    SCRAPER_UPLOAD_MAX_ATTEMPTS: Attempts before an entry is marked failed (default 8)
+    SCRAPER_UPLOAD_BACKOFF_SECONDS: Base delay of the exponential backoff (default 30)
+    SCRAPER_UPLOAD_MAX_BACKOFF_SECONDS: Maximum delay between attempts (default 3600)
+"""
+
+import concurrent.futures
+import contextvars
+import json
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set
+
+from web_scrapers.domain.entities.models import BillingCycle, FileDownloadInfo
+from web_scrapers.infrastructure import metrics
+from web_scrapers.infrastructure.artifacts import get_artifacts_base_dir
+from web_scrapers.infrastructure.job_checkpoint import JobCheckpoint, job_checkpoints_enabled
+from web_scrapers.infrastructure.services.file_upload_service import FileUploadService, UploadAttempt
+from web_scrapers.infrastructure.tracing import tracer
+
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+FAILED = "failed"
+
+# (job_id, success, message)
+JobFinishedCallback = Callable[[int, bool, str], None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    upload_type TEXT NOT NULL,
+    file_info TEXT NOT NULL,
+    billing_cycle TEXT NOT NULL,
+    additional_data TEXT,
+    cleanup_dir TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS upload_outbox_due ON upload_outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS upload_outbox_job ON upload_outbox (job_id);
+CREATE TABLE IF NOT EXISTS upload_outbox_settled_jobs (
+    job_id INTEGER PRIMARY KEY,
+    settled_at REAL NOT NULL
+);
+"""
+
+
+def upload_outbox_enabled() -> bool:
+    return os.getenv("SCRAPER_UPLOAD_OUTBOX_ENABLED", "false").lower() == "true"
+
+
+class OutboxEntry(NamedTuple):
+    id: int
+    job_id: int
+    upload_type: str
+    file_info: FileDownloadInfo
+    billing_cycle: BillingCycle
+    additional_data: Optional[Dict[str, Any]]
+    cleanup_dir: Optional[str]
+    attempts: int
+
+
+class UploadOutbox:
+    """Persistent queue of uploads, one row per file."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = path or os.getenv(
+            "SCRAPER_UPLOAD_OUTBOX_PATH", os.path.join(get_artifacts_base_dir(), "upload_outbox.sqlite3")
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode, transactions are opened explicitly; one connection per operation (thread-safe)
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def enqueue(
+        self,
+        job_id: int,
+        upload_type: str,
+        files: List[FileDownloadInfo],
+        billing_cycle: BillingCycle,
+        additional_data: Optional[Dict[str, Any]] = None,
+        cleanup_dir: Optional[str] = None,
+    ) -> int:
+        """
+        Adds the files of a job to the outbox (all or none).
+
+        Args:
+            job_id: ScraperJob ID, used to resolve the job status once its files are settled
+            upload_type: Upload type ('monthly', 'daily_usage', 'pdf_invoice')
+            files: Downloaded files (they must stay on disk until uploaded)
+            billing_cycle: Billing cycle of the files
+            additional_data: Extra form fields sent with every file
+            cleanup_dir: Directory deleted once every file of the job is uploaded
+
+        Returns:
+            Number of entries added
+        """
+        now = time.time()
+        billing_cycle_json = billing_cycle.model_dump_json()
+        additional_json = json.dumps(additional_data) if additional_data else None
+        rows = [
+            (job_id, upload_type, info.model_dump_json(), billing_cycle_json, additional_json, cleanup_dir, now, now)
+            for info in files
+        ]
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # A new attempt of the job replaces the settled entries of its previous attempts
+            connection.execute(
+                "DELETE FROM upload_outbox WHERE job_id = ? AND status IN (?, ?)", (job_id, DONE, FAILED)
+            )
+            connection.execute("DELETE FROM upload_outbox_settled_jobs WHERE job_id = ?", (job_id,))
+            connection.executemany(
+                "INSERT INTO upload_outbox (job_id, upload_type, file_info, billing_cycle, additional_data, "
+                "cleanup_dir, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute("COMMIT")
+        self.logger.info(f"Enqueued {len(rows)} {upload_type} upload(s) for job {job_id}")
+        return len(rows)
+
+    def claim_due(self, limit: int) -> List[OutboxEntry]:
+        """Marks up to limit due entries as in progress and returns them."""
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, job_id, upload_type, file_info, billing_cycle, additional_data, cleanup_dir, attempts "
+                "FROM upload_outbox WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE upload_outbox SET status = ?, claimed_at = ? WHERE id = ?",
+                [(IN_PROGRESS, now, row[0]) for row in rows],
+            )
+            connection.execute("COMMIT")
+
+        return [
+            OutboxEntry(
+                id=row[0],
+                job_id=row[1],
+                upload_type=row[2],
+                file_info=FileDownloadInfo.model_validate_json(row[3]),
+                billing_cycle=BillingCycle.model_validate_json(row[4]),
+                additional_data=json.loads(row[5]) if row[5] else None,
+                cleanup_dir=row[6],
+                attempts=row[7],
+            )
+            for row in rows
+        ]
+
+    def mark_done(self, entry_id: int) -> None:
+        self._update(entry_id, "status = ?, attempts = attempts + 1, last_error = NULL", (DONE,))
+
+    def mark_failed(self, entry_id: int, error: str) -> None:
+        self._update(entry_id, "status = ?, attempts = attempts + 1, last_error = ?", (FAILED, error))
+
+    def schedule_retry(self, entry_id: int, delay: float, error: str) -> None:
+        self._update(
+            entry_id,
+            "status = ?, attempts = attempts + 1, next_attempt_at = ?, last_error = ?",
+            (PENDING, time.time() + delay, error),
+        )
+
+    def _update(self, entry_id: int, assignments: str, params: tuple) -> None:
+        with self._connect() as connection:
+            connection.execute(f"UPDATE upload_outbox SET {assignments} WHERE id = ?", (*params, entry_id))
+
+    def release_stale_claims(self, older_than_seconds: float) -> int:
+        """Puts back entries left in progress by a process that died mid-upload."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE upload_outbox SET status = ? WHERE status = ? AND claimed_at < ?",
+                (PENDING, IN_PROGRESS, time.time() - older_than_seconds),
+            )
+        return cursor.rowcount
+
+    def claim_settlement(self, job_id: int) -> Optional[Dict[str, int]]:
+        """
+        Marks the job as settled once none of its entries is pending or in progress.
+
+        Returns:
+            Number of entries of the job per status, or None if the job is not settled yet
+            or was already settled (by this or another process)
+        """
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            summary = dict(
+                connection.execute(
+                    "SELECT status, COUNT(*) FROM upload_outbox WHERE job_id = ? GROUP BY status", (job_id,)
+                ).fetchall()
+            )
+            claimed = False
+            if not summary.get(PENDING) and not summary.get(IN_PROGRESS):
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO upload_outbox_settled_jobs (job_id, settled_at) VALUES (?, ?)",
+                    (job_id, time.time()),
+                )
+                claimed = cursor.rowcount == 1
+            connection.execute("COMMIT")
+        return summary if claimed else None
+
+    def pending_file_paths(self, job_id: int) -> Set[str]:
+        """Paths of the files of a job still waiting to be uploaded."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT file_info FROM upload_outbox WHERE job_id = ? AND status IN (?, ?)",
+                (job_id, PENDING, IN_PROGRESS),
+            ).fetchall()
+        return {json.loads(file_info)["file_path"] for (file_info,) in rows}
+
+    def job_summary(self, job_id: int) -> Dict[str, int]:
+        """Number of entries of a job per status."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM upload_outbox WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def job_errors(self, job_id: int) -> List[str]:
+        """Last error of every failed entry of a job."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT file_info, last_error FROM upload_outbox WHERE job_id = ? AND status = ?", (job_id, FAILED)
+            ).fetchall()
+        return [f"{json.loads(file_info).get('file_name')}: {last_error}" for file_info, last_error in rows]
+
+    def pending_count(self) -> int:
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM upload_outbox WHERE status IN (?, ?)", (PENDING, IN_PROGRESS)
+            ).fetchone()
+        return count
+
+    def due_count(self, within_seconds: float = 0) -> int:
+        """Number of pending entries due now or in the next within_seconds."""
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM upload_outbox WHERE status = ? AND next_attempt_at <= ?",
+                (PENDING, time.time() + within_seconds),
+            ).fetchone()
+        return count
+
+    def purge_settled(self, older_than_seconds: float) -> int:
+        """Deletes done/failed entries (and settled jobs) older than the given age."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM upload_outbox WHERE status IN (?, ?) AND created_at < ?", (DONE, FAILED, cutoff)
+            )
+            connection.execute("DELETE FROM upload_outbox_settled_jobs WHERE settled_at < ?", (cutoff,))
+        return cursor.rowcount
+
+
+class UploadOutboxWorker:
+    """Drains the upload outbox in a background thread with a pool of concurrent uploads."""
+
+    # Statuses worth retrying; None means no response (connection error, timeout...)
+    RETRYABLE_STATUS_CODES = {None, 408, 425, 429}
+
+    def __init__(
+        self,
+        outbox: UploadOutbox,
+        on_job_finished: Optional[JobFinishedCallback] = None,
+        upload_service: Optional[FileUploadService] = None,
+        max_workers: Optional[int] = None,
+        poll_interval: float = 5.0,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.outbox = outbox
+        self.on_job_finished = on_job_finished
+        self.upload_service = upload_service or FileUploadService()
+        self.max_workers = max_workers or int(os.getenv("SCRAPER_UPLOAD_WORKERS", "4"))
+        self.max_attempts = int(os.getenv("SCRAPER_UPLOAD_MAX_ATTEMPTS", "8"))
+        self.backoff_seconds = float(os.getenv("SCRAPER_UPLOAD_BACKOFF_SECONDS", "30"))
+        self.max_backoff_seconds = float(os.getenv("SCRAPER_UPLOAD_MAX_BACKOFF_SECONDS", "3600"))
+        self.poll_interval = poll_interval
+
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._in_flight: Dict[concurrent.futures.Future, OutboxEntry] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        # Serializes the checkpoint updates of concurrent uploads of the same job
+        self._checkpoint_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Starts draining in the background (entries stuck in progress for over an hour are released first)."""
+        if self._thread:
+            return
+        released = self.outbox.release_stale_claims(older_than_seconds=3600)
+        if released:
+            self.logger.warning(f"Released {released} upload(s) left in progress by a previous run")
+        self.outbox.purge_settled(older_than_seconds=30 * 24 * 3600)
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix="upload")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="upload-outbox", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Upload outbox worker started ({self.max_workers} concurrent uploads)")
+
+    def notify(self) -> None:
+        """Wakes the worker up after new entries were enqueued."""
+        self._wakeup.set()
+
+    def stop(self, drain_timeout: float = 0) -> None:
+        """
+        Stops the worker.
+
+        Args:
+            drain_timeout: Seconds to keep uploading (including retries that fall within this time)
+                before stopping. Entries scheduled later stay in the outbox for the next run.
+        """
+        if not self._thread:
+            return
+        deadline = time.monotonic() + drain_timeout
+        while time.monotonic() < deadline and (
+            self._in_flight or self.outbox.due_count(within_seconds=deadline - time.monotonic())
+        ):
+            self._wakeup.set()
+            time.sleep(0.5)
+
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        self._thread = None
+
+        pending = self.outbox.pending_count()
+        if pending:
+            self.logger.warning(f"Upload outbox worker stopped with {pending} upload(s) pending")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Upload outbox iteration failed: {str(e)}", exc_info=True)
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+        concurrent.futures.wait(list(self._in_flight))
+        self._collect_finished()
+
+    def run_once(self) -> int:
+        """Collects finished uploads and starts the due ones. Returns the number of uploads started."""
+        self._collect_finished()
+        entries = self.outbox.claim_due(self.max_workers - len(self._in_flight))
+        for entry in entries:
+            future = self._executor.submit(contextvars.copy_context().run, self._process, entry)
+            future.add_done_callback(lambda _: self._wakeup.set())
+            self._in_flight[future] = entry
+        metrics.UPLOAD_OUTBOX_PENDING.set(self.outbox.pending_count())
+        return len(entries)
+
+    def _collect_finished(self) -> None:
+        for future in [future for future in self._in_flight if future.done()]:
+            entry = self._in_flight.pop(future)
+            error = future.exception()
+            if not error:
+                continue
+            self.logger.error(f"Upload of outbox entry {entry.id} crashed: {str(error)}")
+            if entry.attempts + 1 < self.max_attempts:
+                self.outbox.schedule_retry(entry.id, self._backoff(entry.attempts), str(error))
+                metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="retry")
+            else:
+                self.outbox.mark_failed(entry.id, str(error))
+                metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="failed")
+                self._settle_job(entry)
+
+    def _process(self, entry: OutboxEntry) -> None:
+        """Uploads an entry under its own trace (the job's trace was exported when the job ended)."""
+        account = entry.billing_cycle.account
+        carrier = account.carrier.name if account and account.carrier else "unknown"
+        with tracer.job(
+            job_id=entry.job_id,
+            carrier=carrier,
+            scraper_type=entry.upload_type,
+            trace_name=f"upload_{entry.id}",
+            span_name="upload_outbox.upload",
+        ):
+            self._upload(entry)
+
+    def _upload(self, entry: OutboxEntry) -> None:
+        file_name = entry.file_info.file_name
+        if not os.path.exists(entry.file_info.file_path):
+            self.outbox.mark_failed(entry.id, "File not found on disk")
+            metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="failed")
+            self.logger.error(f"Outbox upload of {file_name} failed: file not found on disk")
+            self._settle_job(entry)
+            return
+
+        attempt = self.upload_service.attempt_upload(
+            entry.file_info, entry.billing_cycle, entry.upload_type, entry.additional_data
+        )
+        if attempt.success:
+            self.outbox.mark_done(entry.id)
+            metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="success")
+            self._update_checkpoint(entry, lambda checkpoint: checkpoint.record_uploaded(entry.file_info))
+        elif self._is_retryable(attempt) and entry.attempts + 1 < self.max_attempts:
+            delay = attempt.retry_after if attempt.retry_after is not None else self._backoff(entry.attempts)
+            self.outbox.schedule_retry(entry.id, delay, attempt.error or "Upload failed")
+            metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="retry")
+            self.logger.warning(
+                f"Upload of {file_name} failed ({attempt.error}), retry {entry.attempts + 1}/{self.max_attempts - 1} "
+                f"in {delay:.0f}s"
+            )
+            return
+        else:
+            self.outbox.mark_failed(entry.id, attempt.error or "Upload failed")
+            metrics.UPLOAD_OUTBOX_ATTEMPTS_TOTAL.inc(result="failed")
+            self.logger.error(f"Upload of {file_name} failed after {entry.attempts + 1} attempt(s): {attempt.error}")
+        self._settle_job(entry)
+
+    def _is_retryable(self, attempt: UploadAttempt) -> bool:
+        return attempt.status_code in self.RETRYABLE_STATUS_CODES or attempt.status_code >= 500
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter (50-100% of the nominal delay)."""
+        delay = min(self.backoff_seconds * 2**attempts, self.max_backoff_seconds)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _update_checkpoint(self, entry: OutboxEntry, update: Callable[[JobCheckpoint], None]) -> None:
+        """Applies an update to the job checkpoint (best effort: a stale checkpoint only costs re-uploads)."""
+        if not job_checkpoints_enabled():
+            return
+        try:
+            with self._checkpoint_lock:
+                update(JobCheckpoint(entry.job_id))
+        except Exception as e:
+            self.logger.warning(f"Could not update checkpoint of job {entry.job_id}: {str(e)}")
+
+    def _settle_job(self, entry: OutboxEntry) -> None:
+        """Resolves the job once none of its entries is pending or in progress."""
+        summary = self.outbox.claim_settlement(entry.job_id)
+        if summary is None:
+            return
+
+        uploaded = summary.get(DONE, 0)
+        failed = summary.get(FAILED, 0)
+        success = failed == 0
+        if success:
+            message = f"SUCCESS: {uploaded} file(s) uploaded from the outbox"
+            self._update_checkpoint(entry, lambda checkpoint: checkpoint.clear())
+            if entry.cleanup_dir and os.path.exists(entry.cleanup_dir):
+                shutil.rmtree(entry.cleanup_dir, ignore_errors=True)
+                self.logger.info(f"Folder {entry.cleanup_dir} deleted after complete upload")
+        else:
+            errors = "; ".join(self.outbox.job_errors(entry.job_id))
+            message = f"ERROR: {failed} file(s) failed to upload, {uploaded} uploaded. {errors}"
+
+        self.logger.info(f"Uploads of job {entry.job_id} settled: {message}")
+        if self.on_job_finished:
+            try:
+                self.on_job_finished(entry.job_id, success, message)
+            except Exception as e:
+                self.logger.error(f"Could not update job {entry.job_id} after uploads: {str(e)}")
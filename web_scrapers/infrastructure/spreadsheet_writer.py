@@ -0,0 +1,97 @@
+"""
+Streaming writer for the spreadsheets synthesized by the scrapers.
+
+Strategies that build an upload file from scraped data (instead of downloading
+one from the portal) can append rows to the writer while pages are extracted,
+so the whole dataset is never held in memory and the file is complete as soon
+as the last page is processed. The format is chosen from the file extension:
+``.xlsx`` uses openpyxl's write-only mode and ``.csv`` the csv module.
+
+Usage:
+    with StreamingSheetWriter(file_path, ["mobile_number", "data_used"]) as writer:
+        for page_rows in pages:
+            writer.append_rows(page_rows)
+"""
+
+import csv
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+
+
+class StreamingSheetWriter:
+    """Appends dict rows to a .xlsx or .csv file without keeping them in memory."""
+
+    def __init__(self, file_path: str, columns: Sequence[str], sheet_name: str = "Sheet1"):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.file_path = file_path
+        self.columns: List[str] = list(columns)
+        self.sheet_name = sheet_name
+        self.row_count = 0
+        self.format = os.path.splitext(file_path)[1].lower().lstrip(".")
+        if self.format not in ("xlsx", "csv"):
+            raise ValueError(f"Unsupported spreadsheet format: {file_path}")
+
+        self._workbook: Optional[Workbook] = None
+        self._sheet = None
+        self._csv_file = None
+        self._csv_writer = None
+        self._open()
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        if self.format == "xlsx":
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet(self.sheet_name)
+            self._sheet.append(self.columns)
+        else:
+            self._csv_file = open(self.file_path, "w", newline="", encoding="utf-8")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self.columns)
+
+    def append_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Appends rows (dicts keyed by column, missing keys are left empty). Returns the number of rows appended."""
+        appended = 0
+        for row in rows:
+            values = [row.get(column) for column in self.columns]
+            if self._sheet is not None:
+                self._sheet.append(values)
+            else:
+                self._csv_writer.writerow(values)
+            appended += 1
+        self.row_count += appended
+        return appended
+
+    def close(self) -> str:
+        """Finishes the file and returns its path."""
+        if self._workbook is not None:
+            self._workbook.save(self.file_path)
+            self._workbook = None
+            self._sheet = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        return self.file_path
+
+    def discard(self) -> None:
+        """Closes the writer and removes the partial file."""
+        self._workbook = None
+        self._sheet = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        self.logger.info(f"Discarded {self.file_path}")
+
+    def __enter__(self) -> "StreamingSheetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
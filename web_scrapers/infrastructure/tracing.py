@@ -0,0 +1,316 @@
+"""
+Step-level tracing for scraper jobs.
+
+Every BrowserWrapper call and every strategy phase (find files section, download,
+upload, login, 2FA...) is recorded as a timed span. Spans are grouped in one tree
+per job, which is exported at the end of the job as JSON and/or OpenTelemetry
+(OTLP/JSON) so it is possible to see exactly where the time of a job goes.
+
+Spans are parented through contextvars, so threads that work for a job (extra tabs)
+must run in a copy of the job's context (contextvars.copy_context().run). Uploads of
+the outbox run after the job's trace was exported and get their own trace instead.
+
+Configuration (environment variables):
+    SCRAPER_TRACING_ENABLED: "true" (default) or "false"
+    SCRAPER_TRACE_FORMAT: "json" (default), "otlp" or "both"
+    SCRAPER_TRACE_OTLP_ENDPOINT: Optional OTLP/HTTP traces endpoint (e.g. http://collector:4318/v1/traces)
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from web_scrapers.infrastructure.artifacts import get_job_artifacts_dir
+
+# Arguments whose value identifies what a browser call acted on
+TARGET_ARGUMENTS = ("selector", "xpath", "url", "path")
+
+
+class Span:
+    """A timed step of a job. Children are the steps executed while this span was active."""
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.children: List["Span"] = []
+        self._start_counter = time.perf_counter()
+        self._duration: Optional[float] = None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self._duration = time.perf_counter() - self._start_counter
+        self.end_time = self.start_time + self._duration
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def duration_ms(self) -> float:
+        duration = self._duration if self._duration is not None else time.perf_counter() - self._start_counter
+        return round(duration * 1000, 3)
+
+    def iter_spans(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.iter_spans()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+class Tracer:
+    """Builds one span tree per job. Outside of a job, span() is a no-op."""
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "scraper_current_span", default=None
+        )
+        self._job_attributes: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar(
+            "scraper_job_attributes", default={}
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return os.getenv("SCRAPER_TRACING_ENABLED", "true").lower() == "true"
+
+    def get_current_span(self) -> Optional[Span]:
+        return self._current_span.get()
+
+    @contextmanager
+    def job(
+        self, job_id: int, carrier: str, scraper_type: str, trace_name: str = "trace", span_name: str = "job"
+    ) -> Iterator[Optional[Span]]:
+        """
+        Opens the root span of a job and exports the tree when the job ends.
+
+        Args:
+            trace_name: Base name of the exported files in the job's artifacts directory
+            span_name: Name of the root span
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        job_attributes = {"job_id": job_id, "carrier": carrier, "scraper_type": scraper_type}
+        root = Span(span_name, trace_id=uuid.uuid4().hex, attributes=dict(job_attributes))
+        attributes_token = self._job_attributes.set(job_attributes)
+        span_token = self._current_span.set(root)
+        error: Optional[BaseException] = None
+        try:
+            yield root
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            root.finish(error)
+            self._current_span.reset(span_token)
+            self._job_attributes.reset(attributes_token)
+            self._export(root, trace_name)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Records a child span of the active span. Does nothing outside of a job."""
+        parent = self._current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        span_attributes = dict(self._job_attributes.get())
+        span_attributes.update({key: value for key, value in attributes.items() if value is not None})
+        span = Span(name, trace_id=parent.trace_id, parent_id=parent.span_id, attributes=span_attributes)
+        with self._lock:
+            parent.children.append(span)
+
+        token = self._current_span.set(span)
+        error: Optional[BaseException] = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            span.finish(error)
+            self._current_span.reset(token)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def _export(self, root: Span, trace_name: str = "trace") -> None:
+        try:
+            job_dir = get_job_artifacts_dir(root.attributes.get("job_id", "unknown"))
+            trace_format = os.getenv("SCRAPER_TRACE_FORMAT", "json").lower()
+
+            if trace_format in ("json", "both"):
+                self.export_json(root, os.path.join(job_dir, f"{trace_name}.json"))
+            if trace_format in ("otlp", "both"):
+                with open(os.path.join(job_dir, f"{trace_name}.otlp.json"), "w", encoding="utf-8") as output_file:
+                    json.dump(to_otlp(root), output_file)
+
+            otlp_endpoint = os.getenv("SCRAPER_TRACE_OTLP_ENDPOINT")
+            if otlp_endpoint:
+                requests.post(otlp_endpoint, json=to_otlp(root), timeout=10)
+
+            self._log_summary(root)
+
+        except Exception as e:
+            self.logger.warning(f"Could not export trace for job {root.attributes.get('job_id')}: {str(e)}")
+
+    def export_json(self, root: Span, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as output_file:
+            json.dump(root.to_dict(), output_file, indent=2, default=str)
+        self.logger.info(f"Trace written to {path}")
+        return path
+
+    def _log_summary(self, root: Span, top: int = 5) -> None:
+        totals: Dict[str, float] = {}
+        for span in root.iter_spans():
+            if span is not root:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+        summary = ", ".join(f"{name}={duration / 1000:.1f}s" for name, duration in slowest)
+        self.logger.info(f"Job {root.attributes.get('job_id')} took {root.duration_ms / 1000:.1f}s - {summary}")
+
+
+def to_otlp(root: Span) -> Dict[str, Any]:
+    """Converts a span tree to the OTLP/JSON format accepted by OpenTelemetry collectors (/v1/traces)."""
+
+    def _value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _span(span: Span) -> Dict[str, Any]:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": [{"key": key, "value": _value(value)} for key, value in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        return otlp_span
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "expertel-webscrapers"}},
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "web_scrapers.tracing"},
+                        "spans": [_span(span) for span in root.iter_spans()],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+tracer = Tracer()
+
+
+def traced(name: Optional[str] = None, **static_attributes: Any) -> Callable:
+    """
+    Decorator that records every call of the function as a span.
+
+    The value of the first argument named like a selector/url (see TARGET_ARGUMENTS)
+    is attached to the span, together with selector_type and timeout when present.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters)
+        target_argument = next((arg for arg in TARGET_ARGUMENTS if arg in parameters), None)
+
+        def _call_attributes(args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            attributes = dict(static_attributes)
+            for argument in (target_argument, "selector_type", "timeout"):
+                if argument is None or argument not in parameters:
+                    continue
+                if argument in kwargs:
+                    attributes[argument] = kwargs[argument]
+                else:
+                    position = parameters.index(argument)
+                    if position < len(args):
+                        attributes[argument] = args[position]
+            if args and parameters and parameters[0] == "self":
+                attributes.setdefault("component", type(args[0]).__name__)
+            return attributes
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if tracer.get_current_span() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, **_call_attributes(args, kwargs)):
+                return func(*args, **kwargs)
+
+        wrapper.__traced__ = True
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(cls: type, prefix: str, methods: Optional[Iterable[str]] = None) -> type:
+    """
+    Wraps methods defined directly on cls with traced().
+
+    Args:
+        cls: Class to instrument
+        prefix: Span name prefix (e.g. "browser" -> "browser.click_element")
+        methods: Method names to wrap. If None, wraps every public method defined on cls.
+    """
+    names = methods if methods is not None else [name for name in vars(cls) if not name.startswith("_")]
+    for method_name in names:
+        method = vars(cls).get(method_name)
+        if callable(method) and not getattr(method, "__traced__", False):
+            setattr(cls, method_name, traced(f"{prefix}.{method_name.lstrip('_')}")(method))
+    return cls
+
+
+def traced_class(prefix: str) -> Callable[[type], type]:
+    """Class decorator version of trace_methods() for all public methods."""
+    return lambda cls: trace_methods(cls, prefix)